@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark del pipeline por etapas superpuestas
+Sobre un CSV sintético compara el procesamiento en secuencia por lotes
+(iter_records + iter_batches + write_csv_stream) con run_pipeline, que
+superpone lectura, parsing y escritura. Como referencia mide también solo la
+E/S (leer el archivo y escribir la misma cantidad de bytes): el pipeline
+debería acercarse a max(E/S, CPU) en lugar de a E/S + CPU
+"""
+
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import sys
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import BASE_DIR, CHUNK_SIZE
+from synthetic import ensure_csv
+from processors import iter_records, iter_batches
+from utils import write_csv_stream
+from async_pipeline import run_pipeline
+
+BENCH_DIR = os.path.join(BASE_DIR, 'output', 'bench')
+
+def io_only(path, output_path): # Lee el archivo y escribe los mismos bytes
+    """Tiempo de E/S puro: lectura por bloques y escritura de cada bloque"""
+    with open(path, 'rb') as source, open(output_path, 'wb') as target:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            target.write(chunk)
+
+def sequential(path, output_path): # Procesamiento en secuencia por lotes
+    records = iter_records(path)
+    headers = [h.strip() for h in next(records)]
+    write_csv_stream(headers, iter_batches(records, headers), output_path)
+
+def pipelined(path, output_path, workers): # Procesamiento con etapas superpuestas
+    records = iter_records(path)
+    headers = [h.strip() for h in next(records)]
+    records.close()
+    run_pipeline(path, headers, output_path, workers=workers)
+
+def best_time(function, repeat): # Mejor tiempo de una función
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline secuencial frente a etapas superpuestas")
+    parser.add_argument('--rows', type=int, default=200000, help="Filas del dataset sintético")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2], help="Procesos de parsing del pipeline")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por variante")
+    parser.add_argument('--data-dir', default=BENCH_DIR, help="Directorio de los CSV sintéticos")
+    args = parser.parse_args()
+
+    path = ensure_csv(args.data_dir, args.rows)
+    expected, output_path = path + '.seq.csv', path + '.out.csv'
+    try:
+        io_seconds = best_time(lambda: io_only(path, output_path), args.repeat)
+        sequential_seconds = best_time(lambda: sequential(path, expected), args.repeat)
+        print(f"Filas: {args.rows} ({os.path.getsize(path) / 1e6:.1f} MB) | CPUs: {os.cpu_count()}")
+        print(f"{'variante':>20} | {'tiempo (s)':>10} | {'vs. secuencial':>14}")
+        print(f"{'solo E/S':>20} | {io_seconds:>10.3f} | {'':>14}")
+        print(f"{'secuencial':>20} | {sequential_seconds:>10.3f} | {'1.00x':>14}")
+        for workers in args.workers:
+            seconds = best_time(lambda: pipelined(path, output_path, workers), args.repeat)
+            assert filecmp.cmp(expected, output_path, shallow=False), "La salida del pipeline no coincide con la secuencial"
+            print(f"{f'pipeline ({workers} proc.)':>20} | {seconds:>10.3f} | {sequential_seconds / seconds:>13.2f}x")
+    finally:
+        for leftover in (expected, output_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark de tipos compactos en create_dataframe
+Compara la memoria del DataFrame y el tiempo de consultas típicas (groupby y
+filtros) con los tipos por defecto y con compact_dtypes
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_parallel import build_content
+from processors import parse_content
+from utils import create_dataframe
+
+def run_queries(df): # Ejecuta consultas típicas de agrupación y filtrado
+    """Ejecuta consultas típicas de agrupación y filtrado"""
+    df.groupby('Issuance type')['Identifier'].count()
+    df.groupby('Place of Publication')['Date of Publication'].mean()
+    df[df['Issuance type'] == 'monographic']
+    df[(df['Date of Publication'] >= 1800) & (df['Date of Publication'] < 1850)]
+
+def time_queries(df, repeat): # Mide el mejor tiempo de las consultas
+    """Mide el mejor tiempo de las consultas"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_queries(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria y consultas con tipos compactos")
+    parser.add_argument('--rows', type=int, default=200000, help="Filas del dataset sintético")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones de las consultas")
+    args = parser.parse_args()
+
+    # Silenciar el resumen que imprime parse_content
+    with contextlib.redirect_stdout(io.StringIO()):
+        headers, data = parse_content(build_content(args.rows), columnar=True)
+
+    print(f"Filas: {args.rows}")
+    print(f"{'tipos':>16} | {'memoria (MB)':>12} | {'consultas (s)':>13}")
+    configurations = [
+        ('por defecto', {'compact': False}),
+        ('compactos', {}),
+        ('compactos+arrow', {'arrow_strings': True}),
+    ]
+    for label, options in configurations:
+        # Cada DataFrame recibe su propia copia de las columnas
+        df = create_dataframe(headers, {header: list(values) for header, values in data.items()}, **options)
+        memory = df.memory_usage(deep=True).sum() / 1e6
+        print(f"{label:>16} | {memory:>12.1f} | {time_queries(df, args.repeat):>13.4f}")
+
+if __name__ == "__main__":
+    main()
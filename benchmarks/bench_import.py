@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark del tiempo de importación y de arranque de la línea de comandos
+Mide en procesos nuevos el tiempo de importar cada módulo de src y de
+ejecutar main.py --validate-only, y verifica que ninguno de los módulos
+livianos cargue dependencias pesadas (pandas, numpy, pyarrow, asyncio,
+concurrent.futures). Termina con código 1 si alguna verificación falla, para
+usarlo como control de regresiones
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Módulos que no deben cargar dependencias pesadas al importarse
+LIGHT_MODULES = ['patterns', 'tokenizer', 'validators', 'utils', 'processors', 'rejects', 'metrics',
+                 'search', 'text_index', 'record_index', 'regex_profiler', 'main']
+HEAVY_MODULES = ['pandas', 'numpy', 'pyarrow', 'asyncio', 'concurrent.futures']
+
+# Tiempo máximo (en segundos) de main.py --validate-only, incluido el arranque del intérprete
+VALIDATE_ONLY_BUDGET = 0.1
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps([time.perf_counter() - start, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+def import_time(module, repeat): # Mejor tiempo de importación de un módulo en un proceso nuevo
+    """Devuelve (mejor tiempo, dependencias pesadas cargadas) al importar module"""
+    best, heavy = float('inf'), []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                   cwd=SRC_DIR, capture_output=True, text=True, check=True)
+        seconds, heavy = json.loads(completed.stdout.strip().splitlines()[-1])
+        best = min(best, seconds)
+    return best, heavy
+
+def command_time(args, repeat): # Mejor tiempo de un comando en un proceso nuevo
+    """Devuelve (mejor tiempo, código de salida) de ejecutar python con args"""
+    best, code = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code = subprocess.run([sys.executable] + args, cwd=SRC_DIR, capture_output=True).returncode
+        best = min(best, time.perf_counter() - start)
+    return best, code
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de importación de los módulos y de main.py --validate-only")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por medición (se usa el mejor tiempo)")
+    parser.add_argument('--budget', type=float, default=VALIDATE_ONLY_BUDGET, help="Tiempo máximo de main.py --validate-only en segundos")
+    args = parser.parse_args()
+
+    # Compilar los módulos antes de medir, para no contar la generación de los .pyc
+    subprocess.run([sys.executable, '-m', 'compileall', '-q', SRC_DIR], check=True)
+    failures = []
+    print(f"{'módulo':>16} | {'importación (ms)':>16} | dependencias pesadas")
+    for module in LIGHT_MODULES:
+        seconds, heavy = import_time(module, args.repeat)
+        print(f"{module:>16} | {seconds * 1000:>16.1f} | {', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{module} carga {', '.join(heavy)}")
+
+    interpreter, _ = command_time(['-c', 'pass'], args.repeat)
+    seconds, code = command_time(['main.py', '--validate-only'], args.repeat)
+    print(f"\nArranque del intérprete: {interpreter * 1000:.1f} ms")
+    print(f"main.py --validate-only: {seconds * 1000:.1f} ms (máximo {args.budget * 1000:.0f} ms)")
+    if code != 0:
+        failures.append(f"main.py --validate-only terminó con código {code}")
+    if seconds > args.budget:
+        failures.append(f"main.py --validate-only tardó {seconds * 1000:.1f} ms")
+
+    for failure in failures:
+        print(f"FALLA: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la ingesta de varios archivos con un pool compartido
+Procesa las mismas filas sintéticas como un solo archivo y repartidas en
+muchos archivos chicos con ingest_files. Si el costo por archivo está bien
+amortizado, las filas por segundo de ambos casos deberían ser parecidas
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from synthetic import generate_csv
+from batch import expand_inputs, ingest_files
+
+def timed_ingest(paths, output_path, workers): # Tiempo de ingest_files
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = ingest_files(paths, output_path=output_path, workers=workers)
+    return time.perf_counter() - start, summary['rows']
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingesta de un archivo grande frente a muchos archivos chicos")
+    parser.add_argument('--rows', type=int, default=100000, help="Filas en total")
+    parser.add_argument('--files', type=int, default=300, help="Archivos chicos entre los que se reparten las filas")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2], help="Procesos del pool")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench_ingest_')
+    try:
+        generate_csv(os.path.join(directory, 'single', 'all.csv'), args.rows)
+        per_file = args.rows // args.files
+        for number in range(args.files):
+            generate_csv(os.path.join(directory, 'many', f"part_{number:05d}.csv"), per_file, seed=number)
+        cases = [
+            ('1 archivo', expand_inputs([os.path.join(directory, 'single')])),
+            (f"{args.files} archivos", expand_inputs([os.path.join(directory, 'many')])),
+        ]
+        output_path = os.path.join(directory, 'out.csv')
+        print(f"{'entrada':>16} | {'procesos':>8} | {'filas':>8} | {'tiempo (s)':>10} | {'filas/s':>10}")
+        for workers in args.workers:
+            for name, paths in cases:
+                seconds, rows = timed_ingest(paths, output_path, workers)
+                print(f"{name:>16} | {workers:>8} | {rows:>8} | {seconds:>10.3f} | {rows / seconds:>10.0f}")
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria de parse_content + create_dataframe
+Compara el pico de memoria residente (RSS) al construir el DataFrame desde una
+lista de diccionarios por fila y desde listas por columna (columnar=True).
+Cada modo se mide en un proceso nuevo para que los picos no se mezclen.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_parallel import build_content
+
+def peak_rss_mb(): # Pico de memoria residente del proceso actual en MB
+    """Pico de memoria residente del proceso actual en MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB y macOS reporta bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_mode(rows, columnar): # Procesa el dataset en este proceso e imprime tiempo y memoria
+    """Procesa el dataset en este proceso e imprime tiempo y memoria"""
+    from processors import parse_content
+    from utils import create_dataframe
+
+    content = build_content(rows)
+    loaded = peak_rss_mb()
+    start = time.perf_counter()
+    # Silenciar el resumen que imprime parse_content
+    with contextlib.redirect_stdout(io.StringIO()):
+        headers, data = parse_content(content, columnar=columnar)
+    df = create_dataframe(headers, data)
+    elapsed = time.perf_counter() - start
+    print(f"{elapsed:.3f} {loaded:.1f} {peak_rss_mb():.1f} {len(df)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de memoria por filas vs. por columnas")
+    parser.add_argument('--rows', type=int, default=500000, help="Filas del dataset sintético")
+    parser.add_argument('--mode', choices=['filas', 'columnas'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.rows, args.mode == 'columnas')
+        return
+
+    print(f"Filas: {args.rows}")
+    print(f"{'modo':>8} | {'tiempo (s)':>10} | {'RSS texto (MB)':>14} | {'RSS pico (MB)':>13} | {'pico - texto':>12}")
+    for mode in ('filas', 'columnas'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--rows', str(args.rows), '--mode', mode],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        elapsed, loaded, peak = (float(value) for value in output[:3])
+        print(f"{mode:>8} | {elapsed:>10.3f} | {loaded:>14.1f} | {peak:>13.1f} | {peak - loaded:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escalabilidad del parsing paralelo de parse_content
+Replica el dataset hasta el número de filas indicado y mide el tiempo con
+distintos números de procesos, reportando aceleración y eficiencia
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import DATA_PATH
+from processors import load_file, parse_content
+
+def build_content(rows): # Replica las filas del dataset hasta alcanzar el número pedido
+    """Replica las filas del dataset hasta alcanzar el número pedido"""
+    header, _, body = load_file(DATA_PATH).partition('\n')
+    lines = body.rstrip('\n').split('\n')
+    repeats = rows // len(lines) + 1
+    return header + '\n' + '\n'.join((lines * repeats)[:rows]) + '\n'
+
+def time_parse(content, workers, repeat): # Mide el mejor tiempo de parse_content con un número de procesos
+    """Mide el mejor tiempo de parse_content con un número de procesos"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # Silenciar el resumen que imprime parse_content
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse_content(content, workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalabilidad de parse_content con varios procesos")
+    parser.add_argument('--rows', type=int, default=200000, help="Filas del dataset sintético")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Números de procesos a probar")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por configuración")
+    args = parser.parse_args()
+
+    content = build_content(args.rows)
+    print(f"Filas: {args.rows} | Tamaño: {len(content) / 1e6:.1f} MB | CPUs disponibles: {os.cpu_count()}")
+    print(f"{'procesos':>8} | {'tiempo (s)':>10} | {'aceleración':>11} | {'eficiencia':>10}")
+
+    # La referencia siempre es el procesamiento secuencial en el proceso principal
+    baseline = time_parse(content, 1, args.repeat)
+    for workers in args.workers:
+        elapsed = baseline if workers == 1 else time_parse(content, workers, args.repeat)
+        speedup = baseline / elapsed
+        print(f"{workers:>8} | {elapsed:>10.3f} | {speedup:>10.2f}x | {speedup / workers:>9.0%}")
+
+if __name__ == "__main__":
+    main()
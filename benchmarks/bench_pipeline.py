@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks del pipeline completo con datasets sintéticos
+Para cada tamaño genera (una sola vez) un CSV sintético con synthetic.py y
+mide por separado cada etapa del pipeline (load_file, validate_headers,
+parse_content, create_dataframe, save_results): tiempo, filas y MB por
+segundo, y memoria máxima del proceso al terminar la etapa. Cada tamaño se
+mide en un proceso nuevo para que la memoria de uno no afecte al siguiente.
+Los resultados se agregan como una línea JSON por tamaño, con la versión del
+código, y se comparan con la última medición de otra versión
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import BASE_DIR
+from metrics import peak_rss_bytes
+from synthetic import ensure_csv
+
+DEFAULT_SIZES = [10000, 100000, 1000000, 10000000]
+BENCH_DIR = os.path.join(BASE_DIR, 'output', 'bench')
+STAGES = ['load_file', 'validate_headers', 'parse_content', 'create_dataframe', 'save_results']
+
+def peak_rss_mb(): # Memoria máxima del proceso en MB
+    """Memoria residente máxima del proceso en MB según metrics.peak_rss_bytes (None si el sistema no la informa)"""
+    peak = peak_rss_bytes()
+    return peak / 1e6 if peak is not None else None
+
+def version(): # Versión del código medido
+    """Commit actual del repositorio (con '+' si hay cambios sin guardar), o 'desconocida'"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BASE_DIR, capture_output=True, text=True).stdout.strip()
+        return commit + ('+' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconocida'
+
+def run_stages(path, workers): # Mide cada etapa del pipeline sobre un archivo (en el proceso hijo)
+    """Ejecuta el pipeline etapa por etapa y devuelve las mediciones de cada una"""
+    import pandas as pd
+    from processors import load_file, validate_headers, parse_content
+    from utils import create_dataframe, save_results
+
+    output_path = os.path.splitext(path)[0] + '.out.csv'
+    size = os.path.getsize(path)
+    results = {}
+    state = {}
+
+    def stage(name, function):
+        start = time.perf_counter()
+        # Silenciar los mensajes que imprimen las funciones del pipeline
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = function()
+        results[name] = {'seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb()}
+        return value
+
+    state['content'] = stage('load_file', lambda: load_file(path))
+    if not stage('validate_headers', lambda: validate_headers(state['content'])):
+        raise ValueError(f"Encabezados no válidos en {path}")
+    headers, data = stage('parse_content', lambda: parse_content(state['content'], workers=workers, columnar=True))
+    del state['content']
+    df = stage('create_dataframe', lambda: create_dataframe(headers, data))
+    del data
+    stage('save_results', lambda: save_results(df, output_path))
+    os.remove(output_path)
+
+    rows = len(df)
+    for measurement in results.values():
+        seconds = measurement['seconds'] or 1e-9
+        measurement['rows_per_s'] = rows / seconds
+        measurement['mb_per_s'] = size / 1e6 / seconds
+    return {'pandas': pd.__version__, 'rows': rows, 'bytes': size, 'stages': results}
+
+def measure(path, workers): # Ejecuta run_stages en un proceso nuevo
+    """Mide un archivo en un proceso hijo y devuelve su resultado"""
+    completed = subprocess.run([sys.executable, __file__, '--child', path, '--workers', str(workers)],
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def previous_record(results_path, rows, current): # Última medición de otra versión para un tamaño
+    """Busca en el archivo de resultados la última medición de rows filas hecha con otra versión"""
+    if not os.path.exists(results_path):
+        return None
+    found = None
+    with open(results_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            record = json.loads(line)
+            if record['rows'] == rows and record['version'] != current:
+                found = record
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo, rendimiento y memoria por etapa del pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Filas de cada dataset sintético")
+    parser.add_argument('--workers', type=int, default=1, help="Procesos para parse_content")
+    parser.add_argument('--data-dir', default=BENCH_DIR, help="Directorio de los CSV sintéticos")
+    parser.add_argument('--results', default=os.path.join(BENCH_DIR, 'pipeline.jsonl'), help="Archivo JSON Lines de resultados")
+    parser.add_argument('--child', metavar='CSV', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_stages(args.child, args.workers)))
+        return
+
+    current = version()
+    environment = {
+        'version': current,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'workers': args.workers,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    print(f"Versión: {current} | Python {environment['python']} | CPUs: {environment['cpus']}")
+    for rows in args.sizes:
+        path = ensure_csv(args.data_dir, rows)
+        result = measure(path, args.workers)
+        record = dict(environment, timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'), **result)
+        with open(args.results, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + '\n')
+
+        previous = previous_record(args.results, rows, current)
+        print(f"\n{rows} filas ({result['bytes'] / 1e6:.1f} MB)"
+              + (f" | comparado con {previous['version']}" if previous else ''))
+        print(f"{'etapa':>16} | {'tiempo (s)':>10} | {'filas/s':>10} | {'MB/s':>7} | {'pico RSS (MB)':>13} | {'vs. anterior':>12}")
+        for name in STAGES:
+            stage = result['stages'][name]
+            change = ''
+            if previous and previous['stages'].get(name, {}).get('seconds'):
+                change = f"{stage['seconds'] / previous['stages'][name]['seconds']:.2f}x"
+            peak = f"{stage['peak_rss_mb']:.0f}" if stage['peak_rss_mb'] is not None else '-'
+            print(f"{name:>16} | {stage['seconds']:>10.3f} | {stage['rows_per_s']:>10.0f} | "
+                  f"{stage['mb_per_s']:>7.1f} | {peak:>13} | {change:>12}")
+    print(f"\nResultados agregados a {args.results}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark del prefiltro de literales en búsquedas con expresiones regulares
+Compara, por consulta, evaluar re.search sobre todas las filas de la columna
+con ColumnSearcher.search, que solo evalúa las filas con los literales
+obligatorios del patrón
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_parallel import build_content
+from patterns import PATTERNS
+from processors import parse_content
+from search import ColumnSearcher, required_literals
+
+# Consultas (columna, patrón): las de PATTERNS con literales y búsquedas tipo grep
+QUERIES = [
+    ('Flickr URL', PATTERNS['Flickr URL']['pattern']),
+    ('Issuance type', PATTERNS['Issuance type']['pattern']),
+    ('Publisher', r'Macmillan'),
+    ('Title', r'\bpoems?\b'),
+    ('Title', r'[Nn]ovel\b'),
+    ('Place of Publication', r'Edinburgh|Dublin'),
+    ('Author', r'\d{4}'),
+]
+
+def best_time(function, repeat): # Mide el mejor tiempo de una función
+    """Mide el mejor tiempo de una función y devuelve también su resultado"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda con y sin prefiltro de literales")
+    parser.add_argument('--rows', type=int, default=200000, help="Filas del dataset sintético")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por consulta")
+    args = parser.parse_args()
+
+    # Silenciar el resumen que imprime parse_content
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, data = parse_content(build_content(args.rows), columnar=True)
+    searchers = {}
+
+    print(f"Filas: {args.rows}")
+    print(f"{'columna':>20} | {'patrón':>24} | {'literales':>10} | {'filas':>7} | {'re (s)':>7} | {'prefiltro (s)':>13} | {'aceleración':>11}")
+    for field, pattern in QUERIES:
+        values = data[field]
+        searcher = searchers.setdefault(field, ColumnSearcher(values))
+        search = re.compile(pattern).search
+        full, expected = best_time(lambda: [row for row, value in enumerate(values) if search(value)], args.repeat)
+        filtered, rows = best_time(lambda: searcher.search(pattern), args.repeat)
+        assert rows == expected, f"Resultados distintos para {pattern!r}"
+        literals = required_literals(pattern)
+        print(f"{field:>20} | {pattern[:24]:>24} | {len(literals or []):>10} | {len(rows):>7} | "
+              f"{full:>7.3f} | {filtered:>13.3f} | {full / filtered:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Generador de datasets sintéticos con el formato de BL-Flickr-Images-Book.csv
+Produce archivos con los mismos encabezados que valida HEADER_PATTERN y con
+los casos difíciles del archivo real: campos entre comillas con comas y
+comillas escapadas, campos vacíos, títulos largos y fechas sin año. El
+archivo se escribe por lotes, así que se pueden generar millones de filas
+sin tenerlas en memoria
+"""
+
+import argparse
+import os
+import random
+import sys
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from patterns import PATTERNS, REGISTRY
+
+HEADERS = list(PATTERNS)
+
+WORDS = ('the', 'of', 'and', 'history', 'novel', 'poems', 'London', 'county', 'account', 'travels',
+         'journey', 'letters', 'life', 'memoirs', 'England', 'Scotland', 'church', 'parish', 'ancient',
+         'modern', 'with', 'illustrations', 'by', 'author', 'edited', 'notes', 'volume', 'new', 'edition',
+         'description', 'Ireland', 'tales', 'sketches', 'verse', 'historical', 'romance', 'a', 'in', 'from')
+SURNAMES = ('FORBES', 'SMITH', 'BLAZE DE BURY', 'DICKENS', 'SCOTT', 'BROWN', 'MACLEOD', 'GÓMEZ', 'MÜLLER', "O'BRIEN")
+GIVEN = ('Walter', 'Marie Pauline Rose', 'John', 'Charles', 'Mary', 'James', 'Elizabeth', 'Thomas')
+PLACES = ('London', 'Edinburgh', 'Dublin', 'London; Virtue & Yorston', 'Paris', 'New York', 'Glasgow, London', 'Oxford')
+PUBLISHERS = ('S. Tinsley & Co.', 'Virtue & Co.', 'Macmillan & Co.', 'Longman, Brown, Green & Longmans',
+              'Smith, Elder & Co.', 'Chapman & Hall', '')
+EDITIONS = ('', '', '', '', 'Second edition', 'New edition, revised', 'Third edition.')
+ISSUANCE = ('monographic',) * 18 + ('serial', 'continuing')
+SHELFMARKS = ('British Library HMNTS 12641.b.30.', 'British Library HMNTS 10360.bbb.24.',
+              'British Library HMNTS 9545.b.4.; British Library HMNTS 1602/243.')
+
+def _quote(value: str) -> str: # Aplica las reglas de comillas del CSV
+    """Encierra el valor entre comillas si tiene comas, comillas o saltos de línea"""
+    if ',' in value or '"' in value or '\n' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def _name(rng: random.Random) -> str: # Nombre con el formato 'APELLIDO, Nombre.'
+    return f"{rng.choice(SURNAMES)}, {rng.choice(GIVEN)}."
+
+def _title(rng: random.Random) -> str: # Título corto o largo con comas y comillas
+    """Título de 3 a 20 palabras; uno de cada cincuenta es largo (hasta 200 palabras)"""
+    words = rng.randint(60, 200) if rng.random() < 0.02 else rng.randint(3, 20)
+    text = ' '.join(rng.choices(WORDS, k=words)).capitalize()
+    if rng.random() < 0.3:
+        text += ', ' + ' '.join(rng.choices(WORDS, k=4))
+    if rng.random() < 0.05:
+        text += ' "' + rng.choice(WORDS) + '"'
+    if rng.random() < 0.2:
+        text += ' [A novel.]'
+    return text
+
+def _date(rng: random.Random) -> str: # Fecha con año, con año alternativo o sin año
+    year = rng.randint(1500, 1900)
+    roll = rng.random()
+    if roll < 0.02:
+        return ''
+    if roll < 0.04:
+        return 'No date'
+    if roll < 0.15:
+        return f"{year} [{year - 1}]"
+    if roll < 0.2:
+        return f"[{year}?]"
+    return str(year)
+
+def make_row(identifier: int, rng: random.Random) -> str: # Genera una línea del CSV sintético
+    """Genera una línea del CSV (sin salto de línea) para un Identifier"""
+    contributors = '; '.join(_name(rng) for _ in range(rng.choice((0, 1, 1, 2))))
+    values = [
+        f"{identifier:09d}",
+        rng.choice(EDITIONS),
+        rng.choice(PLACES),
+        _date(rng),
+        rng.choice(PUBLISHERS),
+        _title(rng),
+        _name(rng) if rng.random() < 0.8 else '',
+        contributors,
+        'British Library' if rng.random() < 0.02 else '',
+        '',
+        'John Smith Collection' if rng.random() < 0.01 else '',
+        '',
+        rng.choice(ISSUANCE),
+        f"http://www.flickr.com/photos/britishlibrary/tags/sysnum{identifier:09d}",
+        rng.choice(SHELFMARKS),
+    ]
+    return ','.join(map(_quote, values))
+
+def generate_csv(path: str, rows: int, seed: int = 0, batch_size: int = 10000) -> int: # Escribe un CSV sintético
+    """
+    Escribe un CSV sintético con el esquema de HEADER_PATTERN.
+
+    La misma semilla produce siempre el mismo archivo.
+
+    Args:
+        path (str): Ruta del archivo a escribir
+        rows (int): Número de filas de datos
+        seed (int): Semilla del generador aleatorio
+        batch_size (int): Filas generadas antes de cada escritura
+
+    Returns:
+        int: Tamaño del archivo en bytes
+    """
+    header = ','.join(HEADERS)
+    assert REGISTRY.header_match(header), "Los encabezados sintéticos no cumplen HEADER_PATTERN"
+    rng = random.Random(seed)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8', newline='') as file:
+        file.write(header + '\n')
+        for start in range(0, rows, batch_size):
+            end = min(rows, start + batch_size)
+            file.write('\n'.join(make_row(identifier, rng) for identifier in range(start + 1, end + 1)) + '\n')
+    os.replace(temporary, path)
+    return os.path.getsize(path)
+
+def ensure_csv(directory: str, rows: int, seed: int = 0) -> str: # Ruta de un CSV sintético, generándolo si no existe
+    """Devuelve la ruta del CSV sintético de rows filas en directory, generándolo solo la primera vez"""
+    path = os.path.join(directory, f"synthetic_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        generate_csv(path, rows, seed)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un CSV sintético con el formato de BL-Flickr-Images-Book.csv")
+    parser.add_argument('path', help="Archivo de salida")
+    parser.add_argument('--rows', type=int, default=100000, help="Número de filas de datos")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+    size = generate_csv(args.path, args.rows, args.seed)
+    print(f"{args.rows} filas, {size / 1e6:.1f} MB en {args.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# Módulo del pipeline por etapas superpuestas
+# Este módulo procesa el archivo CSV con tres etapas que trabajan a la vez:
+# - Lector: lee bloques de bytes del archivo (en un hilo, desde asyncio) y
+#   los corta en inicios de registro
+# - Procesadores: cada bloque se parsea, se limpia con create_dataframe y se
+#   convierte a CSV en un ProcessPoolExecutor
+# - Escritor: agrega el CSV de cada bloque a la salida (en un hilo), en el
+#   orden original del archivo
+# Las etapas se comunican por una cola acotada: cuando el escritor o los
+# procesadores se atrasan, el lector espera, así que la memoria usada depende
+# del tamaño de bloque y de la cola y no del tamaño del archivo. Mientras un
+# bloque se parsea, el siguiente se lee y el anterior se escribe, y el tiempo
+# total tiende al de la etapa más lenta en lugar de a la suma de todas.
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from config import PIPELINE_BLOCK_SIZE, PIPELINE_QUEUE_SIZE
+from processors import next_record_start, iter_text_records, iter_batches
+from utils import create_dataframe
+
+def record_boundary(buffer: bytes) -> int: # Posición del último inicio de registro de un buffer
+    """
+    Devuelve la posición siguiente al último salto de línea fuera de comillas.
+
+    El buffer debe empezar en un inicio de registro, así que un salto de línea
+    está fuera de comillas si antes de él hay un número par de comillas.
+
+    Args:
+        buffer (bytes): Bytes del archivo desde un inicio de registro
+
+    Returns:
+        int: Posición donde empieza el registro incompleto del final (0 si el
+        buffer no tiene ningún registro completo)
+    """
+    position = buffer.rfind(b'\n')
+    if position < 0:
+        return 0
+    quotes = buffer.count(b'"', 0, position)
+    while quotes % 2:
+        # Ese salto de línea está dentro de un campo entre comillas
+        previous = buffer.rfind(b'\n', 0, position)
+        if previous < 0:
+            return 0
+        quotes -= buffer.count(b'"', previous, position)
+        position = previous
+    return position + 1
+
+def process_block(task: Tuple[bytes, List[str], bool]) -> Tuple[bytes, int, Optional[List[tuple]], int]: # Tarea de un proceso del pool sobre un bloque
+    """
+    Parsea, limpia y convierte a CSV un bloque de registros completos.
+
+    Args:
+        task (Tuple[bytes, List[str], bool]): Tupla (bloque, encabezados, validar)
+
+    Returns:
+        Tuple[bytes, int, Optional[List[tuple]], int]: Tupla con (csv, filas,
+        banderas, mal_formados) donde csv son las filas del bloque en UTF-8,
+        banderas es la tupla de banderas de cada fila (None si no se valida)
+        y mal_formados el número de registros con más o menos campos
+    """
+    block, headers, validate = task
+    field_flags = [] if validate else None
+    errors = {}
+    parts = []
+    rows = 0
+    for batch in iter_batches(iter_text_records(block), headers, field_flags=field_flags, errors=errors):
+        df = create_dataframe(headers, batch, compact=False) # Solo se escribe como CSV: compactar los tipos de cada lote no aporta
+        parts.append(df.to_csv(index=False, header=False))
+        rows += len(df)
+    return ''.join(parts).encode('utf-8'), rows, field_flags, errors.get('malformed_records', 0)
+
+async def _read_blocks(data_path: str, block_size: int, queue: asyncio.Queue, submit): # Etapa lectora
+    """Lee el archivo (sin los encabezados) y pone en la cola la tarea de cada bloque"""
+    loop = asyncio.get_running_loop()
+    with open(data_path, 'rb') as file:
+        pending = b''
+        header = True
+        while True:
+            chunk = await loop.run_in_executor(None, file.read, block_size)
+            buffer = pending + chunk
+            if header:
+                header_end = next_record_start(buffer, 0)
+                if header_end == len(buffer) and chunk:
+                    # Los encabezados todavía no terminan
+                    pending = buffer
+                    continue
+                buffer = buffer[header_end:]
+                header = False
+            end = record_boundary(buffer) if chunk else len(buffer)
+            if end:
+                # put espera si la cola está llena: así el lector nunca se adelanta más de la cuenta
+                await queue.put(submit(buffer[:end]))
+            pending = buffer[end:]
+            if not chunk:
+                break
+    await queue.put(None)
+
+async def _write_blocks(file, queue: asyncio.Queue, field_flags: Optional[List[tuple]], errors: Optional[Dict[str, int]]) -> int: # Etapa escritora
+    """Espera cada bloque en el orden de la cola y escribe su CSV"""
+    loop = asyncio.get_running_loop()
+    rows = 0
+    while True:
+        future = await queue.get()
+        if future is None:
+            return rows
+        data, count, flags, malformed = await future
+        await loop.run_in_executor(None, file.write, data)
+        rows += count
+        if field_flags is not None:
+            field_flags.extend(flags)
+        if errors is not None:
+            errors['malformed_records'] = errors.get('malformed_records', 0) + malformed
+
+async def _run(data_path: str, headers: List[str], output_path: str, workers: int, field_flags: Optional[List[tuple]], errors: Optional[Dict[str, int]], block_size: int, queue_size: int) -> int: # Conecta las etapas del pipeline
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    validate = field_flags is not None
+    pool = ProcessPoolExecutor(max_workers=max(1, workers))
+    try:
+        with open(output_path, 'wb', buffering=0) as file:
+            file.write(pd.DataFrame(columns=headers).to_csv(index=False).encode('utf-8'))
+            reader = asyncio.ensure_future(_read_blocks(
+                data_path, block_size, queue,
+                lambda block: loop.run_in_executor(pool, process_block, (block, headers, validate))))
+            writer = asyncio.ensure_future(_write_blocks(file, queue, field_flags, errors))
+            try:
+                _, rows = await asyncio.gather(reader, writer)
+            except BaseException:
+                # Si una etapa falla, la otra no debe quedar esperando la cola
+                reader.cancel()
+                writer.cancel()
+                raise
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return rows
+
+def run_pipeline(data_path: str, headers: List[str], output_path: str, workers: int = 1, field_flags: Optional[List[tuple]] = None, errors: Optional[Dict[str, int]] = None, block_size: int = PIPELINE_BLOCK_SIZE, queue_size: int = PIPELINE_QUEUE_SIZE) -> int: # Procesa el archivo con lectura, parsing y escritura superpuestos
+    """
+    Procesa el archivo CSV completo con las etapas de lectura, parsing y
+    escritura superpuestas, y escribe el CSV de salida.
+
+    El resultado es idéntico al de write_csv_stream con los lotes de
+    iter_batches. Como en write_csv_stream, las filas se escriben en un
+    temporal que reemplaza a output_path solo al terminar.
+
+    Args:
+        data_path (str): Ruta del archivo CSV de entrada
+        headers (List[str]): Encabezados del archivo (ya validados)
+        output_path (str): Ruta del archivo CSV resultante
+        workers (int): Procesos que parsean bloques en paralelo (al menos uno,
+            para que el parsing no frene la lectura ni la escritura)
+        field_flags (Optional[List[tuple]]): Si se pasa una lista, se valida cada
+            campo y la lista se llena con una tupla de banderas por fila, igual
+            que en parse_content
+        errors (Optional[Dict[str, int]]): Si se pasa un diccionario, se suma en
+            'malformed_records' el número de registros mal formados
+        block_size (int): Bytes leídos por bloque
+        queue_size (int): Bloques que pueden estar leídos o en proceso sin
+            haberse escrito todavía
+
+    Returns:
+        int: Número de filas escritas
+    """
+    temporary = output_path + '.tmp'
+    try:
+        rows = asyncio.run(_run(data_path, headers, temporary, workers, field_flags, errors, block_size, queue_size))
+        os.replace(temporary, output_path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return rows
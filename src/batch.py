@@ -0,0 +1,264 @@
+# Módulo de ingesta de varios archivos CSV
+# Este módulo procesa muchos archivos con el formato de BL-Flickr-Images-Book.csv
+# (por ejemplo, los distintos volcados de metadatos de la British Library):
+# - Acepta archivos, directorios (todos sus .csv) y patrones glob
+# - Valida los encabezados de cada archivo contra HEADER_PATTERN y omite los
+#   que no coinciden
+# - Divide todos los archivos en tareas de unos INGEST_TASK_SIZE bytes
+#   alineadas a registros (los archivos chicos se agrupan en una sola tarea)
+#   que se reparten en un único ProcessPoolExecutor: cada proceso toma la
+#   siguiente tarea pendiente apenas termina la anterior, sin importar de qué
+#   archivo sea, así que un archivo grande no deja procesos sin trabajo y
+#   muchos archivos chicos no pagan un costo de arranque cada uno
+# - Escribe una sola tabla concatenada o una salida por archivo
+
+import glob
+import mmap
+import os
+from collections import deque
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from config import INGEST_TASK_SIZE, PIPELINE_QUEUE_SIZE
+from processors import load_file, validate_headers, next_record_start, split_fields, split_fixed_ranges, iter_text_records, iter_batches
+from utils import create_dataframe
+
+def expand_inputs(specs: List[str]) -> List[str]: # Lista de archivos a partir de rutas, directorios y patrones
+    """
+    Expande las entradas indicadas en una lista de archivos.
+
+    Args:
+        specs (List[str]): Archivos, directorios (se toman sus archivos .csv) o
+            patrones glob (por ejemplo data/*.csv)
+
+    Returns:
+        List[str]: Archivos en el orden indicado (cada directorio y patrón en
+        orden alfabético), sin repetidos
+
+    Raises:
+        FileNotFoundError: Si una entrada no existe o un patrón no coincide con nada
+    """
+    paths = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            found = sorted(glob.glob(os.path.join(spec, '*.csv')))
+        elif any(symbol in spec for symbol in '*?['):
+            found = sorted(path for path in glob.glob(spec) if os.path.isfile(path))
+        else:
+            found = [spec] if os.path.isfile(spec) else []
+        if not found:
+            raise FileNotFoundError(f"No hay archivos CSV en {spec}")
+        paths.extend(found)
+    seen = set()
+    unique = []
+    for path in paths:
+        key = os.path.realpath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+def partition_path(output_dir: str, path: str) -> str: # Ruta de la salida de un archivo en modo particionado
+    """Devuelve la ruta de salida de un archivo de entrada: output_dir/<nombre>.csv"""
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + '.csv')
+
+def process_pieces(task: Tuple[List[Tuple[str, int, int]], List[str], bool]) -> Tuple[List[Tuple[str, int, bytes]], int]: # Tarea de un proceso del pool sobre varios rangos
+    """
+    Parsea, limpia y convierte a CSV los rangos de una tarea.
+
+    Los valores de todos los rangos se limpian juntos con una sola llamada a
+    create_dataframe; solo en modo particionado se separa el CSV de cada rango.
+
+    Args:
+        task (Tuple[List[Tuple[str, int, int]], List[str], bool]): Tupla
+            (rangos, encabezados, particionado) donde cada rango es (ruta,
+            inicio, fin) alineado a registros
+
+    Returns:
+        Tuple[List[Tuple[str, int, bytes]], int]: Tupla con (salidas,
+        mal_formados) donde salidas tiene (ruta, filas, csv en UTF-8) por
+        rango, o una sola salida con todas las filas si no es particionado
+    """
+    pieces, headers, partitioned = task
+    columns = {header: [] for header in headers}
+    counts = []
+    errors = {}
+    for path, begin, end in pieces:
+        mapping = load_file(path, mapped=True)
+        rows = 0
+        try:
+            for batch in iter_batches(iter_text_records(mapping, begin, end), headers, batch_size=end - begin + 1, errors=errors):
+                for header in headers:
+                    columns[header].extend(batch[header])
+                rows += len(batch[headers[0]])
+        finally:
+            if isinstance(mapping, mmap.mmap):
+                mapping.close()
+        counts.append(rows)
+    df = create_dataframe(headers, columns, compact=False) # Solo se convierte a CSV
+    if not partitioned:
+        return [(pieces[0][0], len(df), df.to_csv(index=False, header=False).encode('utf-8'))], errors.get('malformed_records', 0)
+    outputs = []
+    start = 0
+    for (path, _, _), rows in zip(pieces, counts):
+        part = df if len(pieces) == 1 else df.iloc[start:start + rows]
+        outputs.append((path, rows, part.to_csv(index=False, header=False).encode('utf-8') if rows else b''))
+        start += rows
+    return outputs, errors.get('malformed_records', 0)
+
+def plan_tasks(paths: List[str], skipped: List[str], task_size: int = INGEST_TASK_SIZE) -> Iterator[Tuple[List[Tuple[str, int, int]], List[str]]]: # Genera las tareas de todos los archivos
+    """
+    Valida los encabezados de cada archivo y genera sus tareas en orden.
+
+    Un archivo grande se divide en rangos de unos task_size bytes; los rangos
+    chicos (y los archivos chicos) se agrupan hasta sumar task_size. Un
+    archivo sin filas produce un rango vacío, para que igual tenga salida.
+
+    Args:
+        paths (List[str]): Archivos de entrada
+        skipped (List[str]): Lista donde se agregan los archivos con encabezados no válidos
+        task_size (int): Tamaño objetivo de cada tarea en bytes
+
+    Yields:
+        Tuple[List[Tuple[str, int, int]], List[str]]: Tarea (rangos, encabezados)
+        para process_pieces; todas usan los encabezados del primer archivo válido
+    """
+    headers = None
+    pending = []
+    pending_size = 0
+    for path in paths:
+        mapping = load_file(path, mapped=True)
+        try:
+            if not validate_headers(mapping):
+                print(f"ADVERTENCIA: Encabezados no válidos en {path}; el archivo se omite")
+                skipped.append(path)
+                continue
+            header_end = next_record_start(mapping, 0)
+            if headers is None:
+                headers = [field.decode('utf-8').strip() for field in split_fields(mapping[:header_end].rstrip(b'\r\n'))]
+            ranges = split_fixed_ranges(mapping, task_size, header_end) or [(header_end, header_end)]
+        finally:
+            if isinstance(mapping, mmap.mmap):
+                mapping.close()
+        for begin, end in ranges:
+            pending.append((path, begin, end))
+            pending_size += end - begin
+            if pending_size >= task_size:
+                yield pending, headers
+                pending, pending_size = [], 0
+    if pending:
+        yield pending, headers
+
+class _Outputs: # Archivos de salida abiertos durante la ingesta
+    """Escribe la tabla concatenada o una salida por archivo, con reemplazo atómico al terminar"""
+
+    def __init__(self, output_path: Optional[str], output_dir: Optional[str]):
+        self.output_path = output_path
+        self.output_dir = output_dir
+        self.files = {}  # Ruta final -> archivo temporal abierto
+        self.written = []
+
+    def write(self, path: str, data: bytes, header: bytes):
+        target = self.output_path or partition_path(self.output_dir, path)
+        file = self.files.get(target)
+        if file is None:
+            if self.output_path is None:
+                # En modo particionado cada archivo se termina antes de empezar el siguiente
+                self.close()
+            file = self.files[target] = open(target + '.tmp', 'wb')
+            file.write(header)
+            self.written.append(target)
+        file.write(data)
+
+    def close(self, failed: bool = False):
+        for target, file in self.files.items():
+            file.close()
+            if failed:
+                os.remove(file.name)
+            else:
+                os.replace(file.name, target)
+        self.files = {}
+
+def ingest_files(paths: List[str], output_path: Optional[str] = None, output_dir: Optional[str] = None, workers: int = 1, task_size: int = INGEST_TASK_SIZE) -> Dict: # Procesa varios archivos CSV con un único pool de procesos
+    """
+    Procesa varios archivos CSV y escribe sus filas limpias.
+
+    El contenido de cada salida es idéntico al que produce main.py con ese
+    archivo como DATA_PATH (en la tabla concatenada, las filas de cada archivo
+    siguen en el orden de paths).
+
+    Args:
+        paths (List[str]): Archivos de entrada (ver expand_inputs)
+        output_path (Optional[str]): Archivo CSV donde se concatenan las filas de todos los archivos
+        output_dir (Optional[str]): Directorio donde se escribe una salida por archivo
+            (con el nombre del archivo de entrada); se usa si output_path es None
+        workers (int): Procesos del pool compartido; con 1 se procesa en el proceso principal
+        task_size (int): Tamaño objetivo de cada tarea en bytes
+
+    Returns:
+        Dict: Resumen con las claves files (archivos procesados), skipped
+        (archivos omitidos por sus encabezados), rows, malformed_records y
+        outputs (archivos escritos)
+
+    Raises:
+        ValueError: Si no se indica ninguna salida o dos entradas tendrían la misma salida particionada
+    """
+    if output_path is None and output_dir is None:
+        raise ValueError("Se necesita un archivo de salida o un directorio de salidas por archivo")
+    if output_path is None:
+        targets = [partition_path(output_dir, path) for path in paths]
+        if len(set(targets)) < len(targets):
+            raise ValueError("Hay archivos de entrada con el mismo nombre; no se pueden particionar en un solo directorio")
+        os.makedirs(output_dir, exist_ok=True)
+    skipped = []
+    tasks = plan_tasks(paths, skipped, task_size)
+    first = next(tasks, None)
+    outputs = _Outputs(output_path, output_dir)
+    summary = {'rows': 0, 'malformed_records': 0}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if first is None:
+            # Ningún archivo tiene encabezados válidos
+            tasks = iter(())
+        else:
+            header = pd.DataFrame(columns=first[1]).to_csv(index=False).encode('utf-8')
+            tasks = chain([first], tasks)
+        tasks = ((pieces, headers, output_path is None) for pieces, headers in tasks)
+        if pool is None:
+            results = map(process_pieces, tasks)
+        else:
+            results = _ordered(pool, tasks, workers * PIPELINE_QUEUE_SIZE)
+        for pieces, malformed in results:
+            for path, rows, data in pieces:
+                outputs.write(path, data, header)
+                summary['rows'] += rows
+            summary['malformed_records'] += malformed
+        outputs.close()
+    except BaseException:
+        outputs.close(failed=True)
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    summary['files'] = len(paths) - len(skipped)
+    summary['skipped'] = skipped
+    summary['outputs'] = outputs.written
+    return summary
+
+def _ordered(pool: ProcessPoolExecutor, tasks: Iterator, window: int) -> Iterator: # Resultados de las tareas en orden con un número acotado en curso
+    """
+    Envía las tareas al pool y entrega sus resultados en el orden de envío.
+
+    Como mucho window tareas quedan enviadas sin haberse entregado: la cola
+    del pool es compartida, así que cada proceso libre toma la siguiente
+    tarea sin importar de qué archivo sea, y la memoria de los resultados
+    que esperan su turno queda acotada.
+    """
+    futures = deque()
+    for task in tasks:
+        futures.append(pool.submit(process_pieces, task))
+        if len(futures) >= window:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
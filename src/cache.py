@@ -0,0 +1,176 @@
+# Módulo de caché persistente de resultados procesados
+# Este módulo evita volver a leer y parsear el CSV cuando no cambió:
+# - Guarda el DataFrame ya limpio y tipado en un archivo binario (pickle)
+# - La clave combina ruta, tamaño, fecha de modificación, inodo y hash del
+#   inicio y del final del archivo, más un hash de las reglas (el código de
+#   los módulos de parsing, limpieza y patrones), así que un cambio de datos o
+#   de reglas la invalida sin tener que leer el archivo completo en cada carga.
+#   Solo una reescritura del medio del archivo que conserve el tamaño y la
+#   fecha de modificación pasaría inadvertida
+# - El directorio de caché tiene un tamaño máximo y se desalojan primero las
+#   entradas usadas hace más tiempo (LRU)
+#
+# La caché usa pickle, así que solo debe apuntar a un directorio local de
+# confianza (por defecto output/cache).
+
+import hashlib
+import inspect
+import json
+import mmap
+import os
+import pickle
+from functools import lru_cache
+from typing import Optional
+import pandas as pd
+import config
+import patterns
+import processors
+import tokenizer
+import utils
+from processors import load_file, parse_content
+
+CACHE_VERSION = 1 # Cambiar si cambia el formato de las entradas de la caché
+CACHE_SUFFIX = '.pkl'
+FINGERPRINT_BYTES = 64 * 1024 # Bytes del inicio y del final del archivo que entran en la clave
+RULE_MODULES = (tokenizer, processors, utils, patterns) # Módulos cuyo código determina el DataFrame resultante
+
+@lru_cache(maxsize=1)
+def rules_hash() -> str: # Hash de las reglas que determinan el resultado del procesamiento
+    """
+    Calcula un hash de todo lo que determina el DataFrame resultante además del archivo.
+
+    Incluye el código fuente completo de los módulos que parsean, limpian y
+    tipan los datos (RULE_MODULES: tokenizador, parsing, limpieza y patrones,
+    incluidos REGISTRY y YEAR_PATTERN), el umbral de category y la versión de
+    pandas (las entradas se guardan con pickle). Se hashean los módulos
+    completos y no una lista de funciones, para que un cambio en cualquier
+    función auxiliar también invalide la caché. Se calcula una vez por proceso.
+
+    Returns:
+        str: Hash hexadecimal de las reglas
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([CACHE_VERSION, config.CATEGORY_RATIO, pd.__version__]).encode('utf-8'))
+    for module in RULE_MODULES:
+        digest.update(inspect.getsource(module).encode('utf-8'))
+    return digest.hexdigest()
+
+def file_fingerprint(file_path: str) -> str: # Hash del inicio y del final de un archivo
+    """
+    Calcula el hash BLAKE2b de los primeros y los últimos FINGERPRINT_BYTES de
+    un archivo (o de todo el archivo si es más chico).
+
+    Junto con el tamaño, la fecha de modificación y el inodo detecta los
+    cambios habituales (registros agregados, archivo reemplazado o editado)
+    leyendo a lo sumo 2 * FINGERPRINT_BYTES, sin importar el tamaño del archivo.
+
+    Args:
+        file_path (str): Ruta del archivo
+
+    Returns:
+        str: Hash hexadecimal del inicio y del final
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        size = file.seek(0, 2)
+        file.seek(0)
+        digest.update(file.read(min(size, FINGERPRINT_BYTES)))
+        if size > FINGERPRINT_BYTES:
+            file.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            digest.update(file.read())
+    return digest.hexdigest()
+
+def cache_key(file_path: str) -> str: # Clave de caché de un archivo de entrada
+    """
+    Calcula la clave de caché de un archivo de entrada.
+
+    Args:
+        file_path (str): Ruta del archivo CSV de entrada
+
+    Returns:
+        str: Clave hexadecimal que cambia si cambia el archivo o las reglas
+    """
+    stat = os.stat(file_path)
+    parts = [os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino, file_fingerprint(file_path), rules_hash()]
+    return hashlib.blake2b(json.dumps(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+def evict(cache_dir: str, max_bytes: int) -> int: # Desaloja las entradas menos usadas hasta respetar el tamaño máximo
+    """
+    Elimina entradas de la caché hasta que el directorio ocupe a lo sumo max_bytes.
+
+    Cada lectura actualiza la fecha de modificación de su entrada, así que las
+    de fecha más antigua son las usadas hace más tiempo y se eliminan primero.
+
+    Args:
+        cache_dir (str): Directorio de la caché
+        max_bytes (int): Tamaño máximo del directorio en bytes
+
+    Returns:
+        int: Número de entradas eliminadas
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(CACHE_SUFFIX):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(os.path.join(cache_dir, name))
+        total -= size
+        removed += 1
+    return removed
+
+def _read_entry(entry: str) -> Optional[pd.DataFrame]: # Lee una entrada de la caché si existe
+    """Lee una entrada de la caché y la marca como usada; devuelve None si no existe o está dañada"""
+    try:
+        with open(entry, 'rb') as file:
+            df = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Entrada de caché inválida, se regenera: {str(e)}")
+        return None
+    # Actualizar la fecha de modificación para la política LRU
+    os.utime(entry)
+    return df
+
+def load_cached_dataframe(file_path: str, cache_dir: str = config.CACHE_DIR, max_bytes: int = config.CACHE_MAX_BYTES) -> pd.DataFrame: # Carga el DataFrame procesado desde la caché o lo genera
+    """
+    Devuelve el DataFrame procesado de un archivo, usando la caché si es posible.
+
+    Con la caché caliente solo se calcula la clave (que lee el inicio y el
+    final del archivo) y se carga el pickle. Si no hay entrada, el archivo se procesa
+    como en main (mapeo, parse_content por columnas y create_dataframe), el
+    resultado se guarda de forma atómica y se aplica el límite de tamaño.
+
+    Args:
+        file_path (str): Ruta del archivo CSV de entrada
+        cache_dir (str): Directorio de la caché
+        max_bytes (int): Tamaño máximo del directorio de la caché en bytes
+
+    Returns:
+        pd.DataFrame: DataFrame con datos limpios y tipos apropiados
+    """
+    entry = os.path.join(cache_dir, cache_key(file_path) + CACHE_SUFFIX)
+    cached = _read_entry(entry)
+    if cached is not None:
+        return cached
+
+    mapping = load_file(file_path, mapped=True)
+    try:
+        headers, data = parse_content(mapping, columnar=True)
+    finally:
+        if isinstance(mapping, mmap.mmap):
+            mapping.close()
+    df = utils.create_dataframe(headers, data)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = entry + '.tmp'
+    with open(temporary, 'wb') as file:
+        pickle.dump(df, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, entry)
+    evict(cache_dir, max_bytes)
+    return df
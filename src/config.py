@@ -5,4 +5,41 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # Ruta ba
 
 # Rutas de archivos
 DATA_PATH = os.path.join(BASE_DIR, 'data', 'BL-Flickr-Images-Book.csv') # Ruta al archivo CSV de entrada
-OUTPUT_PATH = os.path.join(BASE_DIR, 'output', 'datos_procesados.csv') # Ruta al archivo CSV de salida
\ No newline at end of file
+OUTPUT_PATH = os.path.join(BASE_DIR, 'output', 'datos_procesados.csv') # Ruta al archivo CSV de salida
+INDEX_PATH = os.path.join(BASE_DIR, 'output', 'identifier.idx') # Índice en disco de Identifier -> posición del registro
+CACHE_DIR = os.path.join(BASE_DIR, 'output', 'cache') # Directorio de la caché de resultados procesados
+TEXT_INDEX_PATH = os.path.join(BASE_DIR, 'output', 'text.idx') # Índice invertido de Title, Author y Contributors
+METRICS_PATH = os.path.join(BASE_DIR, 'output', 'metrics.json') # Métricas por etapa de la última ejecución
+QUARANTINE_PATH = os.path.join(BASE_DIR, 'output', 'quarantine.jsonl') # Registros rechazados (cuarentena) de la última ejecución
+
+# Parámetros de lectura
+CHUNK_SIZE = 64 * 1024 # Tamaño (en caracteres) de cada bloque leído y tokenizado
+BATCH_SIZE = 4096 # Registros que se acumulan antes de transponerlos a las listas por columna
+
+# Parámetros de paralelismo
+WORKERS = 1 # Número de procesos para parse_content; con 1 se procesa en el proceso principal
+PIPELINE_BLOCK_SIZE = 1024 * 1024 # Tamaño (en bytes) de los bloques del pipeline por etapas (--pipeline)
+PIPELINE_QUEUE_SIZE = 4 # Bloques leídos o en proceso que el pipeline por etapas admite sin haberlos escrito
+INGEST_TASK_SIZE = 1024 * 1024 # Tamaño (en bytes) de cada tarea de la ingesta de varios archivos; los archivos chicos se agrupan hasta este tamaño
+
+# Parámetros del DataFrame
+CATEGORY_RATIO = 0.5 # Proporción máxima de valores distintos (sobre el total de filas) para usar dtype category
+
+# Parámetros de salida
+OUTPUT_COMPRESSION = 'zstd' # Compresión de los formatos columnares (Parquet y Feather)
+ROW_GROUP_SIZE = 128 * 1024 # Filas por grupo (Parquet) o por lote (Feather) al escribir
+OUTPUT_BATCH_SIZE = 10000 # Registros por lote en la escritura incremental del CSV
+WRITE_BUFFER_SIZE = 1024 * 1024 # Tamaño (en bytes) del buffer de escritura del CSV incremental
+INCREMENTAL_CHUNK_SIZE = 256 * 1024 # Tamaño (en bytes) de los bloques que registra el manifiesto del modo incremental
+
+# Parámetros de validación
+FIELD_TIME_BUDGET = 0.05 # Tiempo máximo (en segundos) de la validación regex de un campo; al superarlo se omite
+
+# Parámetros de la cuarentena de registros rechazados
+REJECT_MAX_RATE = 0.01 # Proporción máxima de registros rechazados; al superarla se detiene el procesamiento
+REJECT_MIN_RECORDS = 1000 # Registros leídos antes de empezar a evaluar la proporción de rechazos
+QUARANTINE_LIMIT = 10000 # Registros rechazados que se guardan con detalle; los siguientes solo se cuentan
+REJECT_BUFFER_SIZE = 256 # Registros rechazados que se acumulan antes de escribirlos en la cuarentena
+
+# Parámetros de la caché
+CACHE_MAX_BYTES = 256 * 1024 * 1024 # Tamaño máximo del directorio de caché; se desalojan las entradas menos usadas
@@ -0,0 +1,513 @@
+# Módulo de autómatas finitos deterministas para validar los campos del CSV
+# Este módulo convierte los patrones de PATTERNS en autómatas reales, como los
+# diagramas de docs/maquinas_estado/:
+# - Analiza cada patrón con sre_parse y construye un AFN (Thompson); el ^
+#   inicial y el lookahead final (?=,|$) se traducen a lo que debe seguir
+#   al prefijo reconocido, así que la semántica es la de re.match
+# - Lo determiniza por subconjuntos sobre clases de caracteres y lo minimiza
+# - Combina los autómatas de todos los campos en uno solo que valida una fila
+#   completa en una pasada de izquierda a derecha, sin retroceso: el tiempo
+#   por fila es lineal en su largo sin importar el patrón
+# Las tablas de transición se guardan en arreglos compactos (array).
+# main.py --validate-fields --dfa valida con RowAutomaton en lugar de
+# validators.validate_columns: da las mismas banderas y no necesita el
+# límite de tiempo por campo, aunque en el dataset es más lento que re.
+
+import re
+from array import array
+from typing import Dict, FrozenSet, List, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - versiones anteriores de Python
+    import sre_parse
+
+# Clase reservada para el separador entre campos de una fila
+SEPARATOR_CLASS = 0
+
+# Carácter que separa los campos antes de traducirlos a clases (el separador
+# de unidades de ASCII, así str.translate usa su camino rápido para ASCII); si
+# aparece en los datos, los campos se traducen por separado
+SEPARATOR = '\x1f'
+
+# Máximo de campos con patrón no trivial en el autómata de fila; el número de
+# estados crece con 2^campos porque el estado recuerda qué campos aceptó
+MAX_ROW_FIELDS = 8
+
+# Caracteres fuera de Latin-1 que representan las categorías de \d, \s y \w
+_REPRESENTATIVES = '\u0663\u2003\u0436\u4e00\u20ac\u3000'
+
+_CATEGORIES = {
+    'DIGIT': str.isdecimal,
+    'SPACE': str.isspace,
+    'WORD': lambda char: char.isalnum() or char == '_',
+}
+
+# Conjunto de caracteres: (negado, caracteres, rangos, categorías (nombre, negada))
+CharSet = Tuple[bool, FrozenSet[str], Tuple[Tuple[int, int], ...], Tuple[Tuple[str, bool], ...]]
+
+def _category(code) -> Tuple[str, bool]: # Traduce una categoría de sre_parse a (nombre, negada)
+    """Traduce CATEGORY_DIGIT, CATEGORY_NOT_SPACE, etc. a (nombre, negada)"""
+    name = str(code).replace('CATEGORY_', '').replace('UNI_', '')
+    negated = name.startswith('NOT_')
+    name = name[4:] if negated else name
+    if name not in _CATEGORIES:
+        raise ValueError(f"Categoría no soportada por el autómata: {code}")
+    return name, negated
+
+def _charset(opcode, argument, dotall: bool) -> CharSet: # Conjunto de caracteres de un nodo de sre_parse
+    """Convierte un nodo LITERAL, NOT_LITERAL, ANY o IN en un conjunto de caracteres"""
+    if opcode is sre_parse.LITERAL:
+        return (False, frozenset(chr(argument)), (), ())
+    if opcode is sre_parse.NOT_LITERAL:
+        return (True, frozenset(chr(argument)), (), ())
+    if opcode is sre_parse.ANY:
+        return (True, frozenset() if dotall else frozenset('\n'), (), ())
+    negated, chars, ranges, categories = False, set(), [], []
+    for item, value in argument:
+        if item is sre_parse.NEGATE:
+            negated = True
+        elif item is sre_parse.LITERAL:
+            chars.add(chr(value))
+        elif item is sre_parse.RANGE:
+            ranges.append(tuple(value))
+        elif item is sre_parse.CATEGORY:
+            categories.append(_category(value))
+        else:
+            raise ValueError(f"Clase de caracteres no soportada por el autómata: {item}")
+    return (negated, frozenset(chars), tuple(ranges), tuple(categories))
+
+def _contains(charset: CharSet, char: str) -> bool: # Indica si un carácter pertenece a un conjunto
+    """Indica si un carácter pertenece a un conjunto de caracteres"""
+    negated, chars, ranges, categories = charset
+    code = ord(char)
+    hit = (char in chars
+           or any(low <= code <= high for low, high in ranges)
+           or any(_CATEGORIES[name](char) != category_negated for name, category_negated in categories))
+    return hit != negated
+
+class _NFA: # Autómata finito no determinista construido por el método de Thompson
+    """AFN con transiciones por conjunto de caracteres y transiciones vacías"""
+
+    def __init__(self, charsets: Dict[CharSet, int], dotall: bool):
+        self.charsets = charsets  # Conjunto de caracteres -> número de átomo (compartido entre campos)
+        self.dotall = dotall
+        self.edges: List[List[Tuple[int, int]]] = []
+        self.empty: List[List[int]] = []
+        self.start = self.state()
+        self.accept = None
+
+    def state(self) -> int: # Agrega un estado y devuelve su número
+        self.edges.append([])
+        self.empty.append([])
+        return len(self.edges) - 1
+
+    def atom(self, charset: CharSet) -> int: # Número de átomo de un conjunto de caracteres
+        return self.charsets.setdefault(charset, len(self.charsets))
+
+    def step(self, start: int, charset: CharSet) -> int: # Agrega una transición por un conjunto de caracteres
+        end = self.state()
+        self.edges[start].append((self.atom(charset), end))
+        return end
+
+    def sequence(self, items, start: int) -> int: # Agrega una secuencia de nodos y devuelve su estado final
+        for opcode, argument in items:
+            start = self.node(opcode, argument, start)
+        return start
+
+    def node(self, opcode, argument, start: int) -> int: # Agrega un nodo de sre_parse y devuelve su estado final
+        if opcode in (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.ANY, sre_parse.IN):
+            return self.step(start, _charset(opcode, argument, self.dotall))
+        if opcode is sre_parse.SUBPATTERN:
+            if argument[1] or argument[2]:
+                raise ValueError("Las banderas dentro de grupos no están soportadas por el autómata")
+            return self.sequence(argument[3], start)
+        if opcode is sre_parse.BRANCH:
+            end = self.state()
+            for branch in argument[1]:
+                self.empty[self.sequence(branch, start)].append(end)
+            return end
+        if opcode in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            # La repetición perezosa reconoce el mismo lenguaje que la codiciosa
+            low, high, items = argument
+            for _ in range(low):
+                start = self.sequence(items, start)
+            if high is sre_parse.MAXREPEAT:
+                loop = self.state()
+                self.empty[start].append(loop)
+                self.empty[self.sequence(items, loop)].append(loop)
+                return loop
+            end = self.state()
+            for _ in range(high - low):
+                self.empty[start].append(end)
+                start = self.sequence(items, start)
+            self.empty[start].append(end)
+            return end
+        raise ValueError(f"Construcción no soportada por el autómata: {opcode}")
+
+    def closure(self, states) -> FrozenSet[int]: # Cierre por transiciones vacías
+        stack = list(states)
+        seen = set(stack)
+        while stack:
+            for target in self.empty[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+def _split_anchors(items) -> Tuple[list, list]: # Separa el cuerpo del patrón de lo que debe seguirle
+    """
+    Traduce el ^ inicial y el $ o lookahead final a alternativas de cola.
+
+    re.match acepta un valor si un prefijo coincide con el cuerpo y lo que
+    sigue cumple el final del patrón. Devuelve el cuerpo y las alternativas
+    de cola como (nodos, exacta): exacta indica que después de los nodos debe
+    terminar el valor (el $ también acepta un salto de línea final); si no,
+    puede seguir cualquier texto.
+    """
+    items = list(items)
+    if items and items[0] == (sre_parse.AT, sre_parse.AT_BEGINNING):
+        items = items[1:]
+    tails = [([], False)]
+    if items and items[-1] == (sre_parse.AT, sre_parse.AT_END):
+        items, tails = items[:-1], [([], True)]
+    elif items and items[-1][0] is sre_parse.ASSERT and items[-1][1][0] == 1:
+        lookahead = list(items[-1][1][1])
+        items = items[:-1]
+        if len(lookahead) == 1 and lookahead[0][0] is sre_parse.BRANCH:
+            alternatives = [list(branch) for branch in lookahead[0][1][1]]
+        else:
+            alternatives = [lookahead]
+        tails = []
+        for alternative in alternatives:
+            if alternative and alternative[-1] == (sre_parse.AT, sre_parse.AT_END):
+                tails.append((alternative[:-1], True))
+            else:
+                tails.append((alternative, False))
+    return items, tails
+
+class Alphabet: # Partición de los caracteres en clases equivalentes para los autómatas
+    """
+    Agrupa los caracteres en clases según a qué conjuntos de los patrones pertenecen.
+
+    Dos caracteres de la misma clase son indistinguibles para todos los
+    autómatas, así que las tablas tienen una columna por clase y no por
+    carácter. classes es un diccionario usable con str.translate: traduce
+    cada carácter a su número de clase y calcula las clases de caracteres
+    nuevos la primera vez que aparecen; row_classes hace lo mismo pero
+    traduce SEPARATOR a la clase del separador.
+
+    Attributes:
+        charsets (Dict[CharSet, int]): Conjuntos de caracteres de los patrones
+        signatures (Dict[Tuple[bool, ...], int]): Clase por firma de pertenencia
+        members (List[FrozenSet[int]]): Átomos que contienen a cada clase
+        classes (Dict[int, int]): Código de carácter -> clase
+        row_classes (Dict[int, int]): Igual que classes, con SEPARATOR -> SEPARATOR_CLASS
+    """
+
+    def __init__(self, charsets: Dict[CharSet, int]):
+        self.charsets = charsets
+        self.atoms = sorted(charsets, key=charsets.get)
+        self.signatures: Dict[Tuple[bool, ...], int] = {None: SEPARATOR_CLASS}
+        self.members: List[FrozenSet[int]] = [frozenset()]
+        self.classes = _ClassMap(self)
+        self.row_classes = _ClassMap(self)
+        self.row_classes[ord(SEPARATOR)] = SEPARATOR_CLASS
+        representatives = set(map(chr, range(256))) | set(_REPRESENTATIVES)
+        for _, chars, ranges, _ in self.atoms:
+            representatives |= chars
+            for low, high in ranges:
+                representatives.update(chr(code) for code in (low, high, max(low - 1, 0), min(high + 1, 0x10FFFF)))
+        for char in sorted(representatives):
+            self.classes[ord(char)] = self.class_of(char)
+        self.row_classes.update((code, number) for code, number in self.classes.items() if code != ord(SEPARATOR))
+
+    def class_of(self, char: str) -> int: # Clase de un carácter (crea la clase si es nueva)
+        signature = tuple(_contains(atom, char) for atom in self.atoms)
+        number = self.signatures.get(signature)
+        if number is None:
+            number = self.signatures[signature] = len(self.members)
+            self.members.append(frozenset(index for index, hit in enumerate(signature) if hit))
+        return number
+
+class _ClassMap(dict): # Mapa de caracteres a clases para str.translate
+    """Diccionario código -> clase que calcula las clases de caracteres no vistos"""
+
+    def __init__(self, alphabet: 'Alphabet'):
+        super().__init__()
+        self.alphabet = alphabet
+
+    def __missing__(self, code: int) -> int: # Calcula la clase de un carácter no visto
+        count = len(self.alphabet.members)
+        number = self[code] = self.alphabet.class_of(chr(code))
+        if len(self.alphabet.members) != count:
+            raise _NewClass(number)
+        return number
+
+class _NewClass(Exception): # Señal interna: apareció una clase de caracteres no prevista
+    pass
+
+class DFA: # Autómata finito determinista minimizado de un patrón
+    """
+    Autómata determinista mínimo que reconoce los valores aceptados por re.match(patrón, valor).
+
+    Attributes:
+        pattern (str): Patrón original
+        start (int): Estado inicial
+        accepting (bytes): 1 si el estado es de aceptación
+        transitions (List[array]): Siguiente estado por clase, para cada estado
+    """
+
+    def __init__(self, pattern: str, nfa: _NFA):
+        self.pattern = pattern
+        self.nfa = nfa
+        self.start = 0
+        self.accepting = b''
+        self.transitions: List[array] = []
+
+    def build(self, alphabet: Alphabet): # Determiniza y minimiza el AFN sobre las clases del alfabeto
+        """Construye la tabla del autómata (subconjuntos + minimización de Moore) para las clases actuales"""
+        nfa = self.nfa
+        classes = range(1, len(alphabet.members))
+        start = nfa.closure([nfa.start])
+        numbers = {start: 0}
+        subsets = [start]
+        table = []
+        for subset in subsets:
+            row = [0]  # La clase del separador no se usa dentro de un campo
+            for number in classes:
+                members = alphabet.members[number]
+                targets = nfa.closure(target for state in subset for atom, target in nfa.edges[state] if atom in members)
+                if targets not in numbers:
+                    numbers[targets] = len(subsets)
+                    subsets.append(targets)
+                row.append(numbers[targets])
+            table.append(row)
+        accepting = [int(nfa.accept in subset) for subset in subsets]
+
+        # Minimización de Moore: refinar bloques hasta que no cambien
+        blocks = accepting
+        count = len(set(blocks))
+        while True:
+            keys = [(blocks[state],) + tuple(blocks[target] for target in table[state][1:]) for state in range(len(table))]
+            numbering: Dict[tuple, int] = {}
+            refined = [numbering.setdefault(key, len(numbering)) for key in keys]
+            if len(numbering) == count:
+                break
+            blocks, count = refined, len(numbering)
+        # Renumerar para que el estado inicial sea el 0
+        order = {}
+        for state in [0] + list(range(len(table))):
+            order.setdefault(blocks[state], len(order))
+        minimal = [None] * count
+        for state, row in enumerate(table):
+            minimal[order[blocks[state]]] = array('I', [0] + [order[blocks[target]] for target in row[1:]])
+        self.transitions = minimal
+        self.accepting = bytes(accepting[blocks.index(block)] for block in sorted(order, key=order.get))
+        self.start = 0
+
+    @property
+    def universal(self) -> bool: # Indica si el autómata acepta cualquier valor
+        """True si el autómata mínimo tiene un único estado de aceptación: el patrón acepta cualquier valor"""
+        return len(self.transitions) == 1 and bool(self.accepting[0])
+
+def compile_nfa(pattern: str, charsets: Dict[CharSet, int]) -> _NFA: # Construye el AFN de un patrón
+    """
+    Construye el AFN de Thompson de un patrón con la semántica de re.match.
+
+    Args:
+        pattern (str): Expresión regular (sin banderas de mayúsculas, ASCII ni multilínea)
+        charsets (Dict[CharSet, int]): Átomos compartidos entre patrones (se amplía)
+
+    Returns:
+        _NFA: Autómata no determinista
+
+    Raises:
+        ValueError: Si el patrón es inválido o usa construcciones no regulares
+            (referencias, lookbehind, lookahead intermedio, etc.)
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error as e:
+        raise ValueError(f"Patrón inválido: {str(e)}")
+    flags = parsed.state.flags
+    if flags & (re.IGNORECASE | re.MULTILINE | re.ASCII | re.LOCALE):
+        raise ValueError(f"Banderas no soportadas por el autómata en {pattern!r}")
+    nfa = _NFA(charsets, bool(flags & re.DOTALL))
+    body, tails = _split_anchors(parsed)
+    middle = nfa.sequence(body, nfa.start)
+    nfa.accept = nfa.state()
+    anything = (True, frozenset(), (), ())
+    for items, exact in tails:
+        end = nfa.sequence(items, middle)
+        if exact:
+            # $ acepta el final del valor o un salto de línea final
+            nfa.empty[end].append(nfa.accept)
+            nfa.empty[nfa.step(end, (False, frozenset('\n'), (), ()))].append(nfa.accept)
+        else:
+            loop = nfa.state()
+            nfa.empty[end].append(loop)
+            nfa.edges[loop].append((nfa.atom(anything), loop))
+            nfa.empty[loop].append(nfa.accept)
+    return nfa
+
+class RowAutomaton: # Autómata que valida todos los campos de una fila en una pasada
+    """
+    Valida los campos de una fila contra sus patrones con un único autómata.
+
+    Los campos cuyo autómata mínimo acepta cualquier valor (la mayoría de los
+    de texto libre) no se recorren. Los demás se traducen a clases, se unen
+    con la clase separadora y se recorren una vez: el estado combinado es
+    (campo actual, estado del campo, campos ya aceptados), y al leer el
+    separador se pasa al siguiente campo anotando si el actual fue aceptado.
+    La tabla se guarda en un array('I') plano con los estados premultiplicados
+    por el número de clases, así que cada carácter cuesta una suma y un
+    acceso al arreglo.
+
+    Attributes:
+        headers (List[str]): Columnas de la fila
+        fields (List[int]): Posiciones de las columnas que se recorren
+        dfas (Dict[str, DFA]): Autómata mínimo por columna con patrón
+    """
+
+    def __init__(self, headers: List[str], sources: Dict[str, str]):
+        """
+        Compila los patrones de las columnas.
+
+        Args:
+            headers (List[str]): Columnas de la fila, en orden
+            sources (Dict[str, str]): Patrón por columna (por ejemplo REGISTRY.sources);
+                las columnas sin patrón se consideran siempre válidas
+
+        Raises:
+            ValueError: Si algún patrón no se puede convertir en autómata o hay
+                más de MAX_ROW_FIELDS columnas con patrón no trivial
+        """
+        self.headers = headers
+        charsets: Dict[CharSet, int] = {}
+        nfas = {header: compile_nfa(sources[header], charsets) for header in headers if header in sources}
+        self.alphabet = Alphabet(charsets)
+        self.dfas = {header: DFA(sources[header], nfa) for header, nfa in nfas.items()}
+        self._build()
+
+    def _build(self): # Construye los autómatas de campo y la tabla combinada
+        for dfa in self.dfas.values():
+            dfa.build(self.alphabet)
+        self.fields = [index for index, header in enumerate(self.headers)
+                       if header in self.dfas and not self.dfas[header].universal]
+        if len(self.fields) > MAX_ROW_FIELDS:
+            raise ValueError(f"Demasiadas columnas con patrón para un autómata de fila: {len(self.fields)}")
+        dfas = [self.dfas[self.headers[index]] for index in self.fields]
+        width = len(self.alphabet.members)
+
+        # Numeración de estados: bloque (campo, campos aceptados) de tamaño len(dfa), y al final los estados terminales
+        bases = []
+        total = 0
+        for position, dfa in enumerate(dfas):
+            bases.append(total)
+            total += len(dfa.transitions) << position
+        terminal = total
+        total += 1 << len(dfas)
+
+        table = array('I', bytes(4 * total * width))
+        masks = array('I', bytes(4 * total))
+        for position, dfa in enumerate(dfas):
+            size = len(dfa.transitions)
+            for accepted in range(1 << position):
+                base = bases[position] + accepted * size
+                for state, row in enumerate(dfa.transitions):
+                    offset = (base + state) * width
+                    for number in range(1, width):
+                        table[offset + number] = (base + row[number]) * width
+                    mask = accepted | (dfa.accepting[state] << position)
+                    if position + 1 < len(dfas):
+                        table[offset] = (bases[position + 1] + mask * len(dfas[position + 1].transitions)) * width
+                    else:
+                        table[offset] = (terminal + mask) * width
+        for mask in range(1 << len(dfas)):
+            masks[terminal + mask] = mask
+            offset = (terminal + mask) * width
+            for number in range(width):
+                table[offset + number] = offset
+        self.table = table
+        self.masks = masks
+        self.width = width
+        self.start = 0 if dfas else terminal * width
+        # Copia en lista para el ciclo por carácter: leer de una lista no crea objetos int
+        self._steps = table.tolist()
+        self._select = (lambda values: ()) if not self.fields else (lambda values: [values[index] for index in self.fields])
+
+    def _encode(self, values: List[str]) -> bytes: # Traduce los campos recorridos a bytes de clases separados
+        """Une los campos recorridos (sin espacios extremos) con el separador y los traduce a un byte de clase por carácter"""
+        while True:
+            selected = self._select(values)
+            try:
+                text = SEPARATOR.join([value.strip() for value in selected]) + SEPARATOR
+                if text.count(SEPARATOR) == len(selected):
+                    return text.translate(self.alphabet.row_classes).encode('latin-1')
+                # El separador aparece en los datos: traducir cada campo por separado
+                separator = chr(SEPARATOR_CLASS)
+                text = separator.join([value.strip().translate(self.alphabet.classes) for value in selected]) + separator
+                return text.encode('latin-1')
+            except _NewClass:
+                # Un carácter creó una clase nueva: reconstruir las tablas y volver a traducir
+                if len(self.alphabet.members) > 256:
+                    raise ValueError("Demasiadas clases de caracteres para el autómata")
+                self._build()
+
+    def accepted_mask(self, values: List[str]) -> int: # Recorre la fila y devuelve qué campos recorridos aceptó
+        """
+        Valida una fila en una pasada y devuelve los campos recorridos aceptados.
+
+        Args:
+            values (List[str]): Valores crudos de la fila, en el orden de headers
+
+        Returns:
+            int: Máscara de bits; el bit i corresponde a la columna self.fields[i]
+        """
+        data = self._encode(values)
+        steps = self._steps
+        state = self.start
+        for number in data:
+            state = steps[state + number]
+        return self.masks[state // self.width]
+
+    def validate_row(self, values: List[str]) -> List[bool]: # Bandera de aceptación por columna de una fila
+        """
+        Valida cada campo de una fila, igual que re.match sobre el valor sin espacios extremos.
+
+        Args:
+            values (List[str]): Valores crudos de la fila, en el orden de headers
+
+        Returns:
+            List[bool]: Una bandera por columna indicando si el valor fue aceptado
+        """
+        flags = [True] * len(self.headers)
+        mask = self.accepted_mask(values)
+        for bit, index in enumerate(self.fields):
+            flags[index] = bool(mask >> bit & 1)
+        return flags
+
+    def validate_columns(self, columns: List[List[str]]) -> List[List[bool]]: # Valida columnas completas fila por fila
+        """
+        Valida columnas completas con el autómata de fila.
+
+        Devuelve lo mismo que validators.validate_columns, pero recorriendo
+        cada fila una sola vez.
+
+        Args:
+            columns (List[List[str]]): Valores crudos de cada columna, en el orden de headers
+
+        Returns:
+            List[List[bool]]: Por cada columna, una bandera por fila
+        """
+        rows = len(columns[0]) if columns else 0
+        flags = [[True] * rows for _ in self.headers]
+        accepted_mask = self.accepted_mask
+        for row, values in enumerate(zip(*columns)):
+            mask = accepted_mask(values)
+            # self.fields se lee en cada fila porque una clase nueva puede reconstruir el autómata
+            for bit, index in enumerate(self.fields):
+                if not mask >> bit & 1:
+                    flags[index][row] = False
+        return flags
@@ -0,0 +1,191 @@
+# Módulo de reprocesamiento incremental del archivo CSV
+# Este módulo evita volver a procesar todo el archivo cuando solo cambió una parte:
+# - Divide la entrada en bloques de bytes alineados a registros
+# - Guarda en un manifiesto junto al archivo de salida la posición y el hash
+#   de cada bloque procesado, y dónde terminan sus filas en la salida
+# - En la siguiente ejecución solo procesa los bloques nuevos o modificados
+#   y los une a la salida existente
+# - El manifiesto guarda también el hash de las reglas (el mismo de la caché)
+#   y el tamaño y la fecha de modificación de la salida: si cambian las
+#   reglas o si otro modo reescribe la salida, se reprocesa todo
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from config import INCREMENTAL_CHUNK_SIZE
+from processors import load_file, next_record_start, split_fields, split_fixed_ranges, iter_text_records, iter_batches
+from utils import create_dataframe
+from cache import rules_hash
+
+MANIFEST_VERSION = 2 # Cambiar si cambia el formato del manifiesto
+
+def manifest_path(output_path: str) -> str: # Ruta del manifiesto asociado a un archivo de salida
+    """
+    Devuelve la ruta del manifiesto que acompaña a un archivo de salida.
+
+    Args:
+        output_path (str): Ruta del archivo CSV de salida
+
+    Returns:
+        str: Ruta del manifiesto (mismo nombre con sufijo .manifest.json)
+    """
+    return output_path + '.manifest.json'
+
+def _hash_range(view: memoryview, begin: int, end: int) -> str: # Hash del contenido de un rango de bytes
+    """Calcula el hash BLAKE2b del rango [begin, end) sin copiar los bytes"""
+    return hashlib.blake2b(view[begin:end], digest_size=16).hexdigest()
+
+def load_manifest(output_path: str) -> Optional[Dict]: # Carga el manifiesto si existe y corresponde a la salida actual
+    """
+    Carga el manifiesto de una ejecución anterior.
+
+    El manifiesto solo se considera válido si es de la versión actual, si se
+    generó con las mismas reglas (rules_hash) y si el archivo de salida existe
+    y tiene exactamente el tamaño y la fecha de modificación que registró; en
+    cualquier otro caso (por ejemplo, si otro modo reescribió la salida) no es
+    confiable y se reprocesa todo.
+
+    Args:
+        output_path (str): Ruta del archivo CSV de salida
+
+    Returns:
+        Optional[Dict]: Contenido del manifiesto, o None si no existe o no es válido
+    """
+    try:
+        with open(manifest_path(output_path), 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('rules_hash') != rules_hash():
+        return None
+    try:
+        stat = os.stat(output_path)
+    except OSError:
+        return None
+    if stat.st_size != manifest.get('output_size') or stat.st_mtime_ns != manifest.get('output_mtime_ns'):
+        return None
+    return manifest
+
+def discard_manifest(output_path: str): # Invalida el manifiesto de una salida reescrita por otro modo
+    """Elimina el manifiesto de output_path, si existe, para que la siguiente ejecución incremental reprocese todo"""
+    try:
+        os.remove(manifest_path(output_path))
+    except FileNotFoundError:
+        pass
+
+def reusable_chunks(manifest: Optional[Dict], view: memoryview, header_end: int, header_hash: str) -> List[Dict]: # Bloques de la ejecución anterior que no cambiaron
+    """
+    Determina qué bloques de la ejecución anterior siguen siendo válidos.
+
+    Se reutiliza el prefijo más largo de bloques cuyo contenido no cambió. Un
+    bloque modificado invalida también los siguientes, porque sus posiciones en
+    la entrada y en la salida pueden haberse desplazado. Un bloque que no
+    termina en salto de línea (el final de un archivo sin salto de línea final)
+    solo se reutiliza si sigue siendo el final del archivo, ya que lo agregado
+    después puede completar su último registro.
+
+    Args:
+        manifest (Optional[Dict]): Manifiesto de la ejecución anterior
+        view (memoryview): Bytes del archivo de entrada
+        header_end (int): Posición donde termina la línea de encabezados
+        header_hash (str): Hash de la línea de encabezados actual
+
+    Returns:
+        List[Dict]: Bloques reutilizables, en orden
+    """
+    if manifest is None or manifest.get('header_hash') != header_hash or manifest.get('header_end') != header_end:
+        return []
+    chunks = []
+    for chunk in manifest.get('chunks', []):
+        begin, end = chunk['begin'], chunk['end']
+        if end > len(view) or (end < len(view) and view[end - 1] != ord('\n')):
+            break
+        if _hash_range(view, begin, end) != chunk['hash']:
+            break
+        chunks.append(chunk)
+    return chunks
+
+def process_incremental(data_path: str, output_path: str, chunk_size: int = INCREMENTAL_CHUNK_SIZE) -> Tuple[List[str], int, int, int]: # Procesa solo los bloques nuevos o modificados del archivo
+    """
+    Procesa el archivo de entrada reutilizando la salida de la ejecución anterior.
+
+    El archivo se mapea en memoria y se divide en bloques de unos chunk_size
+    bytes alineados a registros (split_fixed_ranges). Por cada bloque procesado
+    el manifiesto guarda su rango, su hash, sus filas y la posición donde
+    terminan esas filas en la salida. En la siguiente ejecución:
+    - Los bloques sin cambios al inicio del archivo se reutilizan tal cual
+    - La salida se trunca justo después de las filas del último bloque reutilizado
+    - El resto del archivo (bloques modificados o agregados) se procesa y se
+      agrega a la salida
+    El resultado es idéntico al de procesar el archivo completo, porque la
+    limpieza de cada fila no depende de las demás. Si no hubo cambios, solo se
+    calculan los hashes de la entrada.
+
+    El manifiesto se borra antes de modificar la salida y se escribe al final,
+    de modo que una ejecución interrumpida obliga a reprocesar todo en lugar de
+    dejar una salida inconsistente.
+
+    Args:
+        data_path (str): Ruta del archivo CSV de entrada
+        output_path (str): Ruta del archivo CSV de salida
+        chunk_size (int): Tamaño objetivo (en bytes) de cada bloque
+
+    Returns:
+        Tuple[List[str], int, int, int]: Tupla con (encabezados, bloques_reutilizados,
+        bloques_procesados, filas_totales)
+    """
+    mapping = load_file(data_path, mapped=True)
+    with memoryview(mapping) as view:
+        header_end = next_record_start(mapping, 0)
+        header_hash = _hash_range(view, 0, header_end)
+        chunks = reusable_chunks(load_manifest(output_path), view, header_end, header_hash)
+        start = chunks[-1]['end'] if chunks else header_end
+        new_ranges = split_fixed_ranges(mapping, chunk_size, start)
+        reused = len(chunks)
+        headers = [h.decode('utf-8').strip() for h in split_fields(bytes(view[:header_end]).rstrip(b'\n'))]
+
+        # Sin bloques nuevos ni modificados, la salida y el manifiesto ya están al día
+        if not chunks or new_ranges:
+            keep = chunks[-1]['output_end'] if chunks else 0
+
+            discard_manifest(output_path)
+            mode = 'r+b' if chunks else 'wb'
+            with open(output_path, mode) as file:
+                file.truncate(keep)
+                file.seek(keep)
+                if not chunks:
+                    # Salida nueva: la fila de encabezados con las mismas reglas de comillas que los datos
+                    file.write(pd.DataFrame(columns=headers).to_csv(index=False).encode('utf-8'))
+                for begin, end in new_ranges:
+                    rows = 0
+                    # Cada bloque se procesa por lotes, como en la escritura incremental
+                    for batch in iter_batches(iter_text_records(mapping, begin, end), headers):
+                        df = create_dataframe(headers, batch, compact=False) # Solo se escribe como CSV
+                        file.write(df.to_csv(index=False, header=False).encode('utf-8'))
+                        rows += len(df)
+                    chunks.append({
+                        'begin': begin,
+                        'end': end,
+                        'hash': _hash_range(view, begin, end),
+                        'rows': rows,
+                        'output_end': file.tell(),
+                    })
+
+            stat = os.stat(output_path)
+            manifest = {
+                'version': MANIFEST_VERSION,
+                'rules_hash': rules_hash(),
+                'header_end': header_end,
+                'header_hash': header_hash,
+                'output_size': stat.st_size,
+                'output_mtime_ns': stat.st_mtime_ns,
+                'chunks': chunks,
+            }
+            with open(manifest_path(output_path), 'w', encoding='utf-8') as file:
+                json.dump(manifest, file)
+
+    if not isinstance(mapping, bytes):
+        mapping.close()
+    return headers, reused, len(chunks) - reused, sum(chunk['rows'] for chunk in chunks)
@@ -6,12 +6,41 @@
 # 4. Transformación de datos a estructura pandas DataFrame
 # 5. Exportación de resultados procesados
 
-from config import DATA_PATH, OUTPUT_PATH
-from processors import load_file, validate_headers, parse_content
-from validators import test_patterns
-from utils import create_dataframe, save_results
+import argparse
+import os
+from typing import List, Optional
+from itertools import chain
+from config import DATA_PATH, OUTPUT_PATH, INDEX_PATH, TEXT_INDEX_PATH, METRICS_PATH, QUARANTINE_PATH, REJECT_MAX_RATE, WORKERS
+from processors import load_file, iter_records, validate_headers, parse_content, iter_batches
+from validators import test_patterns, count_rejections
+from utils import create_dataframe, save_results, write_csv_stream
+# Los módulos de cada modo (incremental, cache, async_pipeline y batch, que
+# importan pandas al cargarse, y los de índices, búsqueda, perfiles, métricas
+# y cuarentena) se importan donde se usan, para que --validate-only y las
+# consultas solo carguen lo que necesitan
 
-def main():
+# Opciones del procesamiento de un archivo que la ingesta de varios archivos (--input) no aplica
+INPUT_UNSUPPORTED = ('stream', 'pipeline', 'validate_fields', 'dfa', 'arrow_strings', 'mmap', 'incremental',
+                     'cache', 'index', 'text_index', 'quarantine', 'prometheus')
+
+def input_conflicts(args: argparse.Namespace) -> List[str]: # Opciones pedidas que --input no aplica
+    """Devuelve las opciones de la línea de comandos que --input ignoraría (incluido --format distinto de csv)"""
+    conflicts = ['--' + name.replace('_', '-') for name in INPUT_UNSUPPORTED if getattr(args, name)]
+    if args.format != 'csv':
+        conflicts.append('--format ' + args.format)
+    return conflicts
+
+def load_columns(file_path: str): # Parsea por columnas un archivo mapeado y cierra el mapeo
+    """Columnas crudas de parse_content sobre el mapeo del archivo, que se cierra al terminar (para --grep y --profile-patterns)"""
+    mapping = load_file(file_path, mapped=True)
+    try:
+        return parse_content(mapping, columnar=True)
+    finally:
+        if not isinstance(mapping, bytes):
+            # load_file devuelve b'' para un archivo vacío
+            mapping.close()
+
+def main(stream: bool = False, workers: int = 1, validate_fields: bool = False, arrow_strings: bool = False, output_format: str = 'csv', mapped: bool = False, incremental: bool = False, cached: bool = False, build_id_index: bool = False, build_text_index: bool = False, metrics_path: Optional[str] = METRICS_PATH, prometheus_path: Optional[str] = None, quarantine_path: Optional[str] = None, max_error_rate: Optional[float] = REJECT_MAX_RATE, pipelined: bool = False, use_dfa: bool = False):
     """
     Función principal que ejecuta el pipeline completo de procesamiento.
     
@@ -22,44 +51,323 @@ def main():
     - Conversión final a DataFrame con tipos de datos apropiados
     - Guardado de resultados y generación de resumen estadístico
     
+    Args:
+        stream (bool): Si es True, el archivo se lee por bloques con iter_records
+            en lugar de cargarlo completo en memoria con load_file. Con salida
+            CSV, además los resultados se escriben por lotes con
+            write_csv_stream, sin construir el DataFrame completo
+        workers (int): Número de procesos para el parsing (solo sin streaming;
+            no admite quarantine_path ni build_id_index, que necesitan el
+            parsing secuencial)
+        validate_fields (bool): Si es True, valida cada campo de cada fila contra
+            el patrón de su columna y muestra los rechazos por columna
+        arrow_strings (bool): Si es True, las columnas de texto no categóricas
+            del DataFrame usan cadenas respaldadas por Arrow
+        output_format (str): Formato del archivo de salida: 'csv', 'parquet' o 'feather'
+        mapped (bool): Si es True (y no se usa streaming), el archivo se mapea en
+            memoria y se tokeniza sobre sus bytes en lugar de leerlo como texto
+        incremental (bool): Si es True, solo se procesan los bloques del archivo
+            nuevos o modificados desde la ejecución anterior (salida CSV)
+        cached (bool): Si es True, el DataFrame se toma de la caché persistente
+            (output/cache) cuando el archivo y las reglas no cambiaron
+        build_id_index (bool): Si es True, también guarda el índice en disco de
+            Identifier -> registro (INDEX_PATH) para búsquedas con lookup (no
+            admite stream, incremental, cached ni pipelined)
+        build_text_index (bool): Si es True, también guarda el índice invertido
+            de Title, Author y Contributors (TEXT_INDEX_PATH) para búsquedas por
+            palabras (no admite stream con salida CSV, incremental, cached ni pipelined)
+        metrics_path (Optional[str]): Archivo JSON donde se guardan el tiempo, el
+            rendimiento y la memoria de cada etapa y los contadores de errores
+            (también si la ejecución falla); None para no guardarlo
+        prometheus_path (Optional[str]): Si se indica, las mismas métricas se
+            guardan en formato de texto de Prometheus en esa ruta
+        quarantine_path (Optional[str]): Si se indica, los registros con más o
+            menos campos que encabezados se excluyen de la salida y se guardan
+            en ese archivo (JSON Lines) con su línea, posición y texto original
+        max_error_rate (Optional[float]): Con quarantine_path, proporción máxima
+            de registros rechazados; al superarla se detiene el procesamiento
+        pipelined (bool): Si es True, la lectura, el parsing (en workers
+            procesos) y la escritura del CSV se superponen con run_pipeline
+            en lugar de ejecutarse uno después del otro
+        use_dfa (bool): Con validate_fields, los campos se validan con el
+            autómata de fila de dfa (una pasada lineal por fila, sin retroceso
+            ni límite de tiempo por campo) en lugar de con re; solo en el modo
+            que construye las columnas completas con parse_content
+    
     Raises:
         ValueError: Si los encabezados del CSV no coinciden con el patrón esperado
         Exception: Para cualquier error durante el procesamiento
     """
+    from metrics import PipelineMetrics
+    metrics = PipelineMetrics() # Tiempo, rendimiento y memoria de cada etapa
+    errors = {} # Contadores de errores por línea que llenan las funciones del pipeline
+    rejects = None # Cuarentena de registros rechazados (opcional)
     try:
         print("Iniciando procesamiento del archivo CSV")
         
+        # Paso 0: Comprobar que los modos pedidos son compatibles antes de leer o escribir nada
+        if incremental and (output_format != 'csv' or validate_fields):
+            raise ValueError("El modo incremental solo admite salida CSV y sin --validate-fields")
+        if cached and (validate_fields or arrow_strings):
+            raise ValueError("La caché no admite --validate-fields ni --arrow-strings")
+        if pipelined and (output_format != 'csv' or quarantine_path):
+            raise ValueError("El pipeline por etapas solo admite salida CSV y sin --quarantine")
+        if use_dfa and (not validate_fields or (stream and output_format == 'csv') or pipelined):
+            # El autómata valida las columnas completas que devuelve parse_content
+            raise ValueError("--dfa requiere --validate-fields y no admite --stream con salida CSV ni --pipeline")
+        if build_id_index and (stream or incremental or cached or pipelined):
+            # El índice necesita la posición de cada fila en el archivo completo, que solo tiene parse_content
+            raise ValueError("El índice de Identifier no admite --stream, --incremental, --cache ni --pipeline")
+        if build_text_index and ((stream and output_format == 'csv') or incremental or cached or pipelined):
+            # El índice de texto se construye con las columnas crudas completas de parse_content
+            raise ValueError("El índice de texto no admite --stream con salida CSV, --incremental, --cache ni --pipeline")
+        if quarantine_path and (incremental or cached):
+            raise ValueError("La cuarentena no admite --incremental ni --cache")
+        if workers > 1 and (quarantine_path or build_id_index):
+            # Las posiciones de los registros (para la cuarentena y el índice) solo se obtienen en el parsing secuencial
+            raise ValueError("--quarantine e --index procesan el archivo en un solo proceso y no admiten --workers mayor que 1")
+        
         # Paso 1: Cargar archivo CSV como texto plano (sin usar pandas/csv inicialmente)
-        content = load_file(DATA_PATH) # Usa la función de processors para cargar el archivo
+        with metrics.stage('load_file') as stage:
+            input_bytes = os.path.getsize(DATA_PATH)
+            if stream or pipelined:
+                # En modo streaming solo se lee la primera línea por adelantado; el resto
+                # se consume bloque a bloque durante el parsing
+                records = iter_records(DATA_PATH) # Generador de registros de processors
+                header_fields = next(records, [])
+                header_line = ','.join(header_fields)
+                if pipelined:
+                    # El pipeline por etapas lee el archivo por su cuenta
+                    records.close()
+            else:
+                header_line = content = load_file(DATA_PATH, mapped=mapped or incremental or build_id_index) # Usa la función de processors para cargar (o mapear) el archivo
+                stage.bytes = input_bytes
         
         # Paso 2: Validar que los encabezados coincidan con el patrón regex esperado
-        if not validate_headers(content): # Usa validate_headers del processors.py para validar encabezados
-            raise ValueError("Encabezados no válidos") # Esto detiene el procesamiento si los encabezados no coinciden
+        with metrics.stage('validate_headers'):
+            if not validate_headers(header_line): # Usa validate_headers del processors.py para validar encabezados
+                raise ValueError("Encabezados no válidos") # Esto detiene el procesamiento si los encabezados no coinciden
         
         # Paso 3: Ejecutar pruebas de validación de todos los patrones regex definidos
-        test_results = test_patterns() # Usa la función de validators para validar todos los patrones
-        print("Pruebas de patrones regex completadas")
+        with metrics.stage('test_patterns'):
+            test_results = test_patterns() # Usa la función de validators para validar todos los patrones
+            print("Pruebas de patrones regex completadas")
+            metrics.count('failed_pattern_tests', sum(not (result['valid_test'] and result['invalid_test']) for result in test_results.values()))
         
         # Paso 4: Procesar el contenido aplicando algoritmos de parsing y regex
-        headers, data = parse_content(content) # Usa la función de processors para extraer datos
-        
-        # Paso 5: Crear DataFrame de pandas con tipos de datos correctos
-        df = create_dataframe(headers, data) # Usa la función de utils para crear el DataFrame y lo guarda en df
-        
-        # Paso 6: Guardar resultados procesados en archivo CSV de salida
-        save_results(df, OUTPUT_PATH) # Usa la función de utils para guardar el DataFrame
-        print(f"Resultados guardados en {OUTPUT_PATH}")
+        field_flags = [] if validate_fields else None # Banderas de aceptación por campo (validación opcional)
+        output_path = os.path.splitext(OUTPUT_PATH)[0] + '.' + output_format # Misma ruta con la extensión del formato
+        df = None
+        if quarantine_path:
+            # Las opciones ya se comprobaron, así que abrir (y truncar) la cuarentena no borra la de una ejecución que no corre
+            from rejects import RejectSink
+            rejects = RejectSink(quarantine_path, max_rate=max_error_rate)
+        if incremental:
+            # Pasos 4 a 6 solo para los bloques nuevos o modificados; el resto de la salida se reutiliza
+            from incremental import process_incremental
+            with metrics.stage('process_incremental') as stage:
+                headers, reused, processed, row_count = process_incremental(DATA_PATH, output_path) # Usa la función de incremental
+                stage.rows, stage.bytes = row_count, input_bytes
+            print(f"Procesamiento incremental completado. Bloques reutilizados: {reused}, procesados: {processed}")
+        elif cached:
+            # Pasos 4 y 5 desde la caché: solo se parsea si el archivo o las reglas cambiaron
+            from cache import load_cached_dataframe
+            with metrics.stage('load_cached_dataframe') as stage:
+                df = load_cached_dataframe(DATA_PATH) # Usa la función de cache para obtener el DataFrame
+                headers, row_count = list(df.columns), len(df)
+                stage.rows, stage.bytes = row_count, input_bytes
+            with metrics.stage('save_results') as stage:
+                save_results(df, output_path, output_format)
+                stage.rows, stage.bytes = row_count, os.path.getsize(output_path)
+        elif pipelined:
+            # Pasos 4 a 6 superpuestos: mientras un bloque se parsea, el siguiente se lee y el anterior se escribe
+            from async_pipeline import run_pipeline
+            with metrics.stage('run_pipeline') as stage:
+                headers = [h.strip() for h in header_fields]
+                row_count = run_pipeline(DATA_PATH, headers, output_path, workers=workers, field_flags=field_flags, errors=errors) # Usa la función de async_pipeline
+                stage.rows, stage.bytes = row_count, input_bytes
+            print(f"Procesamiento completado. {row_count} registros procesados.")
+        elif stream and output_format == 'csv':
+            # Pasos 4 a 6 por lotes: cada lote se parsea, limpia y escribe antes de leer el siguiente
+            with metrics.stage('write_csv_stream') as stage:
+                headers = [h.strip() for h in header_fields]
+                batches = iter_batches(records, headers, field_flags=field_flags, errors=errors, rejects=rejects) # Usa la función de processors para agrupar los registros
+                row_count = write_csv_stream(headers, batches, output_path) # Usa la función de utils para escribir el CSV por lotes
+                stage.rows, stage.bytes = row_count, input_bytes
+            print(f"Procesamiento completado. {row_count} registros procesados.")
+        else:
+            with metrics.stage('parse_content') as stage:
+                if stream:
+                    content = chain([header_fields], records)
+                spans = [] if build_id_index else None # Posición en bytes de cada fila, para el índice
+                headers, data = parse_content(content, workers=workers, field_flags=None if use_dfa else field_flags, columnar=True, file_path=DATA_PATH, spans=spans, errors=errors, rejects=rejects) # Usa la función de processors para extraer datos
+                stage.rows, stage.bytes = len(data[headers[0]]) if headers else 0, input_bytes
+            if use_dfa:
+                from dfa import RowAutomaton
+                from patterns import REGISTRY
+                with metrics.stage('validate_dfa') as stage:
+                    flags = RowAutomaton(headers, REGISTRY.sources).validate_columns([data[header] for header in headers]) # Usa la clase de dfa con los mismos patrones que validators
+                    field_flags.extend(zip(*flags))
+                    stage.rows = len(field_flags)
+            if build_id_index:
+                from record_index import build_index
+                with metrics.stage('build_index'):
+                    build_index(INDEX_PATH, DATA_PATH, headers, data['Identifier'], spans) # Usa la función de record_index para guardar el índice
+                print(f"Índice de Identifier guardado en {INDEX_PATH}")
+            if build_text_index:
+                from text_index import TextIndex
+                with metrics.stage('build_text_index'):
+                    TextIndex.build(data).save(TEXT_INDEX_PATH) # Usa la clase de text_index sobre las columnas crudas
+                print(f"Índice de texto guardado en {TEXT_INDEX_PATH}")
+            
+            # Paso 5: Crear DataFrame de pandas con tipos de datos correctos
+            with metrics.stage('create_dataframe') as stage:
+                df = create_dataframe(headers, data, arrow_strings=arrow_strings) # Usa la función de utils para crear el DataFrame y lo guarda en df
+                row_count = stage.rows = len(df)
+            
+            # Paso 6: Guardar resultados procesados en el archivo de salida
+            with metrics.stage('save_results') as stage:
+                save_results(df, output_path, output_format) # Usa la función de utils para guardar el DataFrame
+                stage.rows, stage.bytes = row_count, os.path.getsize(output_path)
+        if not incremental:
+            # La salida se reescribió por completo: el manifiesto del modo incremental ya no la describe
+            from incremental import discard_manifest
+            discard_manifest(output_path)
+        print(f"Resultados guardados en {output_path}")
         
         # Mostrar resumen estadístico del procesamiento realizado
         print("\nResumen del procesamiento:")
-        print(f"- Registros procesados: {len(df)}")
-        print(f"- Columnas: {list(df.columns)}")
-        print("\nEjemplo de datos:")
-        print(df.head(3))
+        print(f"- Registros procesados: {row_count}")
+        print(f"- Columnas: {headers}")
+        if validate_fields:
+            rejections = count_rejections(headers, field_flags)
+            metrics.count('rejected_values', sum(rejections.values()))
+            print(f"- Valores rechazados por patrón: {sum(rejections.values())}")
+            for header, count in rejections.items():
+                if count:
+                    print(f"    {header}: {count}")
+        if df is not None:
+            print("\nEjemplo de datos:")
+            print(df.head(3))
         
     except Exception as e:
+        metrics.status = 'error'
         print(f"Error en el procesamiento: {str(e)}")
         raise
+    finally:
+        for name, amount in errors.items():
+            metrics.count(name, amount)
+        if rejects is not None:
+            rejects.close()
+            metrics.count('rejected_records', rejects.rejected)
+            for reason, amount in rejects.counts.items():
+                metrics.count(f"rejected_{reason}", amount)
+            if rejects.rejected:
+                print(f"- Registros en cuarentena: {rejects.rejected} ({rejects.path})")
+        if metrics_path:
+            metrics.write_json(metrics_path)
+        if prometheus_path:
+            metrics.write_prometheus(prometheus_path)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Procesamiento del dataset BL-Flickr-Images-Book.csv")
+    parser.add_argument('--validate-only', action='store_true',
+                        help="Solo validar los encabezados del archivo y probar los patrones regex, sin procesar los datos")
+    parser.add_argument('--input', nargs='+', metavar='RUTA',
+                        help="Procesar varios CSV (archivos, directorios o patrones glob) con un solo pool de --workers procesos y terminar")
+    parser.add_argument('--partition-dir', metavar='DIRECTORIO',
+                        help="Con --input, escribir una salida por archivo en este directorio en lugar de una tabla concatenada")
+    parser.add_argument('--stream', action='store_true',
+                        help="Leer el archivo por bloques sin cargarlo completo en memoria")
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="Número de procesos para el parsing del contenido")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Superponer la lectura, el parsing (en --workers procesos) y la escritura del CSV")
+    parser.add_argument('--validate-fields', action='store_true',
+                        help="Validar cada campo contra el patrón de su columna")
+    parser.add_argument('--dfa', action='store_true',
+                        help="Con --validate-fields, validar con el autómata de fila (una pasada lineal por fila) en lugar de re")
+    parser.add_argument('--arrow-strings', action='store_true',
+                        help="Usar cadenas respaldadas por Arrow en el DataFrame (requiere pyarrow)")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv',
+                        help="Formato del archivo de salida (parquet y feather requieren pyarrow)")
+    parser.add_argument('--mmap', action='store_true',
+                        help="Mapear el archivo en memoria y tokenizar sus bytes sin decodificarlo completo")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Procesar solo los registros nuevos o modificados desde la ejecución anterior")
+    parser.add_argument('--cache', action='store_true',
+                        help="Reutilizar el DataFrame procesado guardado en output/cache si nada cambió")
+    parser.add_argument('--index', action='store_true',
+                        help="Guardar el índice de Identifier para búsquedas de un registro")
+    parser.add_argument('--lookup', metavar='IDENTIFIER',
+                        help="Mostrar el registro con ese Identifier usando el índice y terminar")
+    parser.add_argument('--text-index', action='store_true',
+                        help="Guardar el índice de texto de Title, Author y Contributors")
+    parser.add_argument('--search', metavar='CONSULTA',
+                        help="Mostrar los Identifier que cumplen la consulta (AND, OR, prefijo*) y terminar")
+    parser.add_argument('--grep', metavar='PATRON',
+                        help="Buscar la expresión regular en las columnas (con prefiltro de literales) y terminar")
+    parser.add_argument('--columns', nargs='+', metavar='COLUMNA',
+                        help="Columnas donde busca --grep (por defecto todas)")
+    parser.add_argument('--profile-patterns', action='store_true',
+                        help="Medir el tiempo de cada patrón en el dataset y con entradas adversarias y terminar")
+    parser.add_argument('--quarantine', nargs='?', const=QUARANTINE_PATH, metavar='RUTA',
+                        help="Excluir los registros mal formados y guardarlos en un archivo de cuarentena (por defecto output/quarantine.jsonl)")
+    parser.add_argument('--max-error-rate', type=float, default=REJECT_MAX_RATE, metavar='PROPORCION',
+                        help="Con --quarantine, detener el procesamiento si se rechaza más de esta proporción de registros")
+    parser.add_argument('--metrics', default=METRICS_PATH, metavar='RUTA',
+                        help="Archivo JSON con el tiempo, rendimiento y memoria de cada etapa (por defecto output/metrics.json)")
+    parser.add_argument('--prometheus', metavar='RUTA',
+                        help="Guardar también las métricas en formato de texto de Prometheus (recolector de node_exporter)")
+    args = parser.parse_args()
+    if args.validate_only:
+        # Solo se lee la primera línea y no se importa pandas
+        with open(DATA_PATH, 'r', encoding='utf-8') as file:
+            headers_ok = validate_headers(file.readline())
+        test_results = test_patterns()
+        failed = [field for field, result in test_results.items() if not (result['valid_test'] and result['invalid_test'])]
+        print(f"Encabezados: {'válidos' if headers_ok else 'no válidos'}")
+        print(f"Patrones: {len(test_results) - len(failed)} de {len(test_results)} pruebas correctas")
+        raise SystemExit(0 if headers_ok and not failed else 1)
+    if args.input:
+        conflicts = input_conflicts(args)
+        if conflicts:
+            # ingest_files solo escribe CSV limpios, sin validación, índices, cuarentena ni modos de lectura
+            raise ValueError(f"--input no admite {', '.join(conflicts)}")
+        from batch import expand_inputs, ingest_files
+        summary = ingest_files(expand_inputs(args.input), output_path=None if args.partition_dir else OUTPUT_PATH,
+                               output_dir=args.partition_dir, workers=args.workers) # Usa la función de batch con un pool compartido
+        print(f"Archivos procesados: {summary['files']}, omitidos: {len(summary['skipped'])}, registros: {summary['rows']}")
+        print(f"Resultados guardados en {', '.join(summary['outputs'])}")
+        raise SystemExit(1 if summary['skipped'] or not summary['files'] else 0)
+    if args.lookup:
+        from record_index import lookup
+        record = lookup(args.lookup, INDEX_PATH, DATA_PATH)
+        print(record if record is not None else f"No existe el Identifier {args.lookup}")
+        raise SystemExit(0 if record is not None else 1)
+    if args.search is not None:
+        from text_index import TextIndex
+        text_index = TextIndex.load(TEXT_INDEX_PATH)
+        rows = text_index.search(args.search)
+        print(f"{len(rows)} registros: {[text_index.identifiers[row] for row in rows]}")
+        raise SystemExit(0 if rows else 1)
+    if args.grep:
+        from search import search_columns
+        headers, data = load_columns(DATA_PATH)
+        matches = search_columns(data, args.grep, args.columns) # Usa la función de search para buscar en las columnas
+        for header, rows in matches.items():
+            if rows:
+                print(f"{header}: {len(rows)} registros: {[data['Identifier'][row] for row in rows]}")
+        raise SystemExit(0 if any(matches.values()) else 1)
+    if args.profile_patterns:
+        from regex_profiler import profile_patterns, format_report
+        headers, data = load_columns(DATA_PATH)
+        results = profile_patterns(data) # Usa la función de regex_profiler para medir los patrones
+        print(format_report(results))
+        raise SystemExit(1 if any(result['superlinear'] for result in results.values()) else 0)
+    main(stream=args.stream, workers=args.workers, validate_fields=args.validate_fields,
+         arrow_strings=args.arrow_strings, output_format=args.format, mapped=args.mmap,
+         incremental=args.incremental, cached=args.cache, build_id_index=args.index,
+         build_text_index=args.text_index, metrics_path=args.metrics, prometheus_path=args.prometheus,
+         quarantine_path=args.quarantine, max_error_rate=args.max_error_rate, pipelined=args.pipeline,
+         use_dfa=args.dfa)
\ No newline at end of file
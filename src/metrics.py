@@ -0,0 +1,244 @@
+# Módulo de instrumentación del pipeline
+# Este módulo mide cada etapa de main.main y exporta los resultados:
+# - Tiempo de reloj y de CPU, filas y bytes por segundo y memoria residente
+#   por etapa (al terminar la etapa, su variación durante la etapa y el
+#   máximo del proceso hasta ese momento)
+# - Contadores de errores (registros mal formados, valores rechazados, etc.)
+# - Exportación como JSON estructurado y, opcionalmente, en el formato de
+#   texto de Prometheus (para el recolector de archivos de texto de
+#   node_exporter), de modo que el planificador pueda alertar si baja el
+#   rendimiento
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRIC_PREFIX = 'bl_pipeline'
+
+def peak_rss_bytes() -> Optional[int]: # Memoria residente máxima del proceso
+    """
+    Devuelve la memoria residente máxima que alcanzó el proceso hasta ahora.
+
+    Returns:
+        Optional[int]: Bytes, o None si el sistema no la informa (Windows)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB y macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def current_rss_bytes() -> Optional[int]: # Memoria residente actual del proceso
+    """
+    Devuelve la memoria residente actual del proceso.
+
+    A diferencia de peak_rss_bytes, baja cuando el proceso libera memoria, así
+    que su variación durante una etapa muestra lo que esa etapa retuvo.
+
+    Returns:
+        Optional[int]: Bytes, o None si el sistema no la informa (solo Linux
+        expone /proc/self/statm)
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class StageMetrics: # Mediciones de una etapa del pipeline
+    """
+    Mediciones de una etapa; rows y bytes se asignan dentro del bloque stage.
+
+    Attributes:
+        name (str): Nombre de la etapa
+        wall_seconds (float): Tiempo de reloj
+        cpu_seconds (float): Tiempo de CPU del proceso (sin los procesos hijos)
+        rows (Optional[int]): Filas procesadas en la etapa
+        bytes (Optional[int]): Bytes leídos o escritos en la etapa
+        rss_bytes (Optional[int]): Memoria residente del proceso al terminar la etapa
+        rss_delta_bytes (Optional[int]): Variación de la memoria residente
+            durante la etapa (negativa si la etapa liberó memoria)
+        process_peak_rss_bytes (Optional[int]): Memoria máxima del proceso
+            desde su inicio hasta el final de la etapa (acumulada, no de la etapa)
+        error (Optional[str]): Error que interrumpió la etapa, si hubo
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rows: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.rss_bytes: Optional[int] = None
+        self.rss_delta_bytes: Optional[int] = None
+        self.process_peak_rss_bytes: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def rate(self, amount: Optional[int]) -> Optional[float]: # Cantidad por segundo de reloj
+        """Devuelve amount por segundo de reloj, o None si no se registró la cantidad"""
+        if amount is None:
+            return None
+        return amount / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict: # Representación JSON de la etapa
+        return {
+            'name': self.name,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'rows_per_second': self.rate(self.rows),
+            'bytes_per_second': self.rate(self.bytes),
+            'rss_bytes': self.rss_bytes,
+            'rss_delta_bytes': self.rss_delta_bytes,
+            'process_peak_rss_bytes': self.process_peak_rss_bytes,
+            'error': self.error,
+        }
+
+class PipelineMetrics: # Registro de etapas y contadores de una ejecución
+    """
+    Registra las etapas y los contadores de una ejecución del pipeline.
+
+    Uso:
+        metrics = PipelineMetrics()
+        with metrics.stage('parse_content') as stage:
+            headers, data = parse_content(...)
+            stage.rows = len(data['Identifier'])
+        metrics.count('malformed_records', 3)
+        metrics.write_json('output/metrics.json')
+
+    Attributes:
+        stages (List[StageMetrics]): Etapas en el orden en que se ejecutaron
+        counters (Dict[str, int]): Contadores de errores y eventos
+        status (str): 'ok', o 'error' si alguna etapa falló
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages: List[StageMetrics] = []
+        self.counters: Dict[str, int] = {}
+        self.status = 'ok'
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]: # Mide una etapa del pipeline
+        """
+        Mide el bloque como una etapa; si el bloque falla, la etapa queda con el error.
+
+        Args:
+            name (str): Nombre de la etapa
+
+        Yields:
+            StageMetrics: Mediciones de la etapa, para asignar rows y bytes
+        """
+        stage = StageMetrics(name)
+        self.stages.append(stage)
+        rss = current_rss_bytes()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield stage
+        except BaseException as e:
+            stage.error = str(e) or type(e).__name__
+            self.status = 'error'
+            raise
+        finally:
+            stage.wall_seconds = time.perf_counter() - wall
+            stage.cpu_seconds = time.process_time() - cpu
+            stage.rss_bytes = current_rss_bytes()
+            if rss is not None and stage.rss_bytes is not None:
+                stage.rss_delta_bytes = stage.rss_bytes - rss
+            stage.process_peak_rss_bytes = peak_rss_bytes()
+
+    def count(self, name: str, amount: int = 1): # Suma a un contador
+        """Suma amount al contador name"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self) -> Dict: # Representación JSON de la ejecución
+        """
+        Devuelve las mediciones como un diccionario serializable a JSON.
+
+        Returns:
+            Dict: Estado, inicio (epoch), duración total, memoria máxima del
+            proceso, etapas y contadores
+        """
+        return {
+            'status': self.status,
+            'started': self.started,
+            'wall_seconds': sum(stage.wall_seconds for stage in self.stages),
+            'cpu_seconds': sum(stage.cpu_seconds for stage in self.stages),
+            'process_peak_rss_bytes': peak_rss_bytes(),
+            'stages': [stage.to_dict() for stage in self.stages],
+            'counters': dict(self.counters),
+        }
+
+    def to_prometheus(self) -> str: # Mediciones en el formato de texto de Prometheus
+        """
+        Devuelve las mediciones en el formato de exposición de texto de Prometheus.
+
+        Cada medición por etapa es un gauge con la etiqueta stage; los
+        contadores usan la etiqueta kind.
+
+        Returns:
+            str: Texto listo para el recolector de archivos de node_exporter
+        """
+        lines = []
+
+        def metric(name: str, help_text: str, samples: List):
+            samples = [(labels, value) for labels, value in samples if value is not None]
+            if not samples:
+                return
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(text)}"' for key, text in labels.items())
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {float(value)!r}" if label_text
+                             else f"{METRIC_PREFIX}_{name} {float(value)!r}")
+
+        stages = [stage.to_dict() for stage in self.stages]
+        for key, help_text in (
+            ('wall_seconds', 'Tiempo de reloj de la etapa en segundos'),
+            ('cpu_seconds', 'Tiempo de CPU de la etapa en segundos'),
+            ('rows', 'Filas procesadas en la etapa'),
+            ('rows_per_second', 'Filas por segundo de la etapa'),
+            ('bytes_per_second', 'Bytes por segundo de la etapa'),
+            ('rss_bytes', 'Memoria residente del proceso al terminar la etapa'),
+            ('rss_delta_bytes', 'Variación de la memoria residente durante la etapa'),
+            ('process_peak_rss_bytes', 'Memoria residente máxima del proceso hasta el final de la etapa'),
+        ):
+            metric(f"stage_{key}", help_text, [({'stage': stage['name']}, stage[key]) for stage in stages])
+        metric('stage_failed', 'Vale 1 si la etapa terminó con error',
+               [({'stage': stage['name']}, int(stage['error'] is not None)) for stage in stages])
+        metric('errors', 'Errores y eventos contados durante la ejecución',
+               [({'kind': kind}, value) for kind, value in sorted(self.counters.items())])
+        metric('success', 'Vale 1 si la ejecución terminó sin errores', [({}, int(self.status == 'ok'))])
+        metric('last_run_timestamp_seconds', 'Inicio de la última ejecución (epoch)', [({}, self.started)])
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str): # Guarda las mediciones como JSON
+        """Guarda las mediciones como JSON (reemplazando el archivo de forma atómica)"""
+        _write_atomic(path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
+
+    def write_prometheus(self, path: str): # Guarda las mediciones en formato Prometheus
+        """Guarda las mediciones en formato Prometheus (de forma atómica, como pide el recolector de node_exporter)"""
+        _write_atomic(path, self.to_prometheus())
+
+def _escape_label(text: str) -> str: # Escapa el valor de una etiqueta de Prometheus
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _write_atomic(path: str, text: str): # Escribe un archivo de texto de forma atómica
+    """Escribe en un temporal y lo renombra, para que nunca se lea un archivo a medio escribir"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(text)
+    os.replace(temporary, path)
@@ -9,6 +9,7 @@
 # - example_invalid: ejemplo que debe ser rechazado por el patrón
 
 import re
+from typing import Dict
 
 # Diccionario que contiene todos los patrones regex para validación de campos del CSV
 # Cada entrada define las reglas de validación para una columna específica
@@ -110,27 +111,89 @@ PATTERNS = {
 # Asegura que el archivo tenga exactamente las 15 columnas esperadas en el orden correcto
 HEADER_PATTERN = r'^Identifier,Edition Statement,Place of Publication,Date of Publication,Publisher,Title,Author,Contributors,Corporate Author,Corporate Contributors,Former owner,Engraver,Issuance type,Flickr URL,Shelfmarks$'
 
+# Patrón auxiliar para extraer el año de 4 dígitos en la limpieza de Date of Publication
+YEAR_PATTERN = r'(\d{4})'
+
+# Patrón auxiliar para separar palabras (letras y dígitos) en el índice de texto completo
+TOKEN_PATTERN = r'[^\W_]+'
+
+def _compile(pattern: str, label: str) -> re.Pattern: # Compila un patrón convirtiendo errores de sintaxis en ValueError
+    """
+    Compila un patrón regex convirtiendo los errores de sintaxis en ValueError.
+    
+    Args:
+        pattern (str): Expresión regular a compilar
+        label (str): Descripción del patrón para el mensaje de error
+        
+    Returns:
+        re.Pattern: Patrón compilado
+        
+    Raises:
+        ValueError: Si el patrón tiene sintaxis inválida
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"{label}: {str(e)}")
+
+class PatternRegistry: # Registro de patrones compilados una sola vez
+    """
+    Registro de todos los patrones del proyecto, compilados una sola vez.
+    
+    Es el único punto desde el que el pipeline evalúa expresiones regulares:
+    en lugar de pasar el texto del patrón a re.match/re.search en cada
+    llamada (lo que implica buscar el patrón en la caché interna de re), expone
+    directamente los métodos match/search ya ligados a cada patrón compilado.
+    
+    Attributes:
+        compiled (Dict[str, re.Pattern]): Patrón compilado por campo
+        match (Dict[str, Callable]): Método match ligado por campo
+        search (Dict[str, Callable]): Método search ligado por campo
+        header_match (Callable): Método match del patrón de encabezados
+        year_search (Callable): Método search del patrón de año
+        token_findall (Callable): Método findall del patrón de palabras
+    """
+    
+    def __init__(self, patterns: Dict[str, Dict], header_pattern: str, year_pattern: str = YEAR_PATTERN, token_pattern: str = TOKEN_PATTERN):
+        """
+        Compila todos los patrones recibidos.
+        
+        Args:
+            patterns (Dict[str, Dict]): Diccionario con la misma estructura que PATTERNS
+            header_pattern (str): Patrón de validación de encabezados
+            year_pattern (str): Patrón de extracción del año
+            token_pattern (str): Patrón de separación de palabras
+            
+        Raises:
+            ValueError: Si algún patrón tiene sintaxis inválida o no puede ser compilado
+        """
+        self.sources = {field: config['pattern'] for field, config in patterns.items()}
+        self.compiled = {
+            field: _compile(source, f"Patrón inválido para '{field}'")
+            for field, source in self.sources.items()
+        }
+        self.match = {field: compiled.match for field, compiled in self.compiled.items()}
+        self.search = {field: compiled.search for field, compiled in self.compiled.items()}
+        self.header = _compile(header_pattern, "Patrón de encabezado inválido")
+        self.header_match = self.header.match
+        self.year = _compile(year_pattern, "Patrón de año inválido")
+        self.year_search = self.year.search
+        self.token = _compile(token_pattern, "Patrón de palabras inválido")
+        self.token_findall = self.token.findall
+
+# Registro global compilado al importar el módulo
+REGISTRY = PatternRegistry(PATTERNS, HEADER_PATTERN)
+
 def validate_patterns(): # Valida que todos los patrones regex estén correctamente definidos y sean compilables
     """
     Valida que todos los patrones regex estén correctamente definidos y sean compilables.
     
     Esta función realiza una verificación de sintaxis de todas las expresiones regulares
     definidas en el diccionario PATTERNS, incluyendo el patrón de encabezados.
+    Construye un registro nuevo, de modo que también detecta cambios hechos a
+    PATTERNS después de importar el módulo.
     
     Raises:
         ValueError: Si algún patrón tiene sintaxis inválida o no puede ser compilado
     """
-    # Iterar sobre todos los patrones definidos para cada campo del CSV
-    # Iterar sobre todos los patrones definidos para cada campo del CSV
-    for field, config in PATTERNS.items(): # Verifica cada patrón regex
-        try:
-            # Intentar compilar cada expresión regular para verificar su sintaxis
-            re.compile(config['pattern'])
-        except re.error as e:
-            raise ValueError(f"Patrón inválido para '{field}': {str(e)}")
-    
-    try:
-        # Validar también el patrón de encabezados del CSV
-        re.compile(HEADER_PATTERN) # Verifica el patrón de encabezados
-    except re.error as e:
-        raise ValueError(f"Patrón de encabezado inválido: {str(e)}") 
\ No newline at end of file
+    PatternRegistry(PATTERNS, HEADER_PATTERN)
\ No newline at end of file
@@ -1,33 +1,58 @@
 # Módulo de procesamiento de archivo CSV usando expresiones regulares
 # Este módulo implementa el core del procesamiento de datos del proyecto:
 # - Carga del archivo CSV como texto plano (sin librerías especializadas)
+# - Lectura en streaming por bloques para archivos que no caben en memoria
+# - Lectura mapeada en memoria (mmap) sobre los bytes del archivo, sin
+#   decodificar ni copiar el archivo completo
 # - Validación de estructura mediante patrones regex
-# - Parsing manual de contenido respetando formato CSV con comillas
+# - Parsing manual de contenido respetando formato CSV con comillas (incluidos
+#   campos entre comillas con saltos de línea)
 # - Aplicación de expresiones regulares específicas para cada campo
 # - Limpieza y estructuración de datos extraídos
 
-import re
-from typing import List, Dict, Tuple
+import mmap
+from itertools import islice
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional, Union
 import patterns
+from config import CHUNK_SIZE, BATCH_SIZE, OUTPUT_BATCH_SIZE
+from tokenizer import SYMBOLS, split_fields, iter_split_records
 from utils import clean_value
+from validators import validate_columns
+from rejects import RejectSink, MISSING_FIELDS, EXTRA_FIELDS
 
-def load_file(file_path: str) -> str: # Carga el archivo CSV completo como texto
+# Tipos de contenido que se procesan como texto completo (y no como iterable de registros)
+TEXT_TYPES = (str, bytes, mmap.mmap)
+
+def load_file(file_path: str, mapped: bool = False) -> Union[str, mmap.mmap, bytes]: # Carga el archivo CSV completo como texto o lo mapea en memoria
     """
     Carga el archivo CSV completo como una cadena de texto.
     
     Esta función lee el archivo CSV de forma completa en memoria como texto plano,
-    sin usar librerías.
+    sin usar librerías. Con mapped=True, en lugar de leerlo y decodificarlo,
+    el archivo se mapea en memoria (mmap) en modo solo lectura: el tokenizador
+    trabaja directamente sobre los bytes del mapeo, solo se decodifican los
+    campos extraídos, y los procesos trabajadores que mapean el mismo archivo
+    comparten la caché de páginas del sistema operativo.
     
     Args:
         file_path (str): Ruta absoluta al archivo CSV a procesar
+        mapped (bool): Si es True, devuelve un mapeo en memoria del archivo
         
     Returns:
-        str: Contenido completo del archivo como cadena de texto
+        Union[str, mmap.mmap, bytes]: Contenido completo del archivo como cadena
+        de texto, o el mapeo de sus bytes UTF-8 si mapped es True (b'' si el
+        archivo está vacío, ya que no se puede mapear un archivo vacío)
         
     Raises:
         Exception: Si el archivo no puede ser leído (no existe, permisos, encoding, etc.)
     """
     try:
+        if mapped:
+            with open(file_path, 'rb') as file:
+                # El mapeo sigue siendo válido después de cerrar el archivo
+                if not file.seek(0, 2):
+                    return b''
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
         # Abrir archivo con encoding UTF-8 para manejar caracteres especiales
         with open(file_path, 'r', encoding='utf-8') as file:
             return file.read()
@@ -35,7 +60,38 @@ def load_file(file_path: str) -> str: # Carga el archivo CSV completo como texto
         print(f"Error al cargar el archivo: {str(e)}")
         raise
 
-def validate_headers(content: str) -> bool: # Valida que los encabezados del CSV coincidan con el patrón esperado
+def iter_records(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[List[str]]: # Lee el archivo por bloques y genera registros completos
+    """
+    Lee el archivo CSV por bloques de tamaño fijo y genera registros completos.
+    
+    A diferencia de load_file, nunca mantiene el archivo completo en memoria:
+    en cada momento solo se conserva el bloque actual más el fragmento del
+    último registro que quedó incompleto al final del bloque anterior. La
+    memoria usada queda acotada por chunk_size más la longitud del registro
+    más largo, sin importar el tamaño del archivo.
+    
+    Los límites de registro los detecta el tokenizador, así que un campo entre
+    comillas que contiene saltos de línea llega completo en un solo registro.
+    
+    Args:
+        file_path (str): Ruta absoluta al archivo CSV a procesar
+        chunk_size (int): Número de caracteres leídos en cada bloque
+        
+    Yields:
+        List[str]: Valores de cada registro del archivo (incluyendo el de encabezados)
+        
+    Raises:
+        Exception: Si el archivo no puede ser leído (no existe, permisos, encoding, etc.)
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            # iter con centinela '' lee bloques hasta el final del archivo
+            yield from iter_split_records(iter(lambda: file.read(chunk_size), ''))
+    except Exception as e:
+        print(f"Error al cargar el archivo: {str(e)}")
+        raise
+
+def validate_headers(content: Union[str, mmap.mmap, bytes]) -> bool: # Valida que los encabezados del CSV coincidan con el patrón esperado
     """
     Valida que los encabezados del CSV coincidan exactamente con el patrón esperado.
     
@@ -45,16 +101,24 @@ def validate_headers(content: str) -> bool: # Valida que los encabezados del CSV
     - No haya columnas adicionales o faltantes
     
     Args:
-        content (str): Contenido completo del archivo CSV como texto
+        content (Union[str, mmap.mmap, bytes]): Contenido completo del archivo
+            CSV como texto o mapeado en memoria, o solo su primera línea cuando
+            se lee en modo streaming
         
     Returns:
         bool: True si los encabezados son válidos, False en caso contrario
     """
     # Extraer la primera línea que debe contener los encabezados
-    first_line = content.split('\n')[0]
+    # (partition evita dividir todo el contenido solo para leer la primera línea)
+    if isinstance(content, str):
+        first_line = content.partition('\n')[0]
+    else:
+        # En un mapeo solo se copia y decodifica la primera línea
+        end = content.find(b'\n')
+        first_line = content[:end if end >= 0 else len(content)].decode('utf-8')
     
     # Aplicar el patrón regex para validar estructura de encabezados
-    if re.match(patterns.HEADER_PATTERN, first_line): # Verifica si la primera línea coincide con el patrón HEADER_PATTERN definido en patterns.py
+    if patterns.REGISTRY.header_match(first_line): # Verifica si la primera línea coincide con el patrón HEADER_PATTERN compilado en patterns.py
         return True
     else:
         print("Los encabezados no coinciden con el patrón esperado")
@@ -66,7 +130,7 @@ def parse_line(line: str, headers: List[str]) -> Dict: # Procesa una línea indi
     
     Esta función implementa un parser CSV personalizado que:
     - Maneja correctamente las comillas que pueden contener comas
-    - Respeta el formato CSV estándar
+    - Respeta el formato CSV estándar (RFC 4180), incluidas las comillas escapadas ""
     - Aplica limpieza de datos específica para cada campo
     - Mantiene la correspondencia entre valores y encabezados
     
@@ -77,90 +141,438 @@ def parse_line(line: str, headers: List[str]) -> Dict: # Procesa una línea indi
     Returns:
         Dict: Diccionario con datos de la fila, usando nombres de columnas como claves
     """
-    row = {}
-    
-    # Implementar parser CSV manual que maneja comillas correctamente
-    # Este algoritmo divide la línea por comas, pero respeta las comillas
-    values = []
-    current_value = ""
-    in_quotes = False
-    
-    # Procesar cada carácter de la línea para detectar separadores válidos
-    for char in line:
-        if char == '"':
-            # Cambiar estado de dentro/fuera de comillas
-            in_quotes = not in_quotes
-        elif char == ',' and not in_quotes:
-            # Solo dividir por coma si no estamos dentro de comillas
-            values.append(current_value.strip())
-            current_value = ""
-        else:
-            # Agregar carácter al valor actual
-            current_value += char
-    
-    # No olvidar agregar el último valor (después de la última coma)
-    values.append(current_value.strip())
+    # Dividir la línea con la máquina de estado del tokenizador, que respeta
+    # las comillas (incluidas las comillas escapadas "") y extrae cada campo
+    # por cortes del texto en lugar de concatenar carácter por carácter
+    return build_row(split_fields(line), headers)
+
+def build_row(values: List[str], headers: List[str]) -> Dict: # Asocia los valores ya separados de un registro con sus encabezados
+    """
+    Construye el diccionario de una fila a partir de sus valores ya separados
+    y aplica clean_value a cada uno.
     
+    Args:
+        values (List[str]): Valores del registro producidos por el tokenizador
+        headers (List[str]): Lista de nombres de columnas/encabezados
+        
+    Returns:
+        Dict: Diccionario con datos de la fila, usando nombres de columnas como claves
+    """
     # Asegurar que tenemos exactamente el número correcto de valores
     # Rellenar con strings vacíos si faltan valores
     while len(values) < len(headers):
         values.append("")
     
-    # Crear diccionario asociando cada valor con su encabezado correspondiente
-    for i, header in enumerate(headers):
-        if i < len(values):
-            # Limpiar comillas y espacios extra, luego aplicar limpieza específica
-            value = values[i].strip('"').strip()
-            row[header] = clean_value(header, value)
+    # Limpiar espacios extra de cada valor y aplicar la limpieza específica de cada campo
+    return {header: clean_value(header, value.strip()) for header, value in zip(headers, values)}
+
+def iter_text_records(content: Union[str, mmap.mmap, bytes], begin: int = 0, end: Optional[int] = None, ends: Optional[List[int]] = None) -> Iterator[List[Union[str, bytes]]]: # Genera los registros de un texto CSV ya cargado en memoria
+    """
+    Genera los registros de un texto CSV recorriéndolo por bloques.
+    
+    El tokenizador trabaja sobre buffers acotados de CHUNK_SIZE caracteres; los
+    registros que cruzan un límite de bloque se completan con el siguiente. En
+    un mapeo cada bloque es una copia de CHUNK_SIZE bytes, así que nunca se
+    copia el archivo completo.
+    
+    Args:
+        content (Union[str, mmap.mmap, bytes]): Texto CSV o mapeo de sus bytes
+        begin (int): Posición inicial del rango (debe ser inicio de registro)
+        end (Optional[int]): Posición final del rango (por defecto, el final del contenido)
+        ends (Optional[List[int]]): Si se pasa una lista, se agrega la posición
+            final (absoluta) de cada registro generado
+        
+    Yields:
+        List[Union[str, bytes]]: Valores de cada registro, en el orden del texto
+        (bytes sin decodificar si el contenido es un mapeo o bytes)
+    """
+    end = len(content) if end is None else end
+    blocks = (content[i:min(i + CHUNK_SIZE, end)] for i in range(begin, end, CHUNK_SIZE))
+    return iter_split_records(blocks, ends, begin)
+
+def _decode(value: Union[str, bytes]) -> str: # Decodifica un valor en bytes del archivo mapeado
+    """Devuelve el valor como str, decodificando desde UTF-8 si viene en bytes"""
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+def _symbols(content: Union[str, mmap.mmap, bytes]) -> Tuple: # Símbolos de sintaxis CSV según el tipo de contenido
+    """Devuelve (comilla, coma, salto de línea, vacío) del tipo de contenido"""
+    return SYMBOLS[str if isinstance(content, str) else bytes]
+
+def _count_quotes(content: Union[str, mmap.mmap, bytes], begin: int, end: int) -> int: # Cuenta las comillas de un rango del contenido
+    """Cuenta las comillas entre begin y end (mmap no tiene count, así que se cuenta sobre el rango copiado)"""
+    if isinstance(content, mmap.mmap):
+        return content[begin:end].count(b'"')
+    return content.count(_symbols(content)[0], begin, end)
+
+def next_record_start(content: Union[str, mmap.mmap, bytes], position: int, inside_quotes: bool = False) -> int: # Avanza hasta el inicio del siguiente registro respetando comillas
+    """
+    Avanza desde una posición hasta el inicio del siguiente registro real.
+    
+    Un salto de línea solo termina un registro si está fuera de comillas. Como
+    en RFC 4180 cada comilla alterna entre dentro y fuera de comillas (una
+    comilla escapada "" alterna dos veces), basta con la paridad de las
+    comillas contadas desde un punto conocido fuera de comillas.
+    
+    Args:
+        content (Union[str, mmap.mmap, bytes]): Texto CSV o mapeo de sus bytes
+        position (int): Posición desde la que se busca
+        inside_quotes (bool): Si la posición está dentro de un campo entre comillas
+        
+    Returns:
+        int: Posición siguiente al primer salto de línea fuera de comillas,
+             o len(content) si no hay más registros
+    """
+    line_break = _symbols(content)[2]
+    while True:
+        newline = content.find(line_break, position)
+        if newline < 0:
+            return len(content)
+        inside_quotes ^= _count_quotes(content, position, newline) % 2 == 1
+        position = newline + 1
+        if not inside_quotes:
+            return position
+
+def split_ranges(content: Union[str, mmap.mmap, bytes], parts: int, start: int = 0) -> List[Tuple[int, int]]: # Divide el texto en rangos alineados a inicios de registro
+    """
+    Divide el texto en rangos de tamaño similar alineados a inicios de registro.
+    
+    Cada corte se coloca primero en una posición proporcional y luego se mueve
+    al inicio del siguiente registro con next_record_start. La paridad de las
+    comillas se acumula desde start en un único recorrido, así que el costo
+    total es lineal en el tamaño del texto.
+    
+    Args:
+        content (Union[str, mmap.mmap, bytes]): Texto CSV o mapeo de sus bytes
+        parts (int): Número de rangos deseado
+        start (int): Posición inicial (debe ser inicio de registro)
+        
+    Returns:
+        List[Tuple[int, int]]: Lista de rangos (inicio, fin) que cubren el texto
+        desde start, sin registros partidos. Puede haber menos de parts rangos si
+        el texto es pequeño o hay registros muy largos
+    """
+    length = len(content)
+    size = max(1, (length - start) // max(1, parts))
+    bounds = [start]
+    position = start
+    inside_quotes = False
+    for k in range(1, parts):
+        target = start + k * size
+        if target <= position:
+            # El registro anterior ya cubre esta posición
+            continue
+        inside_quotes ^= _count_quotes(content, position, target) % 2 == 1
+        position = next_record_start(content, target, inside_quotes)
+        inside_quotes = False
+        if position >= length:
+            break
+        bounds.append(position)
+    bounds.append(length)
+    return [(begin, end) for begin, end in zip(bounds, bounds[1:]) if end > begin]
+
+def split_fixed_ranges(content: Union[str, mmap.mmap, bytes], size: int, start: int = 0) -> List[Tuple[int, int]]: # Divide el texto en rangos de tamaño fijo alineados a inicios de registro
+    """
+    Divide el texto en rangos de aproximadamente size posiciones alineados a registros.
+    
+    A diferencia de split_ranges, cada corte depende solo del texto anterior a
+    él y de size, no del largo total: si el archivo crece agregando registros
+    al final, los rangos ya existentes (salvo quizá el último) se mantienen
+    idénticos, lo que permite reutilizar su procesamiento.
+    
+    Args:
+        content (Union[str, mmap.mmap, bytes]): Texto CSV o mapeo de sus bytes
+        size (int): Tamaño objetivo de cada rango
+        start (int): Posición inicial (debe ser inicio de registro)
+        
+    Returns:
+        List[Tuple[int, int]]: Lista de rangos (inicio, fin) que cubren el texto
+        desde start, sin registros partidos
+    """
+    length = len(content)
+    ranges = []
+    position = start
+    while position < length:
+        target = position + max(1, size)
+        if target >= length:
+            end = length
         else:
-            # Si no hay suficientes valores, asignar None
-            row[header] = None
+            inside_quotes = _count_quotes(content, position, target) % 2 == 1
+            end = next_record_start(content, target, inside_quotes)
+        ranges.append((position, end))
+        position = end
+    return ranges
+
+def _extend_columns(columns: List[List[str]], batch: List[List[str]]): # Transpone un lote de registros y lo agrega a las columnas
+    """
+    Agrega un lote de registros a las listas por columna.
+    
+    zip(*batch) transpone el lote en C y cada columna se extiende con sus
+    valores sin espacios extra, sin crear un diccionario por fila. Los valores
+    en bytes (de un archivo mapeado) se decodifican aquí, campo por campo.
+    
+    Args:
+        columns (List[List[str]]): Listas de valores, una por columna (se modifican)
+        batch (List[List[Union[str, bytes]]]): Registros con exactamente len(columns) valores
+    """
+    decode = bool(batch) and isinstance(batch[0][0], bytes)
+    for column, values in zip(columns, zip(*batch)):
+        if decode:
+            values = map(bytes.decode, values)
+        column.extend(map(str.strip, values))
+
+def _parse_records(records: Iterable[List[Union[str, bytes]]], headers: List[str], validate: bool = False, kept: Optional[List[int]] = None, rejects: Optional[RejectSink] = None, ends: Optional[List[int]] = None, first: int = 1) -> Tuple[List[List[str]], int, Optional[List[List[bool]]], int]: # Convierte registros en columnas de valores
+    """
+    Convierte registros ya separados en listas de valores por columna.
+    
+    Los registros se acumulan en lotes de BATCH_SIZE y cada lote se transpone
+    a las columnas, así que nunca se mantiene una estructura por fila para
+    todo el archivo.
+    
+    Args:
+        records (Iterable[List[Union[str, bytes]]]): Registros producidos por el
+            tokenizador (en bytes si vienen de un archivo mapeado)
+        headers (List[str]): Lista de nombres de columnas/encabezados
+        validate (bool): Si es True, también valida cada campo contra su patrón
+        kept (Optional[List[int]]): Si se pasa una lista, se agrega el número
+            (desde 1) de cada registro que produjo una fila
+        rejects (Optional[RejectSink]): Si se pasa, los registros con una
+            cantidad de campos distinta a la de encabezados se envían a la
+            cuarentena en lugar de rellenarse o recortarse
+        ends (Optional[List[int]]): Posiciones finales de los registros que
+            llena iter_text_records (la primera es la de los encabezados), para
+            ubicar los rechazados. Si kept es None, las posiciones ya usadas se
+            descartan en cada lote para no conservarlas todas
+        first (int): Número del primer registro de records (para lotes sucesivos)
+        
+    Returns:
+        Tuple[List[List[str]], int, Optional[List[List[bool]]], int]: Tupla con
+        (columnas, registros_leidos, banderas, mal_formados) donde columnas
+        tiene una lista de valores por encabezado (en la posición del
+        encabezado), banderas tiene una lista de booleanos por columna (None si
+        validate es False) y mal_formados es el número de registros con una
+        cantidad de campos distinta a la de encabezados
+    """
+    width = len(headers)
+    columns = [[] for _ in headers]
+    batch = []
+    count = first - 1
+    malformed = 0
+    base = 0  # Posiciones de ends ya descartadas
+    for count, values in enumerate(records, start=first):
+        # Saltar líneas vacías que pueden aparecer al final del archivo
+        if len(values) == 1 and not values[0].strip():
+            continue
+        if len(values) != width:
+            if rejects is not None:
+                # El registro número n va de ends[n - 1] a ends[n]
+                span = (ends[count - 1 - base], ends[count - base]) if ends is not None else None
+                rejects.reject(count, MISSING_FIELDS if len(values) < width else EXTRA_FIELDS, values, span)
+                continue
+            malformed += 1
+            # Rellenar con valores vacíos (del mismo tipo) si faltan y descartar los sobrantes
+            values = (values + [values[0][:0]] * width)[:width]
+        if kept is not None:
+            kept.append(count)
+        batch.append(values)
+        if len(batch) == BATCH_SIZE:
+            _extend_columns(columns, batch)
+            batch = []
+            if ends is not None and kept is None:
+                del ends[:count - base]
+                base = count
+    _extend_columns(columns, batch)
+    
+    flags = None
+    if validate:
+        # Validación por columnas: cada columna se evalúa de una vez contra su patrón
+        flags = validate_columns(headers, columns)
+    return columns, count - first + 1, flags, malformed
+
+def _parse_range(task: Tuple[str, List[str], bool]) -> Tuple[List[List[str]], int, Optional[List[List[bool]]], int]: # Tarea ejecutada por cada proceso del pool
+    """
+    Procesa un rango de texto alineado a registros dentro de un proceso trabajador.
+    
+    Args:
+        task (Tuple[str, List[str], bool]): Tupla (texto_del_rango, encabezados, validar)
+        
+    Returns:
+        Tuple[List[List[str]], int, Optional[List[List[bool]]], int]: Resultado de _parse_records
+    """
+    text, headers, validate = task
+    return _parse_records(iter_text_records(text), headers, validate)
+
+def _parse_mapped_range(task: Tuple[str, int, int, List[str], bool]) -> Tuple[List[List[str]], int, Optional[List[List[bool]]], int]: # Tarea de un proceso del pool sobre un rango del archivo mapeado
+    """
+    Procesa un rango de bytes del archivo mapeándolo en el proceso trabajador.
+    
+    Solo viajan al proceso la ruta y los límites del rango; cada trabajador
+    mapea el mismo archivo, así que todos leen de la caché de páginas
+    compartida del sistema operativo en lugar de recibir copias del texto.
+    
+    Args:
+        task (Tuple[str, int, int, List[str], bool]): Tupla (ruta, inicio, fin, encabezados, validar)
+        
+    Returns:
+        Tuple[List[List[str]], int, Optional[List[List[bool]]], int]: Resultado de _parse_records
+    """
+    file_path, begin, end, headers, validate = task
+    mapping = load_file(file_path, mapped=True)
+    try:
+        return _parse_records(iter_text_records(mapping, begin, end), headers, validate)
+    finally:
+        if isinstance(mapping, mmap.mmap):
+            mapping.close()
+
+def iter_batches(records: Iterable[List[str]], headers: List[str], batch_size: int = OUTPUT_BATCH_SIZE, field_flags: Optional[List[tuple]] = None, errors: Optional[Dict[str, int]] = None, rejects: Optional[RejectSink] = None) -> Iterator[Dict[str, List[str]]]: # Genera lotes de registros organizados por columnas
+    """
+    Agrupa los registros en lotes de valores por columna.
+    
+    Es la versión incremental de parse_content(columnar=True): cada lote se
+    procesa y se entrega en cuanto se completa, así que la memoria usada
+    depende del tamaño del lote y no del tamaño del archivo.
     
-    return row
+    Args:
+        records (Iterable[List[str]]): Registros de datos (sin el de encabezados)
+        headers (List[str]): Lista de nombres de columnas/encabezados
+        batch_size (int): Registros por lote
+        field_flags (Optional[List[tuple]]): Si se pasa una lista, se valida cada
+            campo y la lista se llena con una tupla de banderas por fila, igual
+            que en parse_content
+        errors (Optional[Dict[str, int]]): Si se pasa un diccionario, se suma en
+            'malformed_records' el número de registros mal formados, igual que en
+            parse_content
+        rejects (Optional[RejectSink]): Si se pasa, los registros mal formados
+            se envían a la cuarentena, igual que en parse_content (sin línea ni
+            posición, porque los registros ya llegan separados)
+        
+    Yields:
+        Dict[str, List[str]]: Diccionario encabezado -> valores del lote, como
+        texto sin limpiar
+    """
+    records = iter(records)
+    validate = field_flags is not None
+    read = 0
+    while True:
+        columns, count, flags, malformed = _parse_records(islice(records, batch_size), headers, validate, rejects=rejects, first=read + 1)
+        if not count:
+            return
+        read += count
+        if errors is not None:
+            errors['malformed_records'] = errors.get('malformed_records', 0) + malformed
+        if validate:
+            field_flags.extend(zip(*flags))
+        if columns and columns[0]:
+            yield dict(zip(headers, columns))
 
-def parse_content(content: str) -> Tuple[List[str], List[Dict]]: # Esto procesa todo el contenido del CSV línea por línea
+def parse_content(content: Union[str, mmap.mmap, bytes, Iterable[List[str]]], workers: int = 1, field_flags: Optional[List[tuple]] = None, columnar: bool = False, file_path: Optional[str] = None, spans: Optional[List[Tuple[int, int]]] = None, errors: Optional[Dict[str, int]] = None, rejects: Optional[RejectSink] = None) -> Tuple[List[str], Union[List[Dict], Dict[str, List[str]]]]: # Esto procesa todo el contenido del CSV registro por registro
     """
-    Procesa todo el contenido del CSV línea por línea.
+    Procesa todo el contenido del CSV registro por registro.
     
     Esta función coordina el procesamiento completo del archivo:
     - Separa encabezados del contenido de datos
-    - Procesa cada línea individual aplicando el parser CSV
-    - Maneja errores de líneas individuales sin afectar el procesamiento total
+    - Divide el contenido en registros y campos con el tokenizador, en una sola
+      pasada que respeta los saltos de línea dentro de campos entre comillas
+    - Opcionalmente reparte el trabajo entre varios procesos
+    - Opcionalmente valida cada campo contra el patrón de su columna
+    - Acumula los valores directamente en listas por columna, sin un
+      diccionario por fila
     - Proporciona estadísticas del procesamiento realizado
     
     Args:
-        content (str): Contenido completo del archivo CSV
+        content (Union[str, mmap.mmap, bytes, Iterable[List[str]]]): Contenido
+            completo del archivo CSV (como texto o mapeado en memoria con
+            load_file(mapped=True)), o un iterable de registros ya separados en
+            valores (por ejemplo, el generador de iter_records) cuyo primer
+            elemento son los encabezados
+        workers (int): Número de procesos. Con más de uno, el texto se divide en
+            rangos alineados a registros que se procesan en un ProcessPoolExecutor
+            y se unen en el orden original. No aplica a un iterable de registros
+        field_flags (Optional[List[tuple]]): Si se pasa una lista, se activa la
+            validación de cada campo contra su patrón de PATTERNS y la lista se
+            llena con una tupla de banderas (aceptado/rechazado) por cada fila
+            devuelta, en el mismo orden que las columnas
+        columnar (bool): Si es True, los datos se devuelven como un diccionario
+            encabezado -> lista de valores, que create_dataframe usa sin pivotar
+        file_path (Optional[str]): Ruta del archivo cuando content es su mapeo;
+            con varios procesos cada uno mapea el archivo y solo recibe los
+            límites de su rango. Sin ella, cada proceso recibe una copia de su rango
+        spans (Optional[List[Tuple[int, int]]]): Si se pasa una lista, se llena
+            con la posición (inicio, fin) de cada fila devuelta dentro del
+            contenido (en bytes si es un mapeo), por ejemplo para indexarlas.
+            Requiere contenido de texto y fuerza el procesamiento secuencial
+        errors (Optional[Dict[str, int]]): Si se pasa un diccionario, se suma en
+            'malformed_records' el número de registros con más o menos campos
+            que encabezados (se rellenan o recortan en lugar de descartarse)
+        rejects (Optional[RejectSink]): Si se pasa, esos registros no se
+            rellenan: se envían a la cuarentena con su línea, posición y texto
+            original, y el procesamiento se detiene si la proporción de
+            rechazos supera el umbral del destino. Fuerza el procesamiento secuencial
         
     Returns:
-        Tuple[List[str], List[Dict]]: Tupla con (encabezados, lista_de_registros)
+        Tuple[List[str], Union[List[Dict], Dict[str, List[str]]]]: Tupla con (encabezados, datos)
         - encabezados: Lista con nombres de las columnas
-        - lista_de_registros: Lista de diccionarios, uno por cada fila de datos
+        - datos: Lista de diccionarios, uno por cada fila de datos, con los
+          valores limpios de build_row, o con columnar=True un diccionario con
+          la lista de valores de cada columna. Por columnas los valores quedan
+          como texto sin limpiar (create_dataframe los limpia y convierte por
+          columnas)
     """
-    # Dividir contenido en líneas individuales
-    lines = content.split('\n')
-    
-    # Extraer encabezados de la primera línea y limpiar espacios
-    headers = lines[0].split(',')
-    headers = [h.strip() for h in headers]
-    
-    # Lista para almacenar todos los registros procesados
-    data = []
+    validate = field_flags is not None
+    if spans is not None and not isinstance(content, TEXT_TYPES):
+        raise ValueError("Las posiciones de las filas requieren el contenido completo, no un iterable de registros")
+    if isinstance(content, TEXT_TYPES) and workers > 1 and spans is None and rejects is None:
+        # Modo paralelo: el texto se divide en rangos alineados a registros
+        header_end = next_record_start(content, 0)
+        header_line = content[:header_end].rstrip(_symbols(content)[2])
+        headers = [_decode(h).strip() for h in split_fields(header_line)]
+        ranges = split_ranges(content, workers, header_end)
+        if isinstance(content, mmap.mmap) and file_path:
+            worker, tasks = _parse_mapped_range, [(file_path, begin, end, headers, validate) for begin, end in ranges]
+        else:
+            worker, tasks = _parse_range, [(content[begin:end], headers, validate) for begin, end in ranges]
+        # concurrent.futures (y multiprocessing) solo se importa si se usa el modo paralelo
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map conserva el orden de los rangos, así que las filas quedan en el orden original
+            results = list(executor.map(worker, tasks))
+        if not results:
+            # Solo hay encabezados
+            results = [_parse_records([], headers, validate)]
+    else:
+        ends = [] if spans is not None or rejects is not None else None  # Posición final de cada registro
+        kept = [] if spans is not None else None  # Número de registro de cada fila
+        if isinstance(content, TEXT_TYPES):
+            records = iter_text_records(content, ends=ends)
+            if rejects is not None:
+                rejects.bind(content)
+        else:
+            # En modo streaming los registros ya llegan separados
+            records = iter(content)
+        # Extraer encabezados del primer registro y limpiar espacios
+        headers = [_decode(h).strip() for h in next(records, [])]
+        results = [_parse_records(records, headers, validate, kept, rejects, ends if isinstance(content, TEXT_TYPES) else None)]
+        if spans is not None:
+            # El registro número n (contando desde 1 después de los encabezados)
+            # va de ends[n - 1] a ends[n]
+            spans.extend((ends[number - 1], ends[number]) for number in kept)
     
-    # Procesar cada línea de datos (saltando la línea de encabezados)
-    for i, line in enumerate(lines[1:], start=2):
-        # Saltar líneas vacías que pueden aparecer al final del archivo
-        if not line.strip():
-            continue
-            
-        try:
-            # Procesar línea individual y agregar a la colección de datos
-            row = parse_line(line, headers)
-            data.append(row)
-        except Exception as e:
-            # Registrar error pero continuar con el procesamiento
-            print(f"Error procesando línea {i}: {str(e)}")
-            continue
+    # Unir las columnas de cada rango en el orden original
+    columns, _, flags, _ = results[0]
+    for more_columns, _, more_flags, _ in results[1:]:
+        for column, values in zip(columns, more_columns):
+            column.extend(values)
+        if validate:
+            for column, values in zip(flags, more_flags):
+                column.extend(values)
+    if validate:
+        field_flags.extend(zip(*flags))
+    if errors is not None:
+        errors['malformed_records'] = errors.get('malformed_records', 0) + sum(result[3] for result in results)
+    rows = len(columns[0]) if columns else 0
     
     # Proporcionar estadísticas del procesamiento completado
-    print(f"Procesamiento completado. {len(data)} registros procesados.")
-    return headers, data
\ No newline at end of file
+    print(f"Procesamiento completado. {rows} registros procesados.")
+    if columnar:
+        return headers, dict(zip(headers, columns))
+    # Formato por filas: un diccionario por registro, limpio como en parse_line
+    return headers, [build_row(list(row), headers) for row in zip(*columns)]
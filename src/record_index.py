@@ -0,0 +1,150 @@
+# Módulo de índice de registros por Identifier
+# Este módulo permite obtener un registro sin recorrer el DataFrame ni el CSV:
+# - Construye, a partir de las posiciones que devuelve parse_content, una
+#   tabla hash en disco que asocia cada Identifier con su fila y con la
+#   posición y el largo en bytes de su registro en el archivo de entrada
+# - La búsqueda lee solo la cabecera del índice, una o pocas ranuras de la
+#   tabla y los bytes del registro, sin importar el tamaño del archivo
+#
+# Formato del archivo de índice (enteros little-endian):
+# - Cabecera: MAGIC, número de ranuras, número de filas, tamaño y fecha de
+#   modificación del archivo de entrada, largo del bloque de encabezados
+# - Encabezados del CSV en JSON
+# - Ranuras de 32 bytes: (hash de la clave, fila, posición, largo); hash 0 = libre
+#   La ranura inicial sale de los bits del hash por encima del bit bajo, que
+#   siempre vale 1 y no sirve para repartir las claves
+
+import hashlib
+import json
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+from processors import build_row
+from tokenizer import split_fields
+
+MAGIC = b'BLIDX002'
+HEADER = struct.Struct('<8sQQQqQ')  # magic, ranuras, filas, tamaño, mtime_ns, largo de encabezados
+SLOT = struct.Struct('<QQQQ')       # hash, fila, posición, largo
+
+def normalize_identifier(identifier: Union[str, int]) -> str: # Forma canónica de un Identifier
+    """
+    Convierte un Identifier a su forma canónica para indexarlo y buscarlo.
+
+    Los identificadores numéricos se comparan sin ceros a la izquierda, así que
+    '000000206', '206' y 206 son la misma clave (el CSV de salida los guarda
+    como enteros).
+
+    Args:
+        identifier (Union[str, int]): Identifier tal como aparece en el CSV o como entero
+
+    Returns:
+        str: Clave canónica
+    """
+    key = str(identifier).strip()
+    return str(int(key)) if key.isdigit() else key
+
+def _key_hash(key: str) -> int: # Hash de 64 bits de una clave (nunca 0)
+    """Hash de 64 bits de una clave canónica; el bit bajo siempre vale 1 para distinguirlo de una ranura libre"""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') | 1
+
+def _home_slot(key_hash: int, mask: int) -> int: # Ranura inicial de una clave
+    """Ranura inicial del sondeo, sin el bit bajo fijo del hash"""
+    return (key_hash >> 1) & mask
+
+def _read_at(file, offset: int, size: int) -> bytes: # Lee size bytes desde una posición del archivo
+    """Lee exactamente los bytes pedidos desde una posición de un archivo abierto en binario"""
+    file.seek(offset)
+    return file.read(size)
+
+def build_index(index_path: str, source_path: str, headers: List[str], identifiers: List[str], spans: List[Tuple[int, int]]) -> int: # Construye y guarda el índice de Identifier
+    """
+    Construye la tabla hash de Identifier y la guarda en disco.
+
+    La tabla usa direccionamiento abierto con sondeo lineal y una cantidad de
+    ranuras potencia de dos de al menos el doble de filas, así que cada
+    búsqueda revisa en promedio muy pocas ranuras. El archivo se escribe en un
+    temporal y se reemplaza de forma atómica.
+
+    Args:
+        index_path (str): Ruta del archivo de índice
+        source_path (str): Ruta del archivo CSV de entrada indexado
+        headers (List[str]): Encabezados del CSV
+        identifiers (List[str]): Identifier de cada fila (columna de parse_content)
+        spans (List[Tuple[int, int]]): Posición (inicio, fin) en bytes de cada
+            fila, como las llena parse_content sobre un archivo mapeado
+
+    Returns:
+        int: Número de filas indexadas
+    """
+    slots = 1
+    while slots < 2 * max(1, len(identifiers)):
+        slots *= 2
+    mask = slots - 1
+    table = bytearray(slots * SLOT.size)
+    for row, (identifier, (begin, end)) in enumerate(zip(identifiers, spans)):
+        key_hash = _key_hash(normalize_identifier(identifier))
+        slot = _home_slot(key_hash, mask)
+        while SLOT.unpack_from(table, slot * SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        SLOT.pack_into(table, slot * SLOT.size, key_hash, row, begin, end - begin)
+
+    stat = os.stat(source_path)
+    header_block = json.dumps(headers).encode('utf-8')
+    temporary = index_path + '.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, slots, len(identifiers), stat.st_size, stat.st_mtime_ns, len(header_block)))
+        file.write(header_block)
+        file.write(table)
+    os.replace(temporary, index_path)
+    return len(identifiers)
+
+def lookup(identifier: Union[str, int], index_path: str, source_path: str) -> Optional[Dict[str, Any]]: # Busca un registro por Identifier en tiempo constante
+    """
+    Obtiene un registro por su Identifier usando el índice en disco.
+
+    Solo se leen la cabecera del índice, las ranuras que recorre el sondeo y
+    los bytes del registro en el archivo de entrada (con lecturas
+    posicionadas, sin cargar ninguno de los dos archivos), así que el costo no
+    depende del tamaño del dataset, incluso sin nada en caché. El registro se
+    separa con el tokenizador y se limpia con build_row, igual que una fila de
+    parse_line.
+
+    Args:
+        identifier (Union[str, int]): Identifier buscado (por ejemplo '000000206' o 206)
+        index_path (str): Ruta del archivo de índice
+        source_path (str): Ruta del archivo CSV de entrada indexado
+
+    Returns:
+        Optional[Dict[str, Any]]: Diccionario de la fila (con la clave '_row'
+        indicando su posición en el dataset), o None si no existe
+
+    Raises:
+        ValueError: Si el archivo no es un índice válido o el archivo de entrada
+            cambió desde que se construyó el índice
+    """
+    key = normalize_identifier(identifier)
+    key_hash = _key_hash(key)
+    with open(index_path, 'rb', buffering=0) as index_file, open(source_path, 'rb', buffering=0) as source_file:
+        magic, slots, _, size, mtime_ns, header_length = HEADER.unpack(_read_at(index_file, 0, HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{index_path} no es un índice de registros")
+        stat = os.fstat(source_file.fileno())
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            raise ValueError(f"El índice {index_path} está desactualizado respecto a {source_path}")
+        headers = json.loads(_read_at(index_file, HEADER.size, header_length))
+        table_start = HEADER.size + header_length
+
+        mask = slots - 1
+        slot = _home_slot(key_hash, mask)
+        while True:
+            stored_hash, row, begin, length = SLOT.unpack(_read_at(index_file, table_start + slot * SLOT.size, SLOT.size))
+            if not stored_hash:
+                return None
+            if stored_hash == key_hash:
+                values = [value.decode('utf-8') for value in split_fields(_read_at(source_file, begin, length).rstrip(b'\r\n'))]
+                # Confirmar la clave por si dos identificadores comparten hash
+                if normalize_identifier(values[0]) == key:
+                    record = build_row(values, headers)
+                    record['_row'] = row
+                    return record
+            slot = (slot + 1) & mask
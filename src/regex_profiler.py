@@ -0,0 +1,180 @@
+# Módulo de perfilado del rendimiento de los patrones regex
+# Este módulo mide cuánto tarda cada patrón de PATTERNS:
+# - Sobre los valores reales del dataset (percentiles y peor caso por valor)
+# - Sobre entradas adversarias generadas a partir del patrón (repeticiones de
+#   su ejemplo y de sus literales, dígitos sin año, texto sin comas) de
+#   tamaño creciente, estimando cómo crece el tiempo con el largo
+# Un exponente de crecimiento mayor que SUPERLINEAR_EXPONENT indica retroceso
+# catastrófico. Las coincidencias adversarias se evalúan con guarded_match, así
+# que un patrón patológico no bloquea el perfilado.
+
+import math
+import time
+from typing import Dict, List, Optional
+from patterns import PATTERNS, REGISTRY
+from search import required_literals
+from validators import guarded_match
+
+# Exponente (tiempo ~ largo^k) desde el cual el crecimiento se considera superlineal
+SUPERLINEAR_EXPONENT = 1.5
+
+# Largos de las entradas adversarias
+DEFAULT_SIZES = [1000, 2000, 4000, 8000]
+
+# Tiempo máximo por coincidencia adversaria; al superarlo se corta la serie de largos
+PROFILE_BUDGET = 0.5
+
+def adversarial_inputs(field: str, size: int) -> Dict[str, str]: # Genera entradas adversarias de un largo dado para un campo
+    """
+    Genera entradas de unos size caracteres que suelen provocar retroceso.
+
+    Todas terminan en un espacio y un carácter, de modo que la parte final del
+    patrón (por ejemplo [^\\s,]* o el lookahead (?=,|$)) falle después de haber
+    consumido casi toda la entrada:
+    - ejemplo: el ejemplo válido del patrón repetido sin comas
+    - literales: el inicio del ejemplo hasta su literal obligatorio y luego el
+      literal repetido (por ejemplo 'http://' + 'flickr.com' * n)
+    - digitos: grupos de tres dígitos que nunca forman un año de cuatro
+    - texto: letras sin comas ni dígitos
+
+    Args:
+        field (str): Campo de PATTERNS
+        size (int): Largo aproximado de cada entrada
+
+    Returns:
+        Dict[str, str]: Entrada por nombre de generador
+    """
+    example = PATTERNS[field]['example_valid'].replace(',', '') or 'a'
+    inputs = {
+        'ejemplo': (example * (size // len(example) + 1))[:size],
+        'digitos': ('123 ' * (size // 4 + 1))[:size],
+        'texto': ('ab ' * (size // 3 + 1))[:size],
+    }
+    literals = required_literals(REGISTRY.sources[field])
+    if literals:
+        literal = literals[0]
+        position = example.find(literal)
+        prefix = example[:position] if position >= 0 else ''
+        inputs['literales'] = prefix + literal * max(1, (size - len(prefix)) // len(literal))
+    return {name: value + ' x' for name, value in inputs.items()}
+
+def _percentile(times: List[float], fraction: float) -> float: # Percentil de una lista ordenada de tiempos
+    """Devuelve el percentil fraction (0 a 1) de una lista ordenada, por el método del rango más cercano"""
+    if not times:
+        return 0.0
+    return times[min(len(times) - 1, max(0, math.ceil(fraction * len(times)) - 1))]
+
+def _time_match(check, value: str, field: str, repeat: int) -> Optional[float]: # Mejor tiempo de una coincidencia con presupuesto
+    """Mejor tiempo de check(value) en repeat intentos; None si superó PROFILE_BUDGET"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        guarded_match(check, value, field, PROFILE_BUDGET)
+        elapsed = time.perf_counter() - start
+        if elapsed >= PROFILE_BUDGET:
+            return None
+        best = min(best, elapsed)
+    return best
+
+def profile_pattern(field: str, values: List[str] = (), sizes: List[int] = DEFAULT_SIZES, repeat: int = 3) -> Dict: # Perfila un patrón sobre el dataset y entradas adversarias
+    """
+    Mide el rendimiento del patrón de un campo.
+
+    Args:
+        field (str): Campo de PATTERNS
+        values (List[str]): Valores reales de la columna (sin espacios extremos)
+        sizes (List[int]): Largos de las entradas adversarias, crecientes
+        repeat (int): Repeticiones por entrada adversaria (se usa el mejor tiempo)
+
+    Returns:
+        Dict: Resultados con las claves:
+            - dataset: percentiles p50, p90 y p99 y máximo (en segundos) por valor
+            - adversarial: tiempos por generador y largo (None si superó el presupuesto)
+            - worst: generador con el mayor exponente de crecimiento
+            - exponent: exponente estimado entre los dos mayores largos medidos
+            - superlinear: True si el exponente supera SUPERLINEAR_EXPONENT o
+              alguna entrada superó el presupuesto
+    """
+    check = REGISTRY.match[field]
+    times = []
+    for value in values:
+        start = time.perf_counter()
+        check(value)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    dataset = {
+        'rows': len(times),
+        'p50': _percentile(times, 0.5),
+        'p90': _percentile(times, 0.9),
+        'p99': _percentile(times, 0.99),
+        'max': times[-1] if times else 0.0,
+    }
+
+    adversarial: Dict[str, List[Optional[float]]] = {}
+    for size in sizes:
+        for name, value in adversarial_inputs(field, size).items():
+            series = adversarial.setdefault(name, [])
+            # Una serie que ya superó el presupuesto no se sigue midiendo
+            series.append(None if series and series[-1] is None else _time_match(check, value, field, repeat))
+
+    worst, exponent, timed_out = None, 0.0, False
+    for name, series in adversarial.items():
+        if None in series:
+            timed_out = True
+            worst, exponent = name, math.inf
+            continue
+        measured = [(size, elapsed) for size, elapsed in zip(sizes, series) if elapsed > 0]
+        if len(measured) >= 2:
+            (small, before), (large, after) = measured[-2], measured[-1]
+            growth = math.log(after / before) / math.log(large / small)
+            if worst is None or (growth > exponent and exponent != math.inf):
+                worst, exponent = name, growth
+    return {
+        'dataset': dataset,
+        'adversarial': adversarial,
+        'worst': worst,
+        'exponent': exponent,
+        'superlinear': timed_out or exponent > SUPERLINEAR_EXPONENT,
+    }
+
+def profile_patterns(columns: Dict[str, List[str]], sizes: List[int] = DEFAULT_SIZES, repeat: int = 3) -> Dict[str, Dict]: # Perfila todos los patrones de PATTERNS
+    """
+    Perfila el patrón de cada campo de PATTERNS.
+
+    Args:
+        columns (Dict[str, List[str]]): Valores crudos por columna (de parse_content(columnar=True));
+            las columnas ausentes se perfilan solo con entradas adversarias
+        sizes (List[int]): Largos de las entradas adversarias, crecientes
+        repeat (int): Repeticiones por entrada adversaria
+
+    Returns:
+        Dict[str, Dict]: Resultado de profile_pattern por campo
+    """
+    return {
+        field: profile_pattern(field, [value.strip() for value in columns.get(field, [])], sizes, repeat)
+        for field in PATTERNS
+    }
+
+def format_report(results: Dict[str, Dict], sizes: List[int] = DEFAULT_SIZES) -> str: # Tabla de texto con los resultados del perfilado
+    """
+    Da formato de tabla a los resultados de profile_patterns.
+
+    Args:
+        results (Dict[str, Dict]): Resultados por campo
+        sizes (List[int]): Largos usados en las entradas adversarias
+
+    Returns:
+        str: Tabla con percentiles del dataset (en µs), peor tiempo adversario
+        (en ms), exponente de crecimiento y marca de superlineal
+    """
+    lines = [f"{'campo':>22} | {'p50 µs':>7} | {'p99 µs':>7} | {'máx µs':>8} | "
+             f"{'peor adversario':>15} | {f'ms ({sizes[-1]})':>10} | {'exponente':>9} | superlineal"]
+    for field, result in results.items():
+        dataset = result['dataset']
+        worst = result['worst']
+        series = result['adversarial'].get(worst, [])
+        last = series[-1] if series else 0.0
+        elapsed = 'límite' if last is None else f"{last * 1000:.3f}"
+        lines.append(f"{field:>22} | {dataset['p50'] * 1e6:>7.2f} | {dataset['p99'] * 1e6:>7.2f} | {dataset['max'] * 1e6:>8.2f} | "
+                     f"{worst or '-':>15} | {elapsed:>10} | {result['exponent']:>9.2f} | {'SÍ' if result['superlinear'] else 'no'}")
+    return '\n'.join(lines)
@@ -0,0 +1,163 @@
+# Módulo de cuarentena de registros rechazados
+# Este módulo reemplaza el relleno silencioso de los registros mal formados:
+# - Cada registro rechazado se guarda en un archivo JSON Lines con su número
+#   de registro, su línea, su posición en bytes, el texto original y el motivo
+# - La escritura se hace por lotes y el detalle se limita a QUARANTINE_LIMIT
+#   registros, así que un archivo muy sucio no llena el disco ni domina el tiempo
+# - Se cuentan los rechazos por motivo y el procesamiento se detiene en cuanto
+#   la proporción de rechazos supera el umbral configurado
+
+import json
+import mmap
+import os
+from typing import Dict, List, Optional, Tuple, Union
+from config import REJECT_MAX_RATE, REJECT_MIN_RECORDS, QUARANTINE_LIMIT, REJECT_BUFFER_SIZE
+
+# Motivos de rechazo
+MISSING_FIELDS = 'missing_fields' # El registro tiene menos campos que encabezados
+EXTRA_FIELDS = 'extra_fields' # El registro tiene más campos que encabezados
+
+class RejectRateExceeded(ValueError): # Señal de que se superó la proporción máxima de rechazos
+    """Se lanza cuando la proporción de registros rechazados supera el umbral de RejectSink"""
+
+def _quote(value: str) -> str: # Aplica las reglas de comillas del CSV
+    """Encierra el valor entre comillas si tiene comas, comillas o saltos de línea"""
+    if ',' in value or '"' in value or '\n' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def _text(value: Union[str, bytes]) -> str: # Texto de un valor en str o en bytes
+    return value.decode('utf-8', errors='replace') if isinstance(value, bytes) else value
+
+class RejectSink: # Destino acotado y con buffer de los registros rechazados
+    """
+    Guarda los registros rechazados en un archivo de cuarentena y cuenta los rechazos.
+
+    Cada línea del archivo es un objeto JSON con las claves record (número de
+    registro, desde 1 después de los encabezados), line (línea del archivo
+    donde empieza, desde 1), offset (posición en bytes donde empieza), reason
+    y raw (texto original del registro). Si los registros no vienen de un
+    contenido completo (modo streaming), line y offset son null y raw se
+    reconstruye a partir de los valores.
+
+    Uso:
+        with RejectSink('output/quarantine.jsonl') as sink:
+            headers, data = parse_content(content, rejects=sink)
+        print(sink.counts)
+
+    Attributes:
+        path (str): Archivo de cuarentena (se reemplaza en cada ejecución)
+        counts (Dict[str, int]): Registros rechazados por motivo
+        rejected (int): Total de registros rechazados
+        written (int): Registros rechazados guardados con detalle
+    """
+
+    def __init__(self, path: str, max_rate: Optional[float] = REJECT_MAX_RATE, min_records: int = REJECT_MIN_RECORDS, limit: int = QUARANTINE_LIMIT, buffer_size: int = REJECT_BUFFER_SIZE):
+        """
+        Args:
+            path (str): Ruta del archivo de cuarentena
+            max_rate (Optional[float]): Proporción máxima de registros rechazados
+                sobre los leídos; None para no detener nunca el procesamiento
+            min_records (int): Registros leídos antes de evaluar la proporción
+            limit (int): Registros rechazados que se guardan con detalle
+            buffer_size (int): Registros acumulados antes de cada escritura
+        """
+        self.path = path
+        self.max_rate = max_rate
+        self.min_records = min_records
+        self.limit = limit
+        self.buffer_size = buffer_size
+        self.counts: Dict[str, int] = {}
+        self.rejected = 0
+        self.written = 0
+        self._buffer: List[str] = []
+        self._source = None
+        self._cursor = (0, 1, 0) # (posición, línea, bytes) del último registro ubicado
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def bind(self, content: Union[str, mmap.mmap, bytes]): # Indica el contenido de donde vienen los registros
+        """
+        Asocia el contenido completo del archivo, para ubicar los registros
+        rechazados (línea y posición en bytes) y copiar su texto original.
+
+        Args:
+            content (Union[str, mmap.mmap, bytes]): Texto o mapeo del archivo
+        """
+        self._source = content
+        self._cursor = (0, 1, 0)
+
+    def _locate(self, start: int) -> Tuple[int, int]: # Línea y posición en bytes de una posición del contenido
+        """
+        Convierte una posición del contenido en (línea, bytes).
+
+        Las posiciones llegan en orden creciente, así que solo se recorre el
+        tramo desde el registro rechazado anterior.
+        """
+        position, line, offset = self._cursor
+        content = self._source
+        if isinstance(content, str):
+            line += content.count('\n', position, start)
+            offset += len(content[position:start].encode('utf-8'))
+        else:
+            # En un mapeo o en bytes las posiciones ya son bytes
+            line += content[position:start].count(b'\n')
+            offset = start
+        self._cursor = (start, line, offset)
+        return line, offset
+
+    def reject(self, record: int, reason: str, values: List[Union[str, bytes]], span: Optional[Tuple[int, int]] = None): # Registra un registro rechazado
+        """
+        Registra un registro rechazado y detiene el procesamiento si la
+        proporción de rechazos supera max_rate.
+
+        Args:
+            record (int): Número del registro (desde 1 después de los encabezados),
+                que también es el número de registros leídos hasta ahora
+            reason (str): Motivo del rechazo
+            values (List[Union[str, bytes]]): Valores del registro ya separados
+            span (Optional[Tuple[int, int]]): Posición (inicio, fin) del registro
+                en el contenido asociado con bind, si se conoce
+
+        Raises:
+            RejectRateExceeded: Si la proporción de rechazos supera max_rate
+        """
+        self.rejected += 1
+        self.counts[reason] = self.counts.get(reason, 0) + 1
+        if self.written < self.limit:
+            line = offset = None
+            if span is not None and self._source is not None:
+                line, offset = self._locate(span[0])
+                raw = _text(self._source[span[0]:span[1]]).rstrip('\r\n')
+            else:
+                raw = ','.join(_quote(_text(value)) for value in values)
+            self._buffer.append(json.dumps({'record': record, 'line': line, 'offset': offset, 'reason': reason, 'raw': raw}, ensure_ascii=False))
+            self.written += 1
+            if len(self._buffer) >= self.buffer_size:
+                self.flush()
+        if self.max_rate is not None and record >= self.min_records and self.rejected > self.max_rate * record:
+            self.flush()
+            raise RejectRateExceeded(f"{self.rejected} de {record} registros rechazados ({self.rejected / record:.2%}), "
+                                     f"más que el máximo de {self.max_rate:.2%}; detalle en {self.path}")
+
+    def flush(self): # Escribe los registros acumulados
+        if self._buffer:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self): # Escribe lo pendiente y cierra el archivo de cuarentena
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        if self.rejected > self.written:
+            print(f"ADVERTENCIA: {self.rejected - self.written} registros rechazados se contaron pero no se guardaron en {self.path} (límite {self.limit})")
+
+    def __enter__(self) -> 'RejectSink':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
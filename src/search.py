@@ -0,0 +1,255 @@
+# Módulo de búsqueda con expresiones regulares sobre las columnas del dataset
+# Este módulo acelera búsquedas tipo grep con un prefiltro de literales:
+# - Analiza la estructura del patrón y extrae los literales que toda
+#   coincidencia debe contener (por ejemplo 'flickr.com' en el patrón de
+#   Flickr URL, o una de las alternativas de Issuance type)
+# - Busca esos literales con str.find sobre el texto de la columna completa,
+#   descartando en C las filas que no pueden coincidir
+# - Evalúa la expresión regular completa solo sobre las filas candidatas
+
+import bisect
+import re
+from typing import Dict, List, Optional, Set
+from patterns import REGISTRY
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - versiones anteriores de Python
+    import sre_parse
+
+# Separador entre valores en el texto de una columna; no puede aparecer en un literal
+SEPARATOR = '\x00'
+
+# Si los literales aparecen en más de esta proporción de filas, el prefiltro no
+# descarta lo suficiente y se evalúa la expresión regular sobre todas las filas
+MAX_CANDIDATE_RATIO = 0.5
+
+_REPEATS = tuple(getattr(sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT') if hasattr(sre_parse, name))
+
+def _best(current: Optional[Set[str]], candidate: Optional[Set[str]]) -> Optional[Set[str]]: # Elige el conjunto de literales más selectivo
+    """Elige entre dos conjuntos de literales obligatorios el más selectivo (literal más corto más largo, luego menos alternativas)"""
+    if not candidate or '' in candidate:
+        return current
+    if current is None:
+        return candidate
+    score = lambda literals: (min(map(len, literals)), -len(literals))
+    return candidate if score(candidate) > score(current) else current
+
+# Banderas que cambian qué texto coincide con un literal; con cualquiera de
+# ellas (global o en un grupo como (?i:...)) el patrón no se prefiltra
+_UNSAFE_FLAGS = re.IGNORECASE | re.VERBOSE | re.LOCALE | re.UNICODE
+
+def _scoped_flags(items) -> bool: # Indica si algún grupo del patrón cambia banderas que afectan a los literales
+    """Devuelve True si algún SUBPATTERN del árbol de sre_parse (a cualquier profundidad) agrega o quita banderas de _UNSAFE_FLAGS"""
+    for opcode, argument in items:
+        if opcode is sre_parse.SUBPATTERN and (argument[1] | argument[2]) & _UNSAFE_FLAGS:
+            return True
+        # Los subárboles (grupos, ramas, repeticiones, aserciones) son SubPattern
+        # dentro del argumento, solos o en la lista de ramas de BRANCH
+        for child in (argument if isinstance(argument, (tuple, list)) else (argument,)):
+            branches = child if isinstance(child, list) else (child,)
+            if any(isinstance(branch, sre_parse.SubPattern) and _scoped_flags(branch) for branch in branches):
+                return True
+    return False
+
+def _exact(items) -> Optional[str]: # Cadena exacta de una secuencia formada solo por literales
+    """Devuelve la cadena que representa una secuencia de LITERAL (también dentro de grupos), o None si tiene otra cosa"""
+    parts = []
+    for opcode, argument in items:
+        if opcode is sre_parse.LITERAL:
+            parts.append(chr(argument))
+        elif opcode is sre_parse.SUBPATTERN:
+            inner = _exact(argument[-1])
+            if inner is None:
+                return None
+            parts.append(inner)
+        else:
+            return None
+    return ''.join(parts)
+
+def _required(items) -> Optional[Set[str]]: # Literales obligatorios de una secuencia del árbol de sre_parse
+    """
+    Calcula un conjunto de literales tal que toda coincidencia de la secuencia contiene al menos uno.
+
+    Las secuencias de LITERAL consecutivas (incluidos grupos formados solo por
+    literales) forman una cadena; una clase de caracteres sin negar aporta sus
+    caracteres como alternativas; un grupo o una repetición con mínimo de al
+    menos 1 aportan los literales de su contenido, y una alternancia aporta la
+    unión de los de sus ramas (solo si todas tienen). De todos los candidatos
+    de la secuencia se queda con el más selectivo. Devuelve None si no hay
+    ningún literal obligatorio.
+    """
+    best = None
+    run = []
+    for opcode, argument in items:
+        if opcode is sre_parse.LITERAL:
+            run.append(chr(argument))
+            continue
+        if opcode is sre_parse.SUBPATTERN:
+            exact = _exact(argument[-1])
+            if exact is not None:
+                run.append(exact)
+                continue
+        if run:
+            best = _best(best, {''.join(run)})
+            run = []
+        if opcode is sre_parse.SUBPATTERN:
+            best = _best(best, _required(argument[-1]))
+        elif opcode is sre_parse.BRANCH:
+            branches = [_required(branch) for branch in argument[1]]
+            if all(branches):
+                best = _best(best, set().union(*branches))
+        elif opcode is sre_parse.IN and all(item is sre_parse.LITERAL for item, _ in argument):
+            best = _best(best, {chr(character) for _, character in argument})
+        elif opcode in _REPEATS and argument[0] >= 1:
+            best = _best(best, _required(argument[2]))
+    if run:
+        best = _best(best, {''.join(run)})
+    return best
+
+def required_literals(pattern: str) -> Optional[List[str]]: # Literales que toda coincidencia de un patrón debe contener
+    """
+    Extrae de un patrón los literales que toda coincidencia debe contener.
+
+    Por ejemplo, para el patrón de Flickr URL devuelve ['flickr.com'] y para el
+    de Issuance type devuelve sus cuatro alternativas: un valor que no contiene
+    ninguno de los literales no puede coincidir. Los patrones sin literales
+    obligatorios, los que no distinguen mayúsculas (también solo en un grupo,
+    como (?i:...)) y los de bytes no se prefiltran.
+
+    Args:
+        pattern (str): Expresión regular
+
+    Returns:
+        Optional[List[str]]: Literales (basta con que aparezca uno), ordenados,
+        o None si el patrón no permite prefiltrar
+
+    Raises:
+        ValueError: Si el patrón tiene sintaxis inválida
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error as e:
+        raise ValueError(f"Patrón de búsqueda inválido: {str(e)}")
+    if parsed.state.flags & (re.IGNORECASE | re.VERBOSE) or _scoped_flags(parsed):
+        return None
+    literals = _required(list(parsed))
+    if literals is None or any(SEPARATOR in literal for literal in literals):
+        return None
+    return sorted(literals)
+
+class ColumnSearcher: # Búsqueda con prefiltro de literales sobre una columna
+    """
+    Índice ligero de una columna para búsquedas repetidas con expresiones regulares.
+
+    Concatena los valores de la columna en un solo texto separado por
+    SEPARATOR y guarda dónde empieza cada valor, así que los literales del
+    prefiltro se buscan con str.find sobre todo el texto (en C) y cada
+    posición encontrada se convierte en fila con búsqueda binaria.
+
+    Attributes:
+        values (List[str]): Valores de la columna
+        text (str): Valores concatenados con SEPARATOR
+        starts (List[int]): Posición en text donde empieza cada valor
+    """
+
+    def __init__(self, values: List[str]):
+        """
+        Prepara la columna para las búsquedas.
+
+        Args:
+            values (List[str]): Valores de la columna (por ejemplo de parse_content(columnar=True))
+        """
+        self.values = values
+        self.text = SEPARATOR.join(values)
+        self.starts = []
+        position = 0
+        for value in values:
+            self.starts.append(position)
+            position += len(value) + 1
+
+    def candidates(self, literals: List[str]) -> List[int]: # Filas que contienen alguno de los literales
+        """
+        Devuelve las filas cuyo valor contiene al menos uno de los literales.
+
+        Tras encontrar un literal, la búsqueda salta al inicio del valor
+        siguiente, así que cada fila se visita a lo sumo una vez por literal.
+
+        Args:
+            literals (List[str]): Literales buscados
+
+        Returns:
+            List[int]: Filas candidatas, en orden ascendente
+        """
+        rows = set()
+        find = self.text.find
+        starts = self.starts
+        count = len(starts)
+        for literal in literals:
+            position = find(literal)
+            while position != -1:
+                row = bisect.bisect_right(starts, position) - 1
+                rows.add(row)
+                if row + 1 == count:
+                    break
+                position = find(literal, starts[row + 1])
+        return sorted(rows)
+
+    def search(self, pattern: str) -> List[int]: # Filas cuyo valor coincide con el patrón
+        """
+        Devuelve las filas cuyo valor contiene una coincidencia del patrón (como re.search).
+
+        Si el patrón tiene literales obligatorios y son selectivos (según cuántas
+        veces aparecen en la columna, que str.count calcula en C), la expresión
+        regular solo se evalúa sobre las filas que los contienen; si no, sobre
+        todas.
+
+        Args:
+            pattern (str): Expresión regular
+
+        Returns:
+            List[int]: Filas que coinciden, en orden ascendente
+
+        Raises:
+            ValueError: Si el patrón tiene sintaxis inválida
+        """
+        literals = required_literals(pattern)
+        search = re.compile(pattern).search
+        values = self.values
+        if literals is not None:
+            occurrences = sum(self.text.count(literal) for literal in literals)
+            if occurrences > MAX_CANDIDATE_RATIO * len(values):
+                literals = None
+        if literals is None:
+            return [row for row, value in enumerate(values) if search(value)]
+        return [row for row in self.candidates(literals) if search(values[row])]
+
+def search_columns(columns: Dict[str, List[str]], pattern: str, fields: Optional[List[str]] = None) -> Dict[str, List[int]]: # Busca un patrón en varias columnas
+    """
+    Busca un patrón en varias columnas con el prefiltro de literales.
+
+    Args:
+        columns (Dict[str, List[str]]): Valores por columna
+        pattern (str): Expresión regular
+        fields (Optional[List[str]]): Columnas donde buscar (por defecto todas)
+
+    Returns:
+        Dict[str, List[int]]: Filas que coinciden por columna
+
+    Raises:
+        ValueError: Si alguna columna pedida no existe o el patrón es inválido
+    """
+    fields = list(columns) if fields is None else fields
+    missing = [field for field in fields if field not in columns]
+    if missing:
+        raise ValueError(f"Columnas inexistentes: {missing}")
+    return {field: ColumnSearcher(columns[field]).search(pattern) for field in fields}
+
+def field_literals() -> Dict[str, Optional[List[str]]]: # Literales obligatorios del patrón de cada campo
+    """
+    Devuelve los literales obligatorios del patrón de cada campo de PATTERNS.
+
+    Returns:
+        Dict[str, Optional[List[str]]]: Literales por campo (None si el patrón no permite prefiltrar)
+    """
+    return {field: required_literals(source) for field, source in REGISTRY.sources.items()}
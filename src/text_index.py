@@ -0,0 +1,323 @@
+# Módulo de índice invertido de texto completo
+# Este módulo permite buscar registros por palabras sin recorrer el dataset:
+# - Normaliza el texto de Title, Author y Contributors (minúsculas, sin
+#   acentos) y lo separa en palabras con el patrón TOKEN_PATTERN
+# - Asocia cada palabra con la lista ordenada de filas donde aparece
+#   (listas de publicación compactas en array('I'))
+# - Resuelve consultas AND, OR y por prefijo intersectando y uniendo listas
+# - Se guarda y se carga desde disco en un formato binario simple
+
+import bisect
+import os
+import struct
+import unicodedata
+from array import array
+from typing import Dict, Iterable, List, Optional
+from patterns import REGISTRY
+
+# Campos de texto que se indexan
+INDEXED_FIELDS = ['Title', 'Author', 'Contributors']
+
+MAGIC = b'BLTXT002'
+HEADER = struct.Struct('<8sQQQQ')  # magic, palabras, filas, bytes del vocabulario, bytes de los Identifier
+
+# A partir de esta proporción de tamaños, intersect busca con bisección en la lista larga
+GALLOP_RATIO = 16
+
+def normalize_text(text: str) -> str: # Pasa el texto a minúsculas y quita los acentos
+    """
+    Normaliza un texto para indexarlo o buscarlo.
+
+    Convierte a minúsculas (casefold) y elimina las marcas diacríticas, de modo
+    que 'Márquez', 'MARQUEZ' y 'marquez' producen la misma palabra.
+
+    Args:
+        text (str): Texto original
+
+    Returns:
+        str: Texto normalizado
+    """
+    text = text.casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text: str) -> List[str]: # Separa un texto normalizado en palabras
+    """
+    Separa un texto en palabras normalizadas.
+
+    Args:
+        text (str): Texto original
+
+    Returns:
+        List[str]: Palabras en el orden del texto
+    """
+    return REGISTRY.token_findall(normalize_text(text))
+
+def intersect(left: array, right: array) -> array: # Intersección de dos listas de publicación ordenadas
+    """
+    Intersecta dos listas ordenadas de filas.
+
+    Si una lista es mucho más corta que la otra, recorre la corta y busca cada
+    fila en la larga con búsqueda binaria, avanzando el límite inferior (costo
+    O(m log n) con m la lista corta), lo que mantiene rápidas las consultas con
+    una palabra rara aunque la otra sea muy frecuente. Si tienen tamaños
+    parecidos, intersecta conjuntos, que en Python es más rápido que recorrer
+    ambas listas.
+
+    Args:
+        left (array): Lista ordenada de filas
+        right (array): Lista ordenada de filas
+
+    Returns:
+        array: Filas presentes en ambas listas, ordenadas
+    """
+    if len(left) > len(right):
+        left, right = right, left
+    if len(right) < GALLOP_RATIO * len(left):
+        return array('I', sorted(set(left).intersection(right)))
+    result = array('I')
+    low = 0
+    size = len(right)
+    for row in left:
+        low = bisect.bisect_left(right, row, low)
+        if low == size:
+            break
+        if right[low] == row:
+            result.append(row)
+    return result
+
+def union(lists: Iterable[array]) -> array: # Unión de varias listas de publicación ordenadas
+    """
+    Une varias listas ordenadas de filas sin repetir filas.
+
+    Args:
+        lists (Iterable[array]): Listas ordenadas de filas
+
+    Returns:
+        array: Filas presentes en alguna lista, ordenadas
+    """
+    lists = [postings for postings in lists if postings]
+    if len(lists) == 1:
+        return lists[0]
+    return array('I', sorted(set().union(*lists)))
+
+class TextIndex: # Índice invertido de palabras a filas
+    """
+    Índice invertido de las palabras de Title, Author y Contributors.
+
+    Las palabras se guardan ordenadas en vocabulary, lo que permite resolver
+    prefijos con búsqueda binaria, y las filas de cada palabra ocupan un tramo
+    contiguo de un único array('I') de publicaciones.
+
+    Attributes:
+        vocabulary (List[str]): Palabras distintas, ordenadas
+        offsets (array): Inicio del tramo de cada palabra en postings (más el final)
+        postings (array): Filas de todas las palabras, concatenadas
+        identifiers (List[str]): Identifier de cada fila, para mostrar resultados
+    """
+
+    def __init__(self, vocabulary: List[str], offsets: array, postings: array, identifiers: List[str]):
+        """
+        Crea el índice a partir de sus arreglos ya construidos.
+
+        Args:
+            vocabulary (List[str]): Palabras distintas, ordenadas
+            offsets (array): Inicio del tramo de cada palabra en postings, más el final
+            postings (array): Filas de todas las palabras, concatenadas
+            identifiers (List[str]): Identifier de cada fila
+        """
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = postings
+        self.identifiers = identifiers
+        self.positions = {token: number for number, token in enumerate(vocabulary)}
+
+    @classmethod
+    def build(cls, columns: Dict[str, List[str]], fields: Optional[List[str]] = None) -> 'TextIndex': # Construye el índice desde las columnas parseadas
+        """
+        Construye el índice desde las columnas que devuelve parse_content(columnar=True).
+
+        Como las filas se recorren en orden, cada lista de publicación queda
+        ordenada sin necesidad de ordenarla. Los textos repetidos (por ejemplo,
+        un mismo autor en muchas filas) se separan en palabras una sola vez.
+
+        Args:
+            columns (Dict[str, List[str]]): Valores crudos por columna
+            fields (Optional[List[str]]): Columnas a indexar (por defecto INDEXED_FIELDS)
+
+        Returns:
+            TextIndex: Índice construido
+        """
+        fields = INDEXED_FIELDS if fields is None else fields
+        rows: Dict[str, array] = {}
+        tokens_of: Dict[str, set] = {}
+        texts = zip(*(columns[field] for field in fields))
+        for row, values in enumerate(texts):
+            tokens = set()
+            for value in values:
+                if value:
+                    cached = tokens_of.get(value)
+                    if cached is None:
+                        cached = tokens_of[value] = set(tokenize(value))
+                    tokens |= cached
+            for token in tokens:
+                postings = rows.get(token)
+                if postings is None:
+                    postings = rows[token] = array('I')
+                postings.append(row)
+
+        vocabulary = sorted(rows)
+        offsets = array('Q', [0])
+        postings = array('I')
+        for token in vocabulary:
+            postings.extend(rows[token])
+            offsets.append(len(postings))
+        return cls(vocabulary, offsets, postings, list(columns['Identifier']))
+
+    def postings_for(self, token: str) -> array: # Lista de publicación de una palabra exacta
+        """
+        Devuelve las filas que contienen una palabra.
+
+        Args:
+            token (str): Palabra normalizada
+
+        Returns:
+            array: Filas ordenadas (vacío si la palabra no existe)
+        """
+        number = self.positions.get(token)
+        if number is None:
+            return array('I')
+        return self.postings[self.offsets[number]:self.offsets[number + 1]]
+
+    def postings_for_prefix(self, prefix: str) -> array: # Filas que contienen alguna palabra con un prefijo
+        """
+        Devuelve las filas que contienen alguna palabra que empieza con prefix.
+
+        Las palabras con un mismo prefijo son contiguas en el vocabulario
+        ordenado, así que se ubican con dos búsquedas binarias.
+
+        Args:
+            prefix (str): Prefijo normalizado
+
+        Returns:
+            array: Filas ordenadas, sin repetir
+        """
+        first = bisect.bisect_left(self.vocabulary, prefix)
+        last = bisect.bisect_left(self.vocabulary, prefix + '\U0010ffff', first)
+        return union(self.postings[self.offsets[number]:self.offsets[number + 1]] for number in range(first, last))
+
+    def _term(self, term: str) -> array: # Filas de un término de consulta (palabra o prefijo*)
+        """Resuelve un término: 'palabra' exacta o 'prefijo*'"""
+        if term.endswith('*'):
+            words = tokenize(term[:-1])
+            return self.postings_for_prefix(words[0]) if len(words) == 1 else array('I')
+        words = tokenize(term)
+        if not words:
+            return array('I')
+        # Un término que la normalización separa en varias palabras exige todas
+        result = self.postings_for(words[0])
+        for word in words[1:]:
+            result = intersect(result, self.postings_for(word))
+        return result
+
+    def search(self, query: str) -> List[int]: # Resuelve una consulta AND/OR/prefijo
+        """
+        Resuelve una consulta y devuelve las filas que la cumplen.
+
+        Sintaxis:
+        - Términos separados por espacios: deben aparecer todos (AND)
+        - OR en mayúsculas separa alternativas: basta con que se cumpla una
+        - Un término terminado en * busca palabras con ese prefijo
+
+        Por ejemplo, 'london novel* OR paris' devuelve las filas con 'london' y
+        alguna palabra que empiece con 'novel', más las filas con 'paris'. En
+        cada alternativa los términos se intersectan del menos frecuente al
+        más frecuente.
+
+        Args:
+            query (str): Consulta
+
+        Returns:
+            List[int]: Filas que cumplen la consulta, en orden ascendente
+        """
+        alternatives = []
+        for alternative in query.split(' OR '):
+            # Los términos repetidos no cambian el resultado
+            lists = sorted((self._term(term) for term in dict.fromkeys(alternative.split())), key=len)
+            if not lists:
+                continue
+            result = lists[0]
+            for postings in lists[1:]:
+                if not result:
+                    break
+                result = intersect(result, postings)
+            alternatives.append(result)
+        return list(union(alternatives)) if alternatives else []
+
+    def save(self, path: str): # Guarda el índice en disco
+        """
+        Guarda el índice en un archivo binario.
+
+        El archivo tiene una cabecera con los tamaños, el vocabulario como
+        texto UTF-8 separado por saltos de línea (las palabras no los
+        contienen), los Identifier UTF-8 concatenados con la posición final de
+        cada uno (un Identifier puede contener cualquier carácter), y los
+        arrays de offsets y publicaciones en binario. Se escribe en un
+        temporal que reemplaza al archivo con os.replace, así que un índice
+        anterior nunca queda a medio sobrescribir.
+
+        Args:
+            path (str): Ruta del archivo de índice
+        """
+        vocabulary = '\n'.join(self.vocabulary).encode('utf-8')
+        encoded = [identifier.encode('utf-8') for identifier in self.identifiers]
+        identifier_ends = array('Q')
+        end = 0
+        for identifier in encoded:
+            end += len(identifier)
+            identifier_ends.append(end)
+        temporary = path + '.tmp'
+        try:
+            with open(temporary, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, len(self.vocabulary), len(self.identifiers), len(vocabulary), end))
+                file.write(vocabulary)
+                file.write(b''.join(encoded))
+                identifier_ends.tofile(file)
+                self.offsets.tofile(file)
+                self.postings.tofile(file)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'TextIndex': # Carga un índice guardado con save
+        """
+        Carga un índice guardado con save.
+
+        Args:
+            path (str): Ruta del archivo de índice
+
+        Returns:
+            TextIndex: Índice cargado
+
+        Raises:
+            ValueError: Si el archivo no es un índice de texto
+        """
+        with open(path, 'rb') as file:
+            magic, words, rows, vocabulary_size, identifiers_size = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} no es un índice de texto")
+            vocabulary = file.read(vocabulary_size).decode('utf-8').split('\n') if words else []
+            identifier_bytes = file.read(identifiers_size)
+            identifier_ends = array('Q')
+            identifier_ends.fromfile(file, rows)
+            identifiers = [identifier_bytes[begin:end].decode('utf-8') for begin, end in zip([0, *identifier_ends], identifier_ends)]
+            offsets = array('Q')
+            offsets.fromfile(file, words + 1)
+            postings = array('I')
+            postings.fromfile(file, offsets[-1])
+        return cls(vocabulary, offsets, postings, identifiers)
@@ -0,0 +1,209 @@
+# Tokenizador CSV implementado como máquina de estado finito dirigida por tabla
+# Este módulo reemplaza el recorrido carácter por carácter de parse_line:
+# - Los estados y transiciones se definen en una tabla (ver docs/maquinas_estado/csv_tokenizer.md)
+# - Soporta comillas dobles escapadas según RFC 4180 ("" dentro de un campo entre comillas)
+# - Detecta los límites de registro en la misma pasada, de modo que un salto de
+#   línea dentro de comillas forma parte del valor y no corta el registro
+# - Los tramos de texto que no cambian de estado se procesan en bloque con
+#   operaciones en C (str.split), sin concatenar carácter por carácter
+# - Funciona igual sobre str o sobre bytes (por ejemplo, bloques de un archivo
+#   mapeado en memoria); con bytes los campos se devuelven sin decodificar
+
+from typing import AnyStr, Iterable, Iterator, List, Optional, Tuple
+
+# Estados de la máquina
+FIELD_START = 0   # Inicio de un campo: una comilla aquí abre un campo entre comillas
+UNQUOTED = 1      # Dentro de un campo sin comillas
+IN_QUOTES = 2     # Dentro de un campo entre comillas
+QUOTE_ESCAPE = 3  # Se leyó una comilla dentro de comillas: cierre o inicio de escape ""
+
+# Clases de símbolos del alfabeto
+OTHER = 0    # Cualquier carácter distinto de coma, comilla o salto de línea
+COMMA = 1    # Separador de campos
+QUOTE = 2    # Comilla doble
+NEWLINE = 3  # Separador de registros
+
+# Acciones asociadas a cada transición
+KEEP = 0     # El símbolo forma parte del valor del campo
+DROP = 1     # El símbolo es sintaxis CSV y no forma parte del valor
+EMIT = 2     # Fin de campo: se extrae el valor y empieza el siguiente
+RECORD = 3   # Fin de registro: se extrae el último valor y empieza un registro nuevo
+
+# Tabla de transiciones: TRANSITIONS[estado][clase] = (siguiente_estado, acción)
+TRANSITIONS = (
+    # FIELD_START: una comilla abre el campo entre comillas
+    ((UNQUOTED, KEEP), (FIELD_START, EMIT), (IN_QUOTES, DROP), (FIELD_START, RECORD)),
+    # UNQUOTED: una comilla a mitad de campo es texto literal
+    ((UNQUOTED, KEEP), (FIELD_START, EMIT), (UNQUOTED, KEEP), (FIELD_START, RECORD)),
+    # IN_QUOTES: las comas y los saltos de línea son texto; una comilla cierra o inicia un escape
+    ((IN_QUOTES, KEEP), (IN_QUOTES, KEEP), (QUOTE_ESCAPE, DROP), (IN_QUOTES, KEEP)),
+    # QUOTE_ESCAPE: "" produce una comilla literal; otro símbolo sigue fuera de comillas
+    ((UNQUOTED, KEEP), (FIELD_START, EMIT), (IN_QUOTES, KEEP), (FIELD_START, RECORD)),
+)
+
+# Columna de la tabla para el símbolo QUOTE, consultada en cada comilla
+QUOTE_TRANSITIONS = tuple(row[QUOTE] for row in TRANSITIONS)
+
+# Símbolos de sintaxis CSV para cada tipo de buffer: (comilla, coma, salto de línea, vacío)
+SYMBOLS = {
+    str: ('"', ',', '\n', ''),
+    bytes: (b'"', b',', b'\n', b''),
+}
+
+def split_records(buffer: AnyStr, final: bool = True, ends: Optional[List[int]] = None) -> Tuple[List[List[AnyStr]], int]: # Divide un buffer CSV en registros y campos en una sola pasada
+    """
+    Divide un buffer CSV en registros y campos recorriendo la máquina de estado.
+
+    La máquina solo consulta la tabla en cada comilla, que es el único símbolo
+    cuyo efecto depende de si se está dentro o fuera de comillas. Los tramos
+    entre comillas se procesan en bloque: dentro de comillas el tramo completo
+    (incluidos comas y saltos de línea) se conserva como valor; fuera de
+    comillas cada salto de línea es una transición RECORD y cada coma una
+    transición EMIT, así que el tramo se divide con str.split. El buffer se
+    recorre una sola vez y los límites de registro salen de esa misma pasada.
+
+    Una comilla solo abre un campo entre comillas si aparece al inicio del
+    campo; en cualquier otra posición fuera de comillas se conserva como texto.
+
+    Args:
+        buffer (AnyStr): Texto CSV con uno o más registros, como str o como
+            bytes codificados en UTF-8 (los campos se devuelven del mismo tipo)
+        final (bool): Si es True, el buffer llega hasta el final del archivo y el
+            último registro se emite aunque no termine en salto de línea (incluso
+            si tiene comillas sin cerrar). Si es False, el registro incompleto del
+            final se descarta para completarlo con el siguiente bloque
+        ends (Optional[List[int]]): Si se pasa una lista, se agrega la posición
+            final (siguiente al salto de línea) de cada registro devuelto
+
+    Returns:
+        Tuple[List[List[AnyStr]], int]: Tupla con (registros, consumido)
+        - registros: Lista de registros completos, cada uno como lista de valores
+        - consumido: Número de caracteres (o bytes) del buffer que cubren esos registros
+    """
+    quote, comma, newline, empty = SYMBOLS[type(buffer)]
+    records = []
+    consumed = 0   # Posición siguiente al último salto de línea que cerró un registro
+    position = 0   # Posición del segmento actual dentro del buffer
+    fields = []
+    pieces = []    # Fragmentos del valor del campo actual
+    state = FIELD_START
+
+    for number, segment in enumerate(buffer.split(quote)):
+        if number:
+            # Cada segmento, salvo el primero, viene precedido por una comilla
+            state, action = QUOTE_TRANSITIONS[state]
+            if action == KEEP:
+                pieces.append(quote)
+            position += 1
+        if not segment:
+            continue
+        if state == IN_QUOTES:
+            # Dentro de comillas todo el tramo pertenece al valor
+            pieces.append(segment)
+            position += len(segment)
+            continue
+
+        # Fuera de comillas: cada salto de línea termina un registro y cada
+        # coma termina un campo
+        position += len(segment)
+        if newline in segment:
+            lines = segment.split(newline)
+            if ends is not None:
+                end = position - len(segment)
+                for line in lines[:-1]:
+                    end += len(line) + 1
+                    ends.append(end)
+            segment = lines.pop()
+            line_end = position - len(segment)
+            for line in lines:
+                runs = line.split(comma)
+                pieces.append(runs[0])
+                if len(runs) > 1:
+                    fields.append(empty.join(pieces))
+                    fields.extend(runs[1:-1])
+                    pieces = [runs[-1]]
+                fields.append(empty.join(pieces))
+                records.append(fields)
+                fields = []
+                pieces = []
+            state = FIELD_START
+            consumed = line_end
+            if not segment:
+                continue
+        runs = segment.split(comma)
+        pieces.append(runs[0])
+        if len(runs) > 1:
+            fields.append(empty.join(pieces))
+            fields.extend(runs[1:-1])
+            tail = runs[-1]
+            pieces = [tail]
+            state = UNQUOTED if tail else FIELD_START
+        else:
+            state = TRANSITIONS[state][OTHER][0]
+
+    if final:
+        # Fin del archivo: el último registro termina sin importar el estado
+        if fields or pieces or state != FIELD_START:
+            fields.append(empty.join(pieces))
+            records.append(fields)
+            if ends is not None:
+                ends.append(len(buffer))
+        consumed = len(buffer)
+    return records, consumed
+
+def split_fields(record: AnyStr) -> List[AnyStr]: # Divide un registro CSV en campos usando la tabla de transiciones
+    """
+    Divide un único registro CSV en sus campos.
+
+    Es la misma máquina de split_records aplicada a un registro aislado. Si el
+    texto contiene saltos de línea fuera de comillas, solo se devuelve el
+    primer registro.
+
+    Args:
+        record (AnyStr): Registro CSV (sin el salto de línea final), como str o bytes
+
+    Returns:
+        List[AnyStr]: Valores de los campos, sin las comillas delimitadoras
+    """
+    quote, comma, newline, empty = SYMBOLS[type(record)]
+    if quote not in record and newline not in record:
+        # Sin comillas la máquina nunca sale de FIELD_START/UNQUOTED
+        return record.split(comma)
+    records, _ = split_records(record)
+    return records[0] if records else [empty]
+
+def iter_split_records(chunks: Iterable[AnyStr], ends: Optional[List[int]] = None, start: int = 0) -> Iterator[List[AnyStr]]: # Genera registros a partir de bloques de texto consecutivos
+    """
+    Genera los registros de un texto CSV que llega dividido en bloques.
+
+    Cada bloque se procesa con split_records; el registro incompleto del final
+    de un bloque se conserva y se completa con el bloque siguiente, por lo que
+    los límites de bloque pueden caer en cualquier posición (incluso dentro de
+    un campo entre comillas que contiene saltos de línea).
+
+    Args:
+        chunks (Iterable[AnyStr]): Bloques consecutivos del texto CSV (todos str o todos bytes)
+        ends (Optional[List[int]]): Si se pasa una lista, se agrega la posición
+            final de cada registro antes de generarlo
+        start (int): Posición del primer bloque dentro del texto completo, para
+            que las posiciones de ends sean absolutas
+
+    Yields:
+        List[AnyStr]: Valores de cada registro, en el orden del texto
+    """
+    pending = None
+    local = None if ends is None else []  # Posiciones relativas al buffer actual
+    for chunk in chunks:
+        buffer = chunk if pending is None else pending + chunk
+        records, consumed = split_records(buffer, False, local)
+        if local:
+            ends.extend([start + end for end in local])
+            local.clear()
+        start += consumed
+        yield from records
+        pending = buffer[consumed:]
+    if pending:
+        records, _ = split_records(pending, True, local)
+        if local:
+            ends.extend([start + end for end in local])
+        yield from records
@@ -1,13 +1,24 @@
 # Módulo de funciones auxiliares para limpieza y transformación de datos
 # Este módulo proporciona utilidades para:
 # - Limpieza y conversión de valores específicos por tipo de campo
+# - Limpieza vectorizada por columnas completas con operaciones .str de pandas
 # - Transformación de datos procesados a estructura pandas DataFrame
 # - Aplicación de tipos de datos apropiados según el contenido
-# - Guardado de resultados en formato CSV
+# - Tipos compactos: category para columnas repetitivas y enteros nulables mínimos
+# - Guardado de resultados en formato CSV o en formatos columnares binarios
+#   (Parquet y Feather/Arrow IPC) que conservan los tipos
+# - Escritura incremental del CSV por lotes con reemplazo atómico al terminar
+# pandas se importa dentro de las funciones que lo usan: importar este módulo
+# (por ejemplo, desde processors por clean_value) no debe cargarlo
 
-import re
-import pandas as pd
-from typing import Any, List, Dict
+import importlib.util
+import os
+from typing import TYPE_CHECKING, Any, List, Dict, Iterable, Optional, Union
+from config import CATEGORY_RATIO, OUTPUT_COMPRESSION, ROW_GROUP_SIZE, WRITE_BUFFER_SIZE
+from patterns import REGISTRY
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 def clean_value(header: str, value: str) -> Any: # Limpia y convierte valores según el tipo de campo específico
     """
@@ -36,7 +47,7 @@ def clean_value(header: str, value: str) -> Any: # Limpia y convierte valores se
         return int(value) if value.isdigit() else None
     elif header == 'Date of Publication':
         # Extraer año de 4 dígitos de formatos como [1892] o 1892-05-15
-        year_match = re.search(r'(\d{4})', value)
+        year_match = REGISTRY.year_search(value) # Patrón de año ya compilado en el registro
         return year_match.group(1) if year_match else None
     elif header == 'Flickr URL':
         # Validar que la URL comience con protocolo HTTP
@@ -45,29 +56,111 @@ def clean_value(header: str, value: str) -> Any: # Limpia y convierte valores se
         # Para otros campos, solo limpiar espacios en blanco
         return value.strip()
 
-def create_dataframe(headers: List[str], data: List[Dict]) -> pd.DataFrame: # Convierte los datos procesados a un DataFrame de pandas con tipos correctos
+# Valores que se consideran vacíos en cualquier columna
+EMPTY_VALUES = ['', 'nan']
+
+def clean_columns(df: 'pd.DataFrame') -> 'pd.DataFrame': # Limpia columnas completas de texto con operaciones vectorizadas
+    """
+    Aplica la limpieza de clean_value a columnas completas en lugar de celda por celda.
+    
+    Produce los mismos valores que clean_value, pero cada regla se evalúa una
+    sola vez sobre toda la columna con los métodos .str de pandas:
+    - Identifier: solo se conservan los valores compuestos únicamente por dígitos
+    - Date of Publication: extracción del año de 4 dígitos con el patrón compilado
+    - Flickr URL: solo se conservan los valores que empiezan con http
+    - Otros campos: los valores vacíos o 'nan' pasan a nulos
+    
+    Args:
+        df (pd.DataFrame): DataFrame con los valores crudos como texto (sin espacios extra)
+        
+    Returns:
+        pd.DataFrame: El mismo DataFrame con las columnas limpias
+    """
+    for header in df.columns:
+        column = df[header]
+        if header == 'Identifier':
+            # '' y 'nan' no son dígitos, así que también quedan nulos
+            df[header] = column.where(column.str.isdigit())
+        elif header == 'Date of Publication':
+            # Extraer año de 4 dígitos de formatos como [1892] o 1892-05-15
+            df[header] = column.str.extract(REGISTRY.year, expand=False)
+        elif header == 'Flickr URL':
+            # Validar que la URL comience con protocolo HTTP
+            df[header] = column.where(column.str.startswith('http'))
+        else:
+            df[header] = column.mask(column.isin(EMPTY_VALUES))
+    return df
+
+def compact_dtypes(df: 'pd.DataFrame', arrow_strings: bool = False) -> 'pd.DataFrame': # Convierte las columnas a las representaciones más compactas
+    """
+    Convierte cada columna a la representación más compacta que conserva sus valores.
+    
+    - Columnas enteras: el entero nulable más pequeño que admite su rango
+      (Int8, Int16, Int32 o Int64)
+    - Columnas de texto con pocos valores distintos (a lo sumo CATEGORY_RATIO
+      de las filas): dtype category, que guarda cada valor distinto una vez
+    - Resto de columnas de texto: opcionalmente cadenas respaldadas por Arrow
+    
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas ya limpias
+        arrow_strings (bool): Si es True, las columnas de texto que no pasan a
+            category se guardan como string[pyarrow] (requiere pyarrow)
+        
+    Returns:
+        pd.DataFrame: El mismo DataFrame con los tipos compactos
+    """
+    import pandas as pd
+    
+    if arrow_strings and importlib.util.find_spec('pyarrow') is None:
+        print("pyarrow no está instalado; se conservan las cadenas de pandas")
+        arrow_strings = False
+    
+    for header in df.columns:
+        column = df[header]
+        if pd.api.types.is_integer_dtype(column):
+            # downcast elige el menor tipo entero que admite el mínimo y el máximo
+            df[header] = pd.to_numeric(column.astype('Int64'), downcast='integer')
+        elif column.nunique() <= len(column) * CATEGORY_RATIO:
+            df[header] = column.astype('category')
+        elif arrow_strings:
+            df[header] = column.astype('string[pyarrow]')
+    return df
+
+def create_dataframe(headers: List[str], data: Union[List[Dict], Dict[str, List[str]]], compact: bool = True, arrow_strings: bool = False) -> 'pd.DataFrame': # Convierte los datos procesados a un DataFrame de pandas con tipos correctos
     """
     Convierte los datos procesados a un DataFrame de pandas con tipos correctos.
     
     Esta función:
-    - Crea un DataFrame a partir de la lista de diccionarios
+    - Crea un DataFrame a partir de los datos por filas o por columnas
+    - Limpia los valores por columnas completas (ver clean_columns)
     - Aplica conversiones de tipo apropiadas para cada columna
     - Maneja valores nulos de manera adecuada
     - Asegura tipos de datos consistentes para análisis posterior
+    - Reduce la memoria con tipos compactos (ver compact_dtypes)
     
     Args:
         headers (List[str]): Lista de nombres de columnas
-        data (List[Dict]): Lista de diccionarios, uno por cada fila de datos
+        data (Union[List[Dict], Dict[str, List[str]]]): Lista de diccionarios,
+            uno por cada fila, o diccionario encabezado -> valores, con los
+            valores crudos como texto (tal como los devuelve parse_content)
+        compact (bool): Si es True, aplica compact_dtypes al resultado. Sirve
+            para el DataFrame final o el que se guarda en un formato
+            columnar; los lotes que solo se escriben como CSV usan False
+        arrow_strings (bool): Si es True, usa cadenas respaldadas por Arrow en
+            las columnas de texto que no pasan a category
         
     Returns:
         pd.DataFrame: DataFrame con datos limpios y tipos apropiados
     """
-    # Crear DataFrame inicial con todos los datos
-    df = pd.DataFrame(data, columns=headers)
+    import pandas as pd
+    
+    # Crear DataFrame inicial con todos los datos y limpiar cada columna de una vez
+    df = clean_columns(pd.DataFrame(data, columns=headers))
     
     # Aplicar conversiones de tipo específicas
-    # Identifier: convertir a numérico, permitir NaN para valores inválidos
-    df['Identifier'] = pd.to_numeric(df['Identifier'], errors='coerce')
+    # Identifier: convertir a entero, Int64 para manejar valores inválidos como nulos
+    # (con float64 el formato del CSV dependería de si el lote tiene algún nulo)
+    df['Identifier'] = pd.to_numeric(df['Identifier'], errors='coerce').astype('Int64')
     
     # Date of Publication: convertir años a enteros, usar Int64 para manejar NaN
     df['Date of Publication'] = pd.to_numeric(
@@ -75,15 +168,169 @@ def create_dataframe(headers: List[str], data: List[Dict]) -> pd.DataFrame: # Co
         errors='coerce'
     ).astype('Int64')  # Int64 permite valores nulos en columnas de enteros
     
+    if compact:
+        df = compact_dtypes(df, arrow_strings)
     return df
 
-def save_results(df: pd.DataFrame, output_path: str): # Guarda el DataFrame procesado en un archivo CSV
+# Formatos de salida según la extensión del archivo
+OUTPUT_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+# Tipos fijos de las columnas enteras en Parquet y Feather: compact_dtypes
+# puede reducirlas en memoria (Int16 para el año), pero el esquema de los
+# archivos no debe depender del rango de valores de cada ejecución
+COLUMNAR_INTEGER_DTYPES = {
+    'Identifier': 'Int64',
+    'Date of Publication': 'Int64',
+}
+
+def detect_format(path: str, output_format: Optional[str] = None) -> str: # Determina el formato de salida a partir de la extensión
     """
-    Guarda el DataFrame procesado en un archivo CSV.
+    Determina el formato de un archivo de resultados.
+    
+    Args:
+        path (str): Ruta del archivo
+        output_format (Optional[str]): Formato explícito ('csv', 'parquet' o
+            'feather'); si es None se deduce de la extensión
+        
+    Returns:
+        str: Formato del archivo
+        
+    Raises:
+        ValueError: Si el formato no es soportado
+    """
+    if output_format is None:
+        output_format = OUTPUT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if output_format not in set(OUTPUT_FORMATS.values()):
+        raise ValueError(f"Formato de salida no soportado para {path}: {output_format}")
+    return output_format
+
+def _require_pyarrow(output_format: str): # Verifica que pyarrow esté disponible para los formatos columnares
+    """
+    Verifica que pyarrow esté instalado antes de usar Parquet o Feather.
+    
+    Args:
+        output_format (str): Formato que se va a usar (para el mensaje de error)
+        
+    Raises:
+        ImportError: Si pyarrow no está instalado
+    """
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError(f"El formato {output_format} requiere pyarrow (pip install pyarrow)")
+
+def save_results(df: 'pd.DataFrame', output_path: str, output_format: Optional[str] = None, compression: Optional[str] = OUTPUT_COMPRESSION): # Guarda el DataFrame procesado en CSV, Parquet o Feather
+    """
+    Guarda el DataFrame procesado en un archivo CSV, Parquet o Feather.
+    
+    Los formatos columnares guardan los tipos junto con los datos (enteros
+    nulables Int64 fijados en COLUMNAR_INTEGER_DTYPES y columnas category), así que al recargarlos con
+    load_results no hay que volver a parsear texto ni inferir tipos:
+    - Parquet: comprimido por columnas y dividido en grupos de ROW_GROUP_SIZE
+      filas, de modo que los lectores pueden leer el archivo por partes
+    - Feather (Arrow IPC): el formato en memoria de Arrow escrito a disco, en
+      lotes de ROW_GROUP_SIZE filas; es el más rápido de recargar
     
     Args:
         df (pd.DataFrame): DataFrame con datos procesados
-        output_path (str): Ruta donde guardar el archivo CSV resultante
+        output_path (str): Ruta donde guardar el archivo resultante
+        output_format (Optional[str]): 'csv', 'parquet' o 'feather'; si es None
+            se deduce de la extensión de output_path
+        compression (Optional[str]): Compresión de los formatos columnares
+            ('zstd', 'lz4', 'snappy' solo Parquet, o None); el CSV no se comprime
+            
+    Raises:
+        ValueError: Si el formato no es soportado
+        ImportError: Si el formato requiere pyarrow y no está instalado
     """
-    # Guardar sin incluir el índice de pandas en el archivo
-    df.to_csv(output_path, index=False)
\ No newline at end of file
+    output_format = detect_format(output_path, output_format)
+    if output_format == 'csv':
+        # Guardar sin incluir el índice de pandas en el archivo
+        df.to_csv(output_path, index=False)
+        return
+    
+    _require_pyarrow(output_format)
+    df = df.astype({header: dtype for header, dtype in COLUMNAR_INTEGER_DTYPES.items() if header in df.columns})
+    if output_format == 'parquet':
+        df.to_parquet(output_path, engine='pyarrow', index=False,
+                      compression=compression, row_group_size=ROW_GROUP_SIZE)
+    else:
+        # Feather no guarda el índice; se descarta para que sea un RangeIndex
+        df.reset_index(drop=True).to_feather(output_path, compression=compression,
+                                             chunksize=ROW_GROUP_SIZE)
+
+def write_csv_stream(headers: List[str], batches: Iterable[Dict[str, List[str]]], output_path: str) -> int: # Escribe el CSV de salida lote por lote
+    """
+    Escribe el CSV de salida de forma incremental, sin construir el DataFrame completo.
+    
+    Cada lote de valores crudos se limpia con create_dataframe (sin
+    compact_dtypes, que no cambia el CSV y costaría en cada lote) y se agrega al
+    archivo en cuanto llega, a través de un buffer de WRITE_BUFFER_SIZE bytes.
+    Las filas se escriben en un archivo temporal junto a output_path que
+    reemplaza al destino con os.replace solo al terminar, así que el archivo
+    de salida nunca queda a medio escribir. Si ocurre un error, el temporal se
+    elimina y el archivo anterior se conserva.
+    
+    El contenido es idéntico al de save_results con el DataFrame completo,
+    porque la limpieza de cada valor no depende del resto de filas y los
+    enteros usan tipos nulables en todos los lotes.
+    
+    Args:
+        headers (List[str]): Lista de nombres de columnas
+        batches (Iterable[Dict[str, List[str]]]): Lotes de valores por columna
+            (por ejemplo, los de processors.iter_batches)
+        output_path (str): Ruta del archivo CSV resultante
+        
+    Returns:
+        int: Número de filas escritas
+    """
+    import pandas as pd
+    
+    temporary = output_path + '.tmp'
+    rows = 0
+    try:
+        with open(temporary, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as file:
+            # La fila de encabezados se escribe con las mismas reglas de comillas que los datos
+            pd.DataFrame(columns=headers).to_csv(file, index=False)
+            for batch in batches:
+                df = create_dataframe(headers, batch, compact=False) # Cada lote solo se escribe como CSV
+                df.to_csv(file, index=False, header=False)
+                rows += len(df)
+        os.replace(temporary, output_path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return rows
+
+def load_results(path: str, output_format: Optional[str] = None) -> 'pd.DataFrame': # Carga un archivo de resultados guardado con save_results
+    """
+    Carga un archivo de resultados guardado con save_results.
+    
+    En Parquet y Feather los tipos vienen guardados en el archivo, así que la
+    carga no parsea texto. El CSV se carga con pandas y sus tipos se infieren.
+    
+    Args:
+        path (str): Ruta del archivo de resultados
+        output_format (Optional[str]): Formato del archivo; si es None se deduce
+            de la extensión
+        
+    Returns:
+        pd.DataFrame: DataFrame con los resultados
+        
+    Raises:
+        ValueError: Si el formato no es soportado
+        ImportError: Si el formato requiere pyarrow y no está instalado
+    """
+    import pandas as pd
+    
+    output_format = detect_format(path, output_format)
+    if output_format == 'csv':
+        return pd.read_csv(path)
+    _require_pyarrow(output_format)
+    if output_format == 'parquet':
+        return pd.read_parquet(path, engine='pyarrow')
+    return pd.read_feather(path)
@@ -3,9 +3,146 @@
 # - Ejecutar pruebas automáticas de todos los patrones definidos
 # - Validar que las expresiones regulares funcionen correctamente
 # - Detectar patrones que no coinciden con sus ejemplos de prueba
+# - Validar cada campo de cada fila contra el patrón de su columna
+# - Limitar el tiempo de validación de campos patológicos (retroceso catastrófico)
 
-import re
+import signal
+import threading
+import time
+from contextlib import nullcontext
+from functools import partial
+from typing import Callable, Dict, List, Optional
 import patterns
+from config import FIELD_TIME_BUDGET
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - versiones anteriores de Python
+    import sre_parse
+
+def _accepts_any_value(pattern: str) -> bool: # Determina si un patrón coincide con cualquier valor
+    """
+    Determina de forma estructural si un patrón coincide con cualquier valor.
+    
+    Reconoce la forma ^([^c]*?)(?=c|$) (con o sin grupo, perezosa o codiciosa)
+    usada por la mayoría de las columnas de texto libre: la repetición puede
+    detenerse justo antes del primer carácter c o al final del valor, así que
+    re.match siempre encuentra una coincidencia y evaluarla no aporta nada.
+    
+    Args:
+        pattern (str): Expresión regular a analizar
+        
+    Returns:
+        bool: True si se puede garantizar que el patrón acepta cualquier valor
+    """
+    items = list(sre_parse.parse(pattern))
+    if items and items[0] == (sre_parse.AT, sre_parse.AT_BEGINNING):
+        items = items[1:]
+    if len(items) != 2 or items[1][0] is not sre_parse.ASSERT:
+        return False
+    body, assertion = items
+    direction, lookahead = assertion[1]
+    if body[0] is sre_parse.SUBPATTERN:
+        group = list(body[1][3])
+        if len(group) != 1:
+            return False
+        body = group[0]
+    if body[0] not in (sre_parse.MIN_REPEAT, sre_parse.MAX_REPEAT):
+        return False
+    low, _, repeated = body[1]
+    repeated = list(repeated)
+    if low != 0 or len(repeated) != 1 or repeated[0][0] is not sre_parse.NOT_LITERAL:
+        return False
+    stop = repeated[0][1]
+    # El lookahead debe ser exactamente (?=c|$) con el mismo carácter c
+    lookahead = list(lookahead)
+    if direction != 1 or len(lookahead) != 1 or lookahead[0][0] is not sre_parse.BRANCH:
+        return False
+    branches = sorted((list(branch) for branch in lookahead[0][1][1]), key=str)
+    return branches == sorted(([(sre_parse.LITERAL, stop)], [(sre_parse.AT, sre_parse.AT_END)]), key=str)
+
+# Función de validación por campo; None indica que el patrón acepta cualquier valor
+FIELD_CHECKS: Dict[str, Optional[Callable]] = {
+    field: None if _accepts_any_value(source) else patterns.REGISTRY.match[field]
+    for field, source in patterns.REGISTRY.sources.items()
+}
+
+class FieldTimeout(Exception): # Señal de que una validación superó su tiempo
+    """Se lanza desde el temporizador cuando la validación de un campo supera su presupuesto de tiempo"""
+
+def _raise_timeout(signum, frame): # Manejador de SIGALRM para el presupuesto de tiempo
+    raise FieldTimeout()
+
+class _FieldTimer: # Temporizador de SIGALRM para validar campos con presupuesto de tiempo
+    """
+    Contexto que instala el manejador de FieldTimeout una sola vez y permite
+    evaluar muchos valores con run, cada uno con su propio temporizador.
+
+    Al salir restaura el manejador de SIGALRM y el temporizador que había
+    antes (con el tiempo que ya transcurrió descontado), así que no pisa un
+    SIGALRM que use el programa que llama. SIGALRM solo se puede manejar
+    desde el hilo principal, así que fuera de él se niega a funcionar.
+    """
+    def __enter__(self):
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("La validación con límite de tiempo usa SIGALRM y solo puede ejecutarse en el hilo principal")
+        self.previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        self.previous_timer = signal.setitimer(signal.ITIMER_REAL, 0)
+        self.start = time.monotonic()
+        return self
+
+    def run(self, check: Callable, value: str, field: str, budget: float = FIELD_TIME_BUDGET) -> Optional[bool]: # Evalúa un valor con presupuesto de tiempo
+        """Igual que guarded_match, dentro del contexto ya instalado"""
+        try:
+            signal.setitimer(signal.ITIMER_REAL, budget)
+            try:
+                return True if check(value) is not None else None
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except FieldTimeout:
+            print(f"ADVERTENCIA: Se omitió la validación de un valor de '{field}' de {len(value)} caracteres por superar {budget} s")
+            return None
+
+    def __exit__(self, *exc_info):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self.previous_handler if self.previous_handler is not None else signal.SIG_DFL)
+        delay, interval = self.previous_timer
+        if delay:
+            # Si el temporizador anterior ya debía vencer, vence de inmediato
+            signal.setitimer(signal.ITIMER_REAL, max(delay - (time.monotonic() - self.start), 1e-6), interval)
+        return False
+
+def guarded_match(check: Callable, value: str, field: str, budget: float = FIELD_TIME_BUDGET) -> Optional[bool]: # Valida un campo con un presupuesto de tiempo
+    """
+    Evalúa el patrón de un campo sobre un valor sin exceder un tiempo máximo.
+    
+    El motor re revisa las señales pendientes mientras retrocede, así que un
+    temporizador (setitimer + SIGALRM) interrumpe una coincidencia patológica
+    en lugar de bloquear todo el procesamiento. En Windows, que no tiene
+    setitimer, la coincidencia se evalúa completa y solo se informa si superó
+    el presupuesto.
+    
+    Args:
+        check (Callable): Método match del patrón compilado
+        value (str): Valor a validar
+        field (str): Nombre de la columna, para el aviso
+        budget (float): Tiempo máximo en segundos
+        
+    Returns:
+        Optional[bool]: True si el valor coincide, None si no coincide o si
+        se omitió por superar el presupuesto (compatible con check(value) is not None)
+    
+    Raises:
+        RuntimeError: Si se llama fuera del hilo principal
+    """
+    if not hasattr(signal, 'setitimer'):
+        start = time.perf_counter()
+        accepted = check(value) is not None
+        if time.perf_counter() - start > budget:
+            print(f"ADVERTENCIA: La validación de '{field}' tardó {time.perf_counter() - start:.2f} s (valor de {len(value)} caracteres)")
+        return True if accepted else None
+    with _FieldTimer() as timer:
+        return timer.run(check, value, field, budget)
 
 def test_patterns(): # Ejecuta pruebas de validación automática para todos los patrones regex definidos
     """
@@ -30,13 +167,15 @@ def test_patterns(): # Ejecuta pruebas de validación automática para todos los
         pattern = config['pattern']
         valid = config['example_valid']
         invalid = config['example_invalid']
+        # Usar el patrón ya compilado del registro
+        match = patterns.REGISTRY.match[field]
         
         # Probar que el ejemplo válido sea aceptado por el patrón
-        valid_match = re.match(pattern, valid)
+        valid_match = match(valid)
         valid_result = valid_match is not None
         
         # Probar que el ejemplo inválido sea rechazado por el patrón
-        invalid_match = re.match(pattern, invalid) if invalid else None
+        invalid_match = match(invalid) if invalid else None
         invalid_result = invalid_match is None if invalid else True
         
         # Almacenar resultados de las pruebas
@@ -52,4 +191,64 @@ def test_patterns(): # Ejecuta pruebas de validación automática para todos los
         if not invalid_result:
             print(f"ADVERTENCIA: Patrón para '{field}' coincide con ejemplo inválido: {invalid}")
     
-    return results
\ No newline at end of file
+    return results
+
+def validate_columns(headers: List[str], columns: List[List[str]]) -> List[List[bool]]: # Valida cada columna completa contra su patrón
+    """
+    Valida todos los valores de cada columna contra el patrón de esa columna.
+    
+    La validación se hace por columnas y no por fila y campo para que sea barata:
+    - Las columnas cuyo patrón acepta cualquier valor (ver _accepts_any_value)
+      no se evalúan
+    - En las demás, si la columna tiene muchos valores repetidos el patrón solo
+      se evalúa una vez por valor distinto, y si no, strip, match y bool se
+      encadenan con map para que el ciclo por valor ocurra en C
+    - Donde existe setitimer, cada valor se evalúa con su propio temporizador
+      (sin importar su largo, porque un valor corto también puede provocar
+      retroceso catastrófico): el que supera FIELD_TIME_BUDGET se informa y
+      se marca como rechazado en lugar de detener el procesamiento
+    Las columnas sin patrón definido se consideran siempre válidas.
+    
+    Args:
+        headers (List[str]): Nombres de las columnas
+        columns (List[List[str]]): Valores crudos de cada columna, en el orden de headers
+        
+    Returns:
+        List[List[bool]]: Por cada columna, una bandera por fila indicando si el
+        valor (sin espacios extremos) fue aceptado por el patrón
+    
+    Raises:
+        RuntimeError: Si se llama fuera del hilo principal (ver _FieldTimer)
+    """
+    with _FieldTimer() if hasattr(signal, 'setitimer') else nullcontext() as timer:
+        rows = len(columns[0]) if columns else 0
+        return [_validate_column(header, column, rows, timer) for header, column in zip(headers, columns)]
+
+def _validate_column(header: str, column: List[str], rows: int, timer: Optional[_FieldTimer]) -> List[bool]: # Valida una columna contra su patrón
+    """Banderas de una columna de validate_columns; con timer cada valor se evalúa con presupuesto de tiempo"""
+    check = FIELD_CHECKS.get(header)
+    if check is None:
+        return [True] * rows
+    if timer is not None:
+        check = partial(timer.run, check, field=header)
+    distinct = set(column)
+    if len(distinct) * 2 < len(column):
+        # Columna repetitiva: evaluar solo los valores distintos
+        accepted = {value: check(value.strip()) is not None for value in distinct}
+        return list(map(accepted.__getitem__, column))
+    # Columna casi única: encadenar strip, match y bool sin ciclos en Python
+    return list(map(bool, map(check, map(str.strip, column))))
+
+def count_rejections(headers: List[str], row_flags: List[tuple]) -> Dict[str, int]: # Cuenta los valores rechazados por columna
+    """
+    Cuenta cuántos valores rechazó el patrón de cada columna.
+    
+    Args:
+        headers (List[str]): Nombres de las columnas
+        row_flags (List[tuple]): Banderas por fila, como las llena parse_content
+        
+    Returns:
+        Dict[str, int]: Número de valores rechazados por columna
+    """
+    columns = list(zip(*row_flags)) if row_flags else [()] * len(headers)
+    return {header: column.count(False) for header, column in zip(headers, columns)}
\ No newline at end of file
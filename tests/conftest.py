@@ -0,0 +1,72 @@
+# Configuración común de las pruebas
+# Agrega src al path (como los benchmarks) y genera los archivos de prueba:
+# un recorte del dataset real con datos sucios (Identifier inválidos o
+# vacíos, registros con más o menos campos y campos con comillas escapadas y
+# saltos de línea), y la salida de referencia del procesamiento con el
+# DataFrame completo, contra la que se comparan los demás modos
+
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from config import DATA_PATH
+from processors import load_file, next_record_start, parse_content
+from utils import create_dataframe, save_results
+
+SAMPLE_RECORDS = 1500 # Registros del dataset que se copian al archivo de prueba
+
+# Registros agregados al final del recorte
+DIRTY_RECORDS = (
+    b',,London,1901,Publisher,Sin Identifier,,,,,,,monographic,http://www.flickr.com/x,Shelf\n'
+    b'12x,,Paris,[1850?],"Smith, ""Jr.""","Linea 1\nLinea 2",,,,,,,serial,ftp://nada,Shelf\n'
+    b'999,solo,tres campos\n'
+    b'1000,,Berlin,1790,P,T,A,C,,,,,monographic,http://www.flickr.com/y,S,sobra,otra\n'
+)
+
+def write_dirty_csv(path: str, records: int = SAMPLE_RECORDS) -> str: # Recorte del dataset con datos sucios
+    """
+    Escribe los encabezados y los primeros registros del dataset con datos sucios.
+
+    El Identifier del primer registro pasa a ser X206 (no numérico), así que
+    solo los lotes que lo contienen tienen un Identifier nulo, y al final se
+    agregan los registros de DIRTY_RECORDS.
+
+    Returns:
+        str: La misma ruta
+    """
+    content = load_file(DATA_PATH, mapped=True)
+    try:
+        end = 0
+        for _ in range(records + 1):
+            end = next_record_start(content, end)
+        sample = content[:end]
+    finally:
+        content.close()
+    header_end = sample.index(b'\n') + 1
+    assert sample[header_end:].startswith(b'000000206,')
+    sample = sample[:header_end] + b'X206' + sample[header_end + len(b'000000206'):]
+    with open(path, 'wb') as file:
+        file.write(sample + DIRTY_RECORDS)
+    return path
+
+def write_reference(data_path: str, output_path: str) -> str: # Salida de referencia con el DataFrame completo
+    """Procesa el archivo completo en memoria (el modo por defecto de main) y guarda el CSV"""
+    headers, data = parse_content(load_file(data_path), columnar=True)
+    save_results(create_dataframe(headers, data), output_path)
+    return output_path
+
+def read_bytes(path: str) -> bytes: # Contenido de un archivo
+    with open(path, 'rb') as file:
+        return file.read()
+
+@pytest.fixture
+def dirty_csv(tmp_path) -> str:
+    """Ruta de un recorte del dataset con datos sucios"""
+    return write_dirty_csv(str(tmp_path / 'dirty.csv'))
+
+@pytest.fixture
+def reference(dirty_csv, tmp_path) -> bytes:
+    """Contenido de la salida de referencia de dirty_csv"""
+    return read_bytes(write_reference(dirty_csv, str(tmp_path / 'reference.csv')))
@@ -0,0 +1,22 @@
+# Pruebas del pipeline por etapas superpuestas
+
+import pytest
+from conftest import read_bytes
+from processors import iter_records
+from async_pipeline import record_boundary, run_pipeline
+
+def test_record_boundary_skips_quoted_newlines():
+    assert record_boundary(b'1,a\n2,"b\nc') == 4
+    assert record_boundary(b'1,"a\nb"\n2,c') == 8
+    assert record_boundary(b'1,"a\nb') == 0
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_pipeline_matches_sequential_run(dirty_csv, reference, tmp_path, workers):
+    output_path = str(tmp_path / 'pipeline.csv')
+    records = iter_records(dirty_csv)
+    headers = [h.strip() for h in next(records)]
+    records.close()
+    errors = {}
+    run_pipeline(dirty_csv, headers, output_path, workers=workers, errors=errors, block_size=8192)
+    assert read_bytes(output_path) == reference
+    assert errors['malformed_records'] == 2
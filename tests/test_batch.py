@@ -0,0 +1,38 @@
+# Pruebas de la ingesta de varios archivos
+
+import argparse
+import os
+import pytest
+from conftest import read_bytes, write_dirty_csv, write_reference
+from batch import expand_inputs, ingest_files
+from main import INPUT_UNSUPPORTED, input_conflicts
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Dos recortes con datos sucios de distinto tamaño en un directorio"""
+    directory = tmp_path / 'inputs'
+    directory.mkdir()
+    return [write_dirty_csv(str(directory / 'a.csv'), records=40), write_dirty_csv(str(directory / 'b.csv'))]
+
+@pytest.mark.parametrize('task_size', [8192, 64 * 1024, 1024 * 1024])
+def test_partitioned_outputs_match_single_runs(inputs, tmp_path, task_size):
+    output_dir = str(tmp_path / 'parts')
+    summary = ingest_files(expand_inputs([os.path.dirname(inputs[0])]), output_dir=output_dir, task_size=task_size)
+    assert summary['skipped'] == [] and summary['files'] == 2
+    for path in inputs:
+        expected = read_bytes(write_reference(path, str(tmp_path / 'reference.csv')))
+        assert read_bytes(os.path.join(output_dir, os.path.basename(path))) == expected
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_concatenated_output_matches_single_runs(inputs, tmp_path, workers):
+    output_path = str(tmp_path / 'all.csv')
+    ingest_files(inputs, output_path=output_path, workers=workers, task_size=4096)
+    parts = [read_bytes(write_reference(path, str(tmp_path / 'reference.csv'))) for path in inputs]
+    assert read_bytes(output_path) == parts[0] + parts[1].partition(b'\n')[2]
+
+def test_input_rejects_single_file_options():
+    defaults = dict.fromkeys(INPUT_UNSUPPORTED, None)
+    assert input_conflicts(argparse.Namespace(**defaults, format='csv')) == []
+    options = dict(defaults, validate_fields=True, dfa=True, quarantine='q.jsonl', index=True, text_index=True)
+    assert input_conflicts(argparse.Namespace(**options, format='parquet')) == [
+        '--validate-fields', '--dfa', '--index', '--text-index', '--quarantine', '--format parquet']
@@ -0,0 +1,43 @@
+# Pruebas de la caché persistente de resultados
+
+import inspect
+import os
+import pytest
+import cache
+import patterns
+import processors
+import tokenizer
+import utils
+from conftest import read_bytes
+from cache import RULE_MODULES, cache_key, load_cached_dataframe
+from utils import save_results
+
+def test_rules_hash_covers_parsing_and_cleaning_code():
+    for function in (tokenizer.split_fields, tokenizer.iter_split_records, processors.parse_content,
+                     processors._parse_records, processors._extend_columns, utils.clean_columns, utils.create_dataframe):
+        assert inspect.getmodule(function) in RULE_MODULES
+    assert patterns in RULE_MODULES
+
+def test_cached_dataframe_matches_full_run(dirty_csv, reference, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    first = load_cached_dataframe(dirty_csv, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    second = load_cached_dataframe(dirty_csv, cache_dir=cache_dir)
+    for number, df in enumerate((first, second)):
+        output_path = str(tmp_path / f"cached{number}.csv")
+        save_results(df, output_path)
+        assert read_bytes(output_path) == reference
+
+def test_warm_key_reads_only_head_and_tail(dirty_csv, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    load_cached_dataframe(dirty_csv, cache_dir=cache_dir)
+    monkeypatch.setattr(cache, 'load_file', lambda *args, **kwargs: pytest.fail('la clave no debe mapear el archivo'))
+    monkeypatch.setattr(cache, 'FINGERPRINT_BYTES', 1024)
+    before = cache_key(dirty_csv)
+    stat = os.stat(dirty_csv)
+    with open(dirty_csv, 'r+b') as file:
+        file.seek(-10, 2)
+        file.write(b'Z')
+    # Mismo tamaño y misma fecha: solo el hash del final detecta el cambio
+    os.utime(dirty_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache_key(dirty_csv) != before
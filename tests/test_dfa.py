@@ -0,0 +1,28 @@
+# Pruebas del autómata de fila contra la validación con re
+
+import pytest
+from conftest import write_dirty_csv
+from config import DATA_PATH
+from dfa import RowAutomaton
+from patterns import REGISTRY
+from processors import load_file, parse_content
+from validators import validate_columns
+
+@pytest.mark.parametrize('source', ['dataset', 'dirty'])
+def test_row_automaton_matches_validate_columns(source, tmp_path):
+    path = DATA_PATH if source == 'dataset' else write_dirty_csv(str(tmp_path / 'dirty.csv'))
+    headers, data = parse_content(load_file(path), columnar=True)
+    columns = [data[header] for header in headers]
+    assert RowAutomaton(headers, REGISTRY.sources).validate_columns(columns) == validate_columns(headers, columns)
+
+def test_row_automaton_matches_re_on_edge_values():
+    headers = list(REGISTRY.sources)
+    values = {
+        'Identifier': ['206', ' 206 ', 'X206', '', '12a'],
+        'Date of Publication': ['1879', '[1878]', '18--', '', 'c. 1890'],
+        'Flickr URL': ['http://www.flickr.com/x', 'https://flickr.com', 'ftp://flickr.com', 'http://example.com', ''],
+        'Issuance type': ['monographic', 'serial', 'serials', 'Monographic', ''],
+    }
+    rows = 5
+    columns = [values.get(header, ['texto, libre', '', '"', '\x1f', 'ü'])[:rows] for header in headers]
+    assert RowAutomaton(headers, REGISTRY.sources).validate_columns(columns) == validate_columns(headers, columns)
@@ -0,0 +1,45 @@
+# Pruebas del reprocesamiento incremental
+
+import os
+import incremental
+from conftest import read_bytes, write_reference
+from incremental import process_incremental
+
+def test_incremental_matches_full_run(dirty_csv, reference, tmp_path):
+    output_path = str(tmp_path / 'out.csv')
+    _, reused, processed, _ = process_incremental(dirty_csv, output_path, chunk_size=32 * 1024)
+    assert reused == 0 and processed > 1
+    assert read_bytes(output_path) == reference
+
+def test_incremental_after_changes_matches_full_run(dirty_csv, tmp_path):
+    output_path = str(tmp_path / 'out.csv')
+    process_incremental(dirty_csv, output_path, chunk_size=32 * 1024)
+    content = read_bytes(dirty_csv)
+    # Un Identifier inválido en la mitad del archivo y registros agregados al final
+    middle = content.index(b'\n000', len(content) // 2) + 1
+    changed = content[:middle] + b'Y' + content[middle + 1:] + b'77,,Madrid,1900,,,,,,,,,serial,http://a,\n'
+    with open(dirty_csv, 'wb') as file:
+        file.write(changed)
+    _, reused, processed, _ = process_incremental(dirty_csv, output_path, chunk_size=32 * 1024)
+    assert reused > 0 and processed > 0
+    assert read_bytes(output_path) == read_bytes(write_reference(dirty_csv, str(tmp_path / 'reference.csv')))
+
+def test_rules_change_invalidates_manifest(dirty_csv, reference, tmp_path, monkeypatch):
+    output_path = str(tmp_path / 'out.csv')
+    process_incremental(dirty_csv, output_path, chunk_size=32 * 1024)
+    monkeypatch.setattr(incremental, 'rules_hash', lambda: 'otras reglas')
+    _, reused, _, _ = process_incremental(dirty_csv, output_path, chunk_size=32 * 1024)
+    assert reused == 0
+    assert read_bytes(output_path) == reference
+
+def test_rewritten_output_invalidates_manifest(dirty_csv, reference, tmp_path):
+    output_path = str(tmp_path / 'out.csv')
+    process_incremental(dirty_csv, output_path, chunk_size=32 * 1024)
+    stat = os.stat(output_path)
+    # Otro modo reescribe la salida con el mismo tamaño (la fecha se fija para no depender de la resolución del reloj)
+    with open(output_path, 'r+b') as file:
+        file.write(b'X')
+    os.utime(output_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    _, reused, _, _ = process_incremental(dirty_csv, output_path, chunk_size=32 * 1024)
+    assert reused == 0
+    assert read_bytes(output_path) == reference
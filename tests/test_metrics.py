@@ -0,0 +1,42 @@
+# Pruebas de las métricas por etapa
+
+import json
+import pytest
+from metrics import PipelineMetrics
+
+def test_stages_counters_and_exports(tmp_path):
+    metrics = PipelineMetrics()
+    with metrics.stage('parse_content') as stage:
+        stage.rows, stage.bytes = 10, 1000
+    with pytest.raises(ValueError):
+        with metrics.stage('save_results'):
+            raise ValueError('disco lleno')
+    metrics.count('malformed_records', 2)
+    metrics.write_json(str(tmp_path / 'metrics.json'))
+    metrics.write_prometheus(str(tmp_path / 'metrics.prom'))
+
+    with open(tmp_path / 'metrics.json', encoding='utf-8') as file:
+        report = json.load(file)
+    assert report['status'] == 'error'
+    assert [stage['name'] for stage in report['stages']] == ['parse_content', 'save_results']
+    assert report['stages'][0]['rows'] == 10 and report['stages'][1]['error'] == 'disco lleno'
+    assert report['counters'] == {'malformed_records': 2}
+    text = (tmp_path / 'metrics.prom').read_text(encoding='utf-8')
+    assert 'bl_pipeline_stage_rows{stage="parse_content"} 10.0' in text
+    assert 'bl_pipeline_stage_failed{stage="save_results"} 1.0' in text
+    assert 'bl_pipeline_errors{kind="malformed_records"} 2.0' in text
+
+def test_stage_memory_is_current_and_per_stage():
+    metrics = PipelineMetrics()
+    with metrics.stage('reservar') as stage:
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b'x' * len(block[::4096])
+    with metrics.stage('liberar'):
+        del block
+    report = metrics.to_dict()
+    grow, release = report['stages']
+    if grow['rss_bytes'] is None:
+        pytest.skip('el sistema no informa la memoria residente actual')
+    assert grow['rss_delta_bytes'] > 32 * 1024 * 1024
+    assert release['rss_delta_bytes'] < -32 * 1024 * 1024
+    assert release['rss_bytes'] < release['process_peak_rss_bytes']
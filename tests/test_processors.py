@@ -0,0 +1,50 @@
+# Pruebas de los modos de parsing de processors contra la lectura del archivo completo
+
+import pytest
+from conftest import SAMPLE_RECORDS
+from processors import load_file, iter_records, parse_content, iter_batches
+
+def parse(content, **options):
+    """parse_content por columnas con banderas de validación y contador de errores"""
+    flags, errors = [], {}
+    headers, data = parse_content(content, field_flags=flags, columnar=True, errors=errors, **options)
+    return headers, data, flags, errors
+
+def test_malformed_records_are_padded_and_counted(dirty_csv):
+    headers, data, _, errors = parse(load_file(dirty_csv))
+    assert errors == {'malformed_records': 2}
+    assert len(data['Identifier']) == SAMPLE_RECORDS + 4
+    assert data['Identifier'][-2:] == ['999', '1000']
+    assert data['Place of Publication'][-2] == 'tres campos' and data['Shelfmarks'][-2] == ''
+    assert data['Identifier'][-3] == '12x' and data['Title'][-3] == 'Linea 1\nLinea 2'
+    assert data['Publisher'][-3] == 'Smith, "Jr."'
+
+@pytest.mark.parametrize('chunk_size', [64, 4096])
+def test_iter_records_matches_whole_file(dirty_csv, chunk_size):
+    expected = parse(load_file(dirty_csv))
+    assert parse(iter_records(dirty_csv, chunk_size=chunk_size)) == expected
+
+@pytest.mark.parametrize('mapped', [False, True])
+@pytest.mark.parametrize('workers', [2, 3])
+def test_parallel_matches_sequential(dirty_csv, mapped, workers):
+    expected = parse(load_file(dirty_csv))
+    assert parse(load_file(dirty_csv, mapped=mapped), workers=workers, file_path=dirty_csv if mapped else None) == expected
+
+def test_mapped_matches_text(dirty_csv):
+    assert parse(load_file(dirty_csv, mapped=True)) == parse(load_file(dirty_csv))
+
+def test_iter_batches_matches_parse_content(dirty_csv):
+    headers, data, flags, errors = parse(load_file(dirty_csv))
+    records = iter_records(dirty_csv)
+    next(records)
+    batch_flags, batch_errors = [], {}
+    columns = {header: [] for header in headers}
+    for batch in iter_batches(records, headers, batch_size=100, field_flags=batch_flags, errors=batch_errors):
+        for header in headers:
+            columns[header].extend(batch[header])
+    assert (columns, batch_flags, batch_errors) == (data, flags, errors)
+
+def test_row_mode_returns_clean_values():
+    headers, rows = parse_content('Identifier,Date of Publication\n 206 ,[1879]\n')
+    assert headers == ['Identifier', 'Date of Publication']
+    assert rows == [{'Identifier': 206, 'Date of Publication': '1879'}]
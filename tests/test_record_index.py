@@ -0,0 +1,51 @@
+# Pruebas del índice de Identifier
+
+import pytest
+from processors import load_file, parse_content
+from record_index import build_index, lookup, normalize_identifier, _home_slot, _key_hash
+
+@pytest.fixture
+def parsed(dirty_csv):
+    spans = []
+    headers, data = parse_content(load_file(dirty_csv, mapped=True), columnar=True, spans=spans)
+    return headers, data, spans
+
+def test_lookup_returns_each_indexed_row(dirty_csv, parsed, tmp_path):
+    headers, data, spans = parsed
+    index_path = str(tmp_path / 'identifier.idx')
+    build_index(index_path, dirty_csv, headers, data['Identifier'], spans)
+    for row in (0, 1, 700, len(spans) - 1):
+        record = lookup(data['Identifier'][row], index_path, dirty_csv)
+        assert record['_row'] == row
+        assert record['Title'] == (data['Title'][row].strip() or None)
+    assert lookup('000000216', index_path, dirty_csv)['Identifier'] == 216
+    assert lookup('123456789', index_path, dirty_csv) is None
+
+def test_stale_index_is_rejected(dirty_csv, parsed, tmp_path):
+    headers, data, spans = parsed
+    index_path = str(tmp_path / 'identifier.idx')
+    build_index(index_path, dirty_csv, headers, data['Identifier'], spans)
+    with open(dirty_csv, 'ab') as file:
+        file.write(b'5,,,,,,,,,,,,,,\n')
+    with pytest.raises(ValueError):
+        lookup('000000216', index_path, dirty_csv)
+
+def test_home_slots_use_both_parities(parsed):
+    _, data, _ = parsed
+    mask = 2 ** 12 - 1
+    homes = {_home_slot(_key_hash(normalize_identifier(identifier)), mask) for identifier in data['Identifier']}
+    assert {home % 2 for home in homes} == {0, 1}
+
+def test_lookup_on_crlf_file_matches_lf(dirty_csv, parsed, tmp_path):
+    headers, data, spans = parsed
+    index_path = str(tmp_path / 'identifier.idx')
+    build_index(index_path, dirty_csv, headers, data['Identifier'], spans)
+    crlf_path = str(tmp_path / 'crlf.csv')
+    with open(dirty_csv, 'rb') as source, open(crlf_path, 'wb') as target:
+        target.write(source.read().replace(b'\n', b'\r\n'))
+    crlf_spans = []
+    crlf_headers, crlf_data = parse_content(load_file(crlf_path, mapped=True), columnar=True, spans=crlf_spans)
+    crlf_index_path = str(tmp_path / 'crlf.idx')
+    build_index(crlf_index_path, crlf_path, crlf_headers, crlf_data['Identifier'], crlf_spans)
+    for row in (0, 1, 700, len(spans) - 1):
+        assert lookup(data['Identifier'][row], crlf_index_path, crlf_path) == lookup(data['Identifier'][row], index_path, dirty_csv)
@@ -0,0 +1,47 @@
+# Pruebas de la cuarentena de registros mal formados
+
+import json
+import pytest
+from conftest import SAMPLE_RECORDS, read_bytes
+from processors import load_file, parse_content
+from rejects import RejectSink, RejectRateExceeded
+from main import main
+
+def parse(content, **options):
+    """parse_content por columnas con banderas de validación y contador de errores"""
+    flags, errors = [], {}
+    headers, data = parse_content(content, field_flags=flags, columnar=True, errors=errors, **options)
+    return headers, data, flags, errors
+
+@pytest.mark.parametrize('mapped', [False, True])
+def test_quarantine_excludes_malformed_records(dirty_csv, tmp_path, mapped):
+    path = str(tmp_path / 'quarantine.jsonl')
+    with RejectSink(path, max_rate=None) as rejects:
+        headers, data, _, errors = parse(load_file(dirty_csv, mapped=mapped), rejects=rejects)
+    assert errors == {'malformed_records': 0}
+    assert rejects.rejected == 2 and rejects.counts == {'missing_fields': 1, 'extra_fields': 1}
+    assert len(data['Identifier']) == SAMPLE_RECORDS + 2 and data['Identifier'][-2:] == ['', '12x']
+    with open(path, encoding='utf-8') as file:
+        entries = [json.loads(line) for line in file]
+    content = read_bytes(dirty_csv)
+    assert [entry['raw'] for entry in entries] == ['999,solo,tres campos', content.rstrip(b'\n').rsplit(b'\n', 1)[1].decode('utf-8')]
+    for entry, identifier in zip(entries, (b'999,', b'1000,')):
+        assert content[entry['offset']:].startswith(identifier)
+        assert entry['line'] == content[:entry['offset']].count(b'\n') + 1
+
+def test_quarantine_stops_above_max_rate(dirty_csv, tmp_path):
+    with pytest.raises(RejectRateExceeded):
+        with RejectSink(str(tmp_path / 'quarantine.jsonl'), max_rate=0.0001, min_records=1) as rejects:
+            parse(load_file(dirty_csv), rejects=rejects)
+
+@pytest.mark.parametrize('options', [{'pipelined': True}, {'incremental': True}, {'workers': 2}])
+def test_incompatible_modes_keep_previous_quarantine(tmp_path, options):
+    path = tmp_path / 'quarantine.jsonl'
+    path.write_text('{"line": 3}\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        main(quarantine_path=str(path), metrics_path=None, **options)
+    assert path.read_text(encoding='utf-8') == '{"line": 3}\n'
+
+def test_index_rejects_workers():
+    with pytest.raises(ValueError):
+        main(build_id_index=True, workers=2, metrics_path=None)
@@ -0,0 +1,36 @@
+# Pruebas de la búsqueda con prefiltro de literales
+
+import re
+import pytest
+from conftest import write_dirty_csv
+from processors import load_file, parse_content
+from patterns import REGISTRY
+from search import ColumnSearcher, required_literals, search_columns
+
+@pytest.mark.parametrize('pattern', ['(?i:london)', 'x(?-i:y)', '(?x: lon don )', '(?:(?i:lon))don',
+                                     'Paris|(?i:london)', '(?=(?i:lon))London', '(a)?(?(1)(?i:b)|c)'])
+def test_scoped_flags_disable_prefilter(pattern):
+    assert required_literals(pattern) is None
+
+def test_required_literals():
+    assert required_literals(r'flickr\.com/photos') == ['flickr.com/photos']
+    assert required_literals('(?:lon)don') == ['london']
+    assert required_literals('serial|monographic') == ['monographic', 'serial']
+    assert required_literals('(?i)london') is None
+    assert required_literals(r'\d+') is None
+
+def test_scoped_ignorecase_matches_re():
+    values = ['LONDON', 'london', 'Paris'] * 10
+    pattern = '(?i:london)'
+    assert ColumnSearcher(values).search(pattern) == [row for row, value in enumerate(values) if re.search(pattern, value)]
+
+@pytest.fixture(scope='module')
+def columns(tmp_path_factory):
+    path = write_dirty_csv(str(tmp_path_factory.mktemp('search') / 'dirty.csv'))
+    return parse_content(load_file(path), columnar=True)[1]
+
+@pytest.mark.parametrize('pattern', [r'flickr\.com', 'London', 'Lond(?:on|res)', '(?i:london)', 'Edinburgh|Glasgow',
+                                     r'\[18\d\d\]', 'serial', '(?i)SERIAL', r'HMNTS \d+', 'X206', '""'] + list(REGISTRY.sources.values()))
+def test_search_matches_re(columns, pattern):
+    expected = {header: [row for row, value in enumerate(values) if re.search(pattern, value)] for header, values in columns.items()}
+    assert search_columns(columns, pattern) == expected
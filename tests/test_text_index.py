@@ -0,0 +1,43 @@
+# Pruebas del índice de texto contra una búsqueda por recorrido completo
+
+import os
+import pytest
+from conftest import read_bytes
+from processors import load_file, parse_content
+from text_index import TextIndex, normalize_text, tokenize
+
+@pytest.mark.parametrize('query', ['london', 'london novel', 'nov*', 'paris OR berlin', 'linea', 'zzzz', 'london OR lond* smith'])
+def test_text_search_matches_scan(dirty_csv, tmp_path, query):
+    _, data = parse_content(load_file(dirty_csv), columnar=True)
+    index_path = str(tmp_path / 'text.idx')
+    TextIndex.build(data).save(index_path)
+    index = TextIndex.load(index_path)
+    fields = ('Title', 'Author', 'Contributors')
+    words = [set(tokenize(normalize_text(' '.join(data[field][row] for field in fields)))) for row in range(len(data['Title']))]
+
+    def matches(term, row):
+        return any(word.startswith(term[:-1]) for word in words[row]) if term.endswith('*') else term in words[row]
+
+    expected = [row for row in range(len(words))
+                if any(alternative.split() and all(matches(term, row) for term in alternative.split()) for alternative in query.split(' OR '))]
+    assert index.search(query) == expected
+
+def test_identifiers_with_newlines_round_trip(tmp_path):
+    data = {'Identifier': ['1', 'dos\nlineas', '', 'ñ'], 'Title': ['a', 'b', 'c', 'd'], 'Author': [''] * 4, 'Contributors': [''] * 4}
+    index_path = str(tmp_path / 'text.idx')
+    TextIndex.build(data).save(index_path)
+    index = TextIndex.load(index_path)
+    assert index.identifiers == ['1', 'dos\nlineas', '', 'ñ']
+    assert [index.identifiers[row] for row in index.search('c OR d')] == ['', 'ñ']
+
+def test_failed_save_keeps_previous_index(dirty_csv, tmp_path):
+    _, data = parse_content(load_file(dirty_csv), columnar=True)
+    index_path = str(tmp_path / 'text.idx')
+    TextIndex.build(data).save(index_path)
+    before = read_bytes(index_path)
+    broken = TextIndex.build(data)
+    broken.postings = None  # tofile falla después de escribir parte del archivo
+    with pytest.raises(AttributeError):
+        broken.save(index_path)
+    assert read_bytes(index_path) == before
+    assert not os.path.exists(index_path + '.tmp')
@@ -0,0 +1,40 @@
+# Pruebas del tokenizador CSV contra el módulo csv de la biblioteca estándar
+
+import csv
+import io
+import pytest
+from conftest import read_bytes
+from tokenizer import split_fields, split_records, iter_split_records
+
+CASES = [
+    'a,b,c\n',
+    'a,"b,c",d\n',
+    '"a ""b"" c",d\n',
+    '"línea 1\nlínea 2",x\n',
+    'a,,\n,,b\n',
+    'a"b,c\n',
+    '"",""""\n',
+    'sin salto final',
+]
+
+def expected(text: str):
+    return list(csv.reader(io.StringIO(text, newline='')))
+
+@pytest.mark.parametrize('text', CASES)
+def test_split_records_matches_csv(text):
+    assert split_records(text)[0] == expected(text)
+    assert [[value.decode('utf-8') for value in record] for record in split_records(text.encode('utf-8'))[0]] == expected(text)
+
+@pytest.mark.parametrize('text', [case for case in CASES if '\n' not in case.rstrip('\n')])
+def test_split_fields_matches_csv(text):
+    assert split_fields(text.rstrip('\n')) == expected(text)[0]
+
+def test_dirty_sample_matches_csv(dirty_csv):
+    text = read_bytes(dirty_csv).decode('utf-8')
+    assert split_records(text)[0] == expected(text)
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_chunk_boundaries_do_not_change_records(dirty_csv, chunk_size):
+    text = read_bytes(dirty_csv).decode('utf-8')
+    chunks = (text[start:start + chunk_size] for start in range(0, len(text), chunk_size))
+    assert list(iter_split_records(chunks)) == expected(text)
@@ -0,0 +1,46 @@
+# Pruebas de la limpieza, el tipado y la escritura de utils
+
+import pytest
+import utils
+from conftest import SAMPLE_RECORDS, DIRTY_RECORDS, read_bytes
+from processors import load_file, iter_records, iter_batches, parse_content
+from utils import create_dataframe, load_results, save_results, write_csv_stream
+
+def test_identifier_dtype_does_not_depend_on_nulls():
+    headers = ['Identifier', 'Date of Publication']
+    clean = create_dataframe(headers, {'Identifier': ['206', '216'], 'Date of Publication': ['1879', '']}, compact=False)
+    dirty = create_dataframe(headers, {'Identifier': ['206', 'X216'], 'Date of Publication': ['1879', '']}, compact=False)
+    assert str(clean['Identifier'].dtype) == str(dirty['Identifier'].dtype) == 'Int64'
+    assert dirty['Identifier'].isna().tolist() == [False, True]
+    assert clean.to_csv(index=False).splitlines()[1].startswith('206,')
+    assert dirty.to_csv(index=False).splitlines()[1].startswith('206,')
+
+@pytest.mark.parametrize('batch_size', [97, 10000])
+def test_write_csv_stream_matches_full_dataframe(dirty_csv, reference, tmp_path, batch_size):
+    output_path = str(tmp_path / 'stream.csv')
+    records = iter_records(dirty_csv, chunk_size=4096)
+    headers = [h.strip() for h in next(records)]
+    rows = write_csv_stream(headers, iter_batches(records, headers, batch_size=batch_size), output_path)
+    assert read_bytes(output_path) == reference
+    assert rows == SAMPLE_RECORDS + DIRTY_RECORDS.count(b'\n') - 1
+
+def test_csv_batches_skip_compaction(dirty_csv, reference, tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, 'compact_dtypes', lambda *args: pytest.fail('los lotes CSV no deben compactarse'))
+    output_path = str(tmp_path / 'stream.csv')
+    records = iter_records(dirty_csv)
+    headers = [h.strip() for h in next(records)]
+    write_csv_stream(headers, iter_batches(records, headers), output_path)
+    assert read_bytes(output_path) == reference
+
+@pytest.mark.parametrize('output_format', ['parquet', 'feather'])
+def test_columnar_schema_keeps_int64(dirty_csv, tmp_path, output_format):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+    headers, data = parse_content(load_file(dirty_csv), columnar=True)
+    df = create_dataframe(headers, data)
+    assert str(df['Date of Publication'].dtype) != 'Int64'  # compact_dtypes lo reduce en memoria
+    output_path = str(tmp_path / f"salida.{output_format}")
+    save_results(df, output_path, output_format)
+    schema = pa.parquet.read_schema(output_path) if output_format == 'parquet' else pa.ipc.open_file(output_path).schema
+    assert schema.field('Identifier').type == schema.field('Date of Publication').type == pa.int64()
+    assert str(load_results(output_path)['Date of Publication'].dtype) == 'Int64'
@@ -0,0 +1,42 @@
+# Pruebas del límite de tiempo de la validación de campos
+
+import re
+import signal
+import threading
+import time
+import pytest
+import validators
+from validators import guarded_match, validate_columns
+
+PATHOLOGICAL = re.compile(r'^(a+)+$').match  # Retroceso exponencial con valores cortos
+
+def test_short_pathological_value_is_cut(monkeypatch):
+    monkeypatch.setitem(validators.FIELD_CHECKS, 'Campo', PATHOLOGICAL)
+    start = time.perf_counter()
+    assert validate_columns(['Campo'], [['a' * 40 + 'b', 'aaa']]) == [[False, True]]
+    assert time.perf_counter() - start < 2
+
+def test_previous_handler_and_timer_are_restored():
+    def handler(signum, frame):
+        raise AssertionError('el temporizador anterior no debía vencer')
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, 30)
+    try:
+        assert guarded_match(PATHOLOGICAL, 'a' * 40 + 'b', 'Campo', budget=0.05) is None
+        assert signal.getsignal(signal.SIGALRM) is handler
+        assert 0 < signal.getitimer(signal.ITIMER_REAL)[0] <= 30
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def test_refuses_to_run_off_the_main_thread():
+    errors = []
+    def run():
+        try:
+            guarded_match(PATHOLOGICAL, 'aaa', 'Campo')
+        except RuntimeError as error:
+            errors.append(error)
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1